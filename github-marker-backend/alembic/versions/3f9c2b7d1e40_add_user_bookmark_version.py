@@ -0,0 +1,31 @@
+"""Add users.bookmark_version
+
+Revision ID: 3f9c2b7d1e40
+Revises: a85284388d52
+Create Date: 2026-10-19 10:12:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d1e40'
+down_revision: Union[str, Sequence[str], None] = 'a85284388d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('bookmark_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'bookmark_version')
@@ -0,0 +1,45 @@
+"""Add full-text search over bookmarks
+
+Revision ID: 7b1e4c9a2d63
+Revises: 3f9c2b7d1e40
+Create Date: 2026-10-19 11:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.fulltext import POSTGRES_STATEMENTS, SQLITE_STATEMENTS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1e4c9a2d63'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d1e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_STATEMENTS:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in SQLITE_STATEMENTS:
+            op.execute(statement)
+        # index rows that existed before the triggers
+        op.execute("INSERT INTO bookmarks_fts(bookmarks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_bookmarks_full_name_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_bookmarks_search_vector")
+        op.execute("ALTER TABLE bookmarks DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("bookmarks_fts_ai", "bookmarks_fts_ad", "bookmarks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS bookmarks_fts")
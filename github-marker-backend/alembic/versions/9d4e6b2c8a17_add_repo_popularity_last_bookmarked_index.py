@@ -0,0 +1,27 @@
+"""Add repo_popularity last_bookmarked_at index
+
+Revision ID: 9d4e6b2c8a17
+Revises: f3b9d2a6c417
+Create Date: 2026-10-19 16:05:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e6b2c8a17'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d2a6c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_repo_popularity_last_bookmarked_at', 'repo_popularity', ['last_bookmarked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_repo_popularity_last_bookmarked_at', table_name='repo_popularity')
@@ -0,0 +1,27 @@
+"""Add bookmarks (user_id, created_at) index
+
+Revision ID: c4d8e2f61a95
+Revises: 7b1e4c9a2d63
+Create Date: 2026-10-19 11:40:12.072651
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f61a95'
+down_revision: Union[str, Sequence[str], None] = '7b1e4c9a2d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookmarks_user_id_created_at', 'bookmarks', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookmarks_user_id_created_at', table_name='bookmarks')
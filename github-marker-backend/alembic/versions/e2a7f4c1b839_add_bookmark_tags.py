@@ -0,0 +1,40 @@
+"""Add bookmark_tags
+
+Revision ID: e2a7f4c1b839
+Revises: c4d8e2f61a95
+Create Date: 2026-10-19 19:30:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7f4c1b839'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2f61a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'bookmark_tags',
+        sa.Column('bookmark_id', sa.Uuid(), nullable=False),
+        sa.Column('tag', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['bookmark_id'], ['bookmarks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('bookmark_id', 'tag'),
+    )
+    op.create_index(
+        'ix_bookmark_tags_user_id_tag_bookmark_id', 'bookmark_tags', ['user_id', 'tag', 'bookmark_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookmark_tags_user_id_tag_bookmark_id', table_name='bookmark_tags')
+    op.drop_table('bookmark_tags')
@@ -0,0 +1,53 @@
+"""Add repo_popularity rollups
+
+Revision ID: f3b9d2a6c417
+Revises: e2a7f4c1b839
+Create Date: 2026-10-19 20:05:12.418390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2a6c417'
+down_revision: Union[str, Sequence[str], None] = 'e2a7f4c1b839'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'repo_popularity',
+        sa.Column('github_repo_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('bookmark_count', sa.Integer(), nullable=False),
+        sa.Column('last_bookmarked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('repo_name', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=False),
+        sa.Column('owner_name', sa.String(length=255), nullable=False),
+        sa.Column('owner_avatar_url', sa.String(length=500), nullable=True),
+        sa.Column('repo_url', sa.String(length=500), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('github_repo_id'),
+    )
+    op.create_index('ix_repo_popularity_bookmark_count', 'repo_popularity', ['bookmark_count'], unique=False)
+    op.create_table(
+        'repo_popularity_hourly',
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('github_repo_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('bookmark_count', sa.Integer(), nullable=False),
+        sa.Column('last_bookmarked_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start', 'github_repo_id'),
+    )
+    op.create_index('ix_bookmarks_created_at', 'bookmarks', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookmarks_created_at', table_name='bookmarks')
+    op.drop_table('repo_popularity_hourly')
+    op.drop_index('ix_repo_popularity_bookmark_count', table_name='repo_popularity')
+    op.drop_table('repo_popularity')
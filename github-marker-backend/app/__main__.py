@@ -0,0 +1,55 @@
+"""
+Production entry point: `python -m app [--workers N] [--port P]`.
+
+Runs N uvicorn worker processes (one per CPU by default) on uvloop and the
+httptools parser when they are installed (both come with uvicorn[standard]),
+with keep-alive, backlog and concurrency limits from Settings. On SIGTERM
+each worker stops accepting, finishes in-flight requests for up to
+WEB_GRACEFUL_SHUTDOWN_SECONDS and then runs the lifespan shutdown.
+"""
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the API with uvicorn workers.")
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or os.cpu_count() or 1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    print(f"Starting {args.workers} worker(s) on {args.host}:{args.port} ({loop} loop, {http} parser)")
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=settings.WEB_BACKLOG,
+        timeout_keep_alive=settings.WEB_KEEP_ALIVE_SECONDS,
+        limit_concurrency=settings.WEB_LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.WEB_FORWARDED_ALLOW_IPS,
+        access_log=settings.WEB_ACCESS_LOG,
+        log_level="debug" if settings.DEBUG else "info",
+    )
+
+
+if __name__ == "__main__":
+    main()
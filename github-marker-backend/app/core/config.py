@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,7 +10,90 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     GITHUB_API_BASE_URL: str = "https://api.github.com/"
+    AVATAR_BASE_URL: str = "https://avatars.githubusercontent.com/"
     CORS_ORIGINS: str
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_LEVEL: int = 6
+    SEARCH_CACHE_MAX_AGE: int = 60
+    SEARCH_CACHE_TTL: int = 60
+    SEARCH_CACHE_SIZE: int = 512
+    SEARCH_PREFETCH_ENABLED: bool = True
+    SEARCH_PREFETCH_TTL: int = 30
+    SEARCH_PREFETCH_CONCURRENCY: int = 4
+    SEARCH_PREFETCH_MIN_BUDGET: float = 0.5
+    # how long a search page is kept to be served (flagged stale) when GitHub fails
+    SEARCH_STALE_TTL: int = 60 * 60
+    GITHUB_TIMEOUT_SECONDS: float = 10
+    GITHUB_CONNECT_TIMEOUT_SECONDS: float = 5
+    # Per GitHub host: failures in a row that open the circuit, and how long it
+    # stays open (calls fail at once) before one probe call is let through
+    GITHUB_BREAKER_FAILURES: int = 5
+    GITHUB_BREAKER_COOLDOWN_SECONDS: float = 30
+    # A GET still unanswered after this long is sent a second time and the first
+    # answer wins; at most GITHUB_HEDGE_CONCURRENCY at once, none below the budget fraction
+    GITHUB_HEDGE_AFTER_SECONDS: Optional[float] = 1.0
+    GITHUB_HEDGE_CONCURRENCY: int = 4
+    GITHUB_HEDGE_MIN_BUDGET: float = 0.5
+    # /github/suggest: names kept in each worker's prefix index, index entries a
+    # lookup may scan, and how often newly bookmarked repos are added to it
+    SUGGEST_INDEX_SIZE: int = 50_000
+    SUGGEST_MAX_SCAN: int = 1000
+    SUGGEST_REFRESH_SECONDS: float = 60
+    METRICS_ENABLED: bool = True
+    AVATAR_CACHE_DIR: str = ".cache/avatars"
+    AVATAR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AVATAR_REFRESH_SECONDS: int = 7 * 24 * 60 * 60
+    AVATAR_MAX_AGE: int = 24 * 60 * 60
+    # /users/{name}/starred pages fetched in parallel, and the most pages (x100 stars) one import reads
+    GITHUB_STARRED_CONCURRENCY: int = 8
+    STARRED_IMPORT_MAX_PAGES: int = 50
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_SIZE: int = 10_000
+    # Optional shared cache (needs the `redis` package); per-process memory when unset
+    REDIS_URL: Optional[str] = None
+    # Token buckets in front of /auth/login and /auth/register (burst size, refill per minute)
+    AUTH_RATE_LIMIT_ENABLED: bool = True
+    AUTH_RATE_IP_BURST: int = 10
+    AUTH_RATE_IP_PER_MINUTE: float = 10
+    AUTH_RATE_EMAIL_BURST: int = 5
+    AUTH_RATE_EMAIL_PER_MINUTE: float = 2
+    # Concurrent bcrypt threads; unset = half the CPUs
+    PASSWORD_HASH_CONCURRENCY: Optional[int] = None
+    # "postgres" fans bookmark events out to all workers via LISTEN/NOTIFY; "memory" is per process
+    EVENT_BUS: Literal["memory", "postgres"] = "memory"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    # /bookmark/popular: rollup refresh interval, full recount interval (picks up
+    # deletions of older bookmarks) and repos kept per window in each worker's snapshot
+    POPULAR_REFRESH_SECONDS: float = 60
+    POPULAR_RECONCILE_SECONDS: float = 60 * 60
+    POPULAR_SNAPSHOT_SIZE: int = 100
+    # "Also bookmarked" model built by `python -m app.service.recommendation_builder`:
+    # where versions live, neighbours kept per repo, how often workers look for a
+    # new version, and the most recent bookmarks per user that count
+    RECOMMENDATIONS_DIR: str = ".cache/recommendations"
+    RECOMMENDATIONS_NEIGHBORS: int = 50
+    RECOMMENDATIONS_RELOAD_SECONDS: float = 60
+    RECOMMENDATIONS_MAX_USER_ITEMS: int = 500
+    # Server started by `python -m app`
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: Optional[int] = None  # default: one per CPU
+    WEB_BACKLOG: int = 2048
+    # above the load balancer's idle timeout, so it never reuses a connection we just closed
+    WEB_KEEP_ALIVE_SECONDS: int = 75
+    WEB_LIMIT_CONCURRENCY: Optional[int] = None  # per worker; excess connections get 503
+    WEB_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    WEB_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    WEB_ACCESS_LOG: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # connections opened before the worker takes traffic (capped at DB_POOL_SIZE)
+    DB_WARMUP_CONNECTIONS: int = 5
+    SQL_ECHO: bool = False
+    DEBUG: bool = False
+    SQL_PROFILING: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
 
     class Config:
         env_file = ".env"
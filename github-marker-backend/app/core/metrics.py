@@ -0,0 +1,181 @@
+"""
+Minimal Prometheus-compatible metrics registry.
+
+All recording happens on the event loop thread (SQLAlchemy's async engine runs
+its events there too), so a metric update is a dict lookup plus a few adds with
+no locks involved. Values are per worker process; let Prometheus sum across
+workers/pods.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List["_Metric"] = []
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        _registry.append(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {child.value}"
+            for values, child in self._children.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, values, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {child.sum}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format (version 0.0.4) of every registered metric."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# --- HTTP ---
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests served", ["method", "route", "status"])
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route"])
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+# --- Database ---
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement execution time", ["operation"])
+DB_ERRORS = Counter("db_errors_total", "SQL statements that raised")
+DB_POOL_CHECKOUT = Histogram("db_pool_checkout_seconds", "Time spent waiting for a pooled connection")
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out of the pool")
+
+# --- GitHub upstream ---
+GITHUB_LATENCY = Histogram("github_request_duration_seconds", "GitHub API latency", ["endpoint"])
+GITHUB_RESPONSES = Counter("github_responses_total", "GitHub API responses by status", ["endpoint", "status"])
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "github_rate_limit_remaining", "Last X-RateLimit-Remaining seen from GitHub", ["resource"]
+)
+GITHUB_HEDGED_REQUESTS = Counter(
+    "github_hedged_requests_total", "Duplicate GitHub GETs sent for slow calls, by which copy answered first",
+    ["endpoint", "winner"],
+)
+CIRCUIT_STATE = Gauge("circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["circuit"])
+
+# --- Caches ---
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+
+# --- Rate limiting ---
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected by a rate limiter", ["action", "scope"])
+
+# --- Server-sent events ---
+SSE_CONNECTIONS = Gauge("sse_connections", "Open /bookmark/events streams")
+SSE_DROPPED_EVENTS = Counter("sse_dropped_events_total", "Events discarded because a client's queue was full")
+
+# --- Popular repositories ---
+POPULARITY_REFRESH = Histogram(
+    "popularity_refresh_duration_seconds", "Popular repos rollup refresh time", ["kind"]
+)
@@ -1,12 +1,19 @@
+import re
 from datetime import date
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_, and_, literal, literal_column, table, column, insert, delete
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.bookmark import BookmarkCreate, BookmarkOut
-from app.models import Bookmark
+from app.models import Bookmark, BookmarkTag
+from app.crud.user_crud import bump_bookmark_version
+from app.service.event_bus import publish_on_commit
+
+# Larger batches are announced as a `resync` rather than sent item by item
+MAX_EVENT_BOOKMARKS = 100
 
 
 async def get_bookmark_by_full_name(
@@ -47,6 +54,37 @@ async def is_repo_bookmarked(
     return False, None
 
 
+async def get_recent_repo_ids(db: AsyncSession, user_id: str, limit: int) -> List[int]:
+    """GitHub repo ids of the user's `limit` most recent bookmarks."""
+    stmt = (
+        select(Bookmark.github_repo_id)
+        .where(Bookmark.user_id == user_id)
+        .order_by(Bookmark.created_at.desc())
+        .limit(limit)
+    )
+    return list((await db.execute(stmt)).scalars())
+
+
+async def get_bookmark_ids_by_repo(
+    db: AsyncSession,
+    repo_ids: List[int],
+    user_id: str
+) -> Dict[int, str]:
+    """
+    Bulk version of is_repo_bookmarked: one `github_repo_id IN (...)` query
+    for a whole page of search results. Maps repo id -> bookmark id for the
+    repos the user has bookmarked.
+    """
+    if not repo_ids:
+        return {}
+    q = select(Bookmark.github_repo_id, Bookmark.id).where(
+        Bookmark.user_id == user_id,
+        Bookmark.github_repo_id.in_(set(repo_ids))
+    )
+    res = await db.execute(q)
+    return {repo_id: str(bookmark_id) for repo_id, bookmark_id in res.all()}
+
+
 async def create_bookmark(db: AsyncSession, item_in: BookmarkCreate, user_id: str):
     q = select(Bookmark).where(
         Bookmark.github_repo_id == item_in.repo_id,
@@ -71,38 +109,304 @@ async def create_bookmark(db: AsyncSession, item_in: BookmarkCreate, user_id: st
     )
 
     db.add(item)
+    version = await bump_bookmark_version(db, user_id)
+    publish_created(db, user_id, [item], version)
     await db.commit()
     await db.refresh(item)
     return item
 
+
+def publish_created(db: AsyncSession, user_id: str, bookmarks: List[Bookmark], version: int) -> None:
+    """
+    Tells the user's /bookmark/events subscribers about new bookmarks once `db`
+    commits. Call after flushing. Big imports send a `resync` instead.
+    """
+    if len(bookmarks) > MAX_EVENT_BOOKMARKS:
+        publish_on_commit(db, user_id, "resync", {"bookmark_version": version})
+        return
+    publish_on_commit(db, user_id, "created", {
+        "bookmarks": [BookmarkOut.model_validate(bookmark).model_dump(mode="json") for bookmark in bookmarks],
+        "bookmark_version": version,
+    })
+
+
+def publish_deleted(db: AsyncSession, user_id: str, bookmark_ids: List[str], version: int) -> None:
+    publish_on_commit(db, user_id, "deleted", {"ids": bookmark_ids, "bookmark_version": version})
+
+
+def _bookmark_values(item_in: BookmarkCreate, user_id: str) -> Dict[str, Any]:
+    return {
+        "repo_name": item_in.repo_name,
+        "github_repo_id": item_in.repo_id,
+        "owner_name": item_in.owner_name,
+        "owner_id": item_in.owner_id,
+        "owner_avatar_url": item_in.owner_avatar_url,
+        "owner_url": item_in.owner_url,
+        "repo_url": str(item_in.repo_url),
+        "description": item_in.description,
+        "full_name": item_in.full_name,
+        "user_id": user_id,
+    }
+
+
+async def create_bookmarks_bulk(
+    db: AsyncSession,
+    items_in: List[BookmarkCreate],
+    user_id: str,
+) -> tuple[List[Bookmark], set[int]]:
+    """
+    Inserts all repos the user hasn't bookmarked yet with one multi-row INSERT ... RETURNING,
+    in a single transaction. Returns (created bookmarks, repo ids that already existed).
+    """
+    by_repo_id = {item.repo_id: item for item in items_in}
+    if not by_repo_id:
+        return [], set()
+
+    existing_q = select(Bookmark.github_repo_id).where(
+        Bookmark.user_id == user_id,
+        Bookmark.github_repo_id.in_(by_repo_id.keys())
+    )
+    existing = set((await db.execute(existing_q)).scalars().all())
+
+    rows = [_bookmark_values(item, user_id) for repo_id, item in by_repo_id.items() if repo_id not in existing]
+    created: List[Bookmark] = []
+    if rows:
+        result = await db.scalars(insert(Bookmark).returning(Bookmark), rows)
+        created = list(result.all())
+        version = await bump_bookmark_version(db, user_id)
+        publish_created(db, user_id, created, version)
+        await db.commit()
+
+    return created, existing
+
+
+async def delete_bookmarks_bulk(db: AsyncSession, bookmark_ids: List[UUID], user_id: str) -> set[str]:
+    """
+    Deletes the given bookmarks that belong to the user with a single
+    DELETE ... WHERE id IN (...) AND user_id = ... RETURNING id. Returns the deleted ids.
+    """
+    # explicit rather than relying on ON DELETE CASCADE, which SQLite only honours with foreign_keys=ON
+    await db.execute(
+        delete(BookmarkTag).where(BookmarkTag.bookmark_id.in_(bookmark_ids), BookmarkTag.user_id == user_id)
+    )
+    stmt = (
+        delete(Bookmark)
+        .where(Bookmark.id.in_(bookmark_ids), Bookmark.user_id == user_id)
+        .returning(Bookmark.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    deleted = {str(bookmark_id) for bookmark_id in result.scalars().all()}
+    if deleted:
+        version = await bump_bookmark_version(db, user_id)
+        publish_deleted(db, user_id, sorted(deleted), version)
+    await db.commit()
+    return deleted
+
+
+def _has_all_tags(user_id: str, tags: List[str]):
+    """Ids of the user's bookmarks carrying every one of `tags`, from the (user_id, tag, bookmark_id) index."""
+    return (
+        select(BookmarkTag.bookmark_id)
+        .where(BookmarkTag.user_id == user_id, BookmarkTag.tag.in_(tags))
+        .group_by(BookmarkTag.bookmark_id)
+        .having(func.count() == len(tags))
+    )
+
+
 async def get_user_bookmarks(
     db: AsyncSession,
     user_id: int,
     page: int = 1,
     per_page: int = 10,
+    tags: Optional[List[str]] = None,
 ) -> tuple[List[BookmarkOut], int]:
+    """One page of the user's bookmarks (with their tags) and the total, optionally only those having all `tags`."""
     if page < 1:
         page = 1
     offset = (page - 1) * per_page
 
+    conditions = [Bookmark.user_id == user_id]
+    if tags:
+        conditions.append(Bookmark.id.in_(_has_all_tags(user_id, tags)))
+
     # main query (paginated)
     stmt = (
         select(Bookmark)
-        .where(Bookmark.user_id == user_id)
+        .where(*conditions)
         .order_by(Bookmark.id.desc())   # change ordering if you have created_at
         .offset(offset)
         .limit(per_page)
     )
     result = await db.execute(stmt)
     items = [BookmarkOut.model_validate(item) for item in result.scalars().all()]
+    if items:
+        tags_by_bookmark = await get_tags_by_bookmark(db, [item.id for item in items])
+        for item in items:
+            item.tags = tags_by_bookmark.get(str(item.id), [])
 
     # total count for this user
-    count_stmt = select(func.count()).select_from(Bookmark).where(Bookmark.user_id == user_id)
+    count_stmt = select(func.count()).select_from(Bookmark).where(*conditions)
     total_result = await db.execute(count_stmt)
     total = int(total_result.scalar_one() or 0)
 
     return items, total
 
+
+async def get_tags_by_bookmark(db: AsyncSession, bookmark_ids: List[UUID]) -> Dict[str, List[str]]:
+    """Tags of each given bookmark (sorted), in one query."""
+    stmt = (
+        select(BookmarkTag.bookmark_id, BookmarkTag.tag)
+        .where(BookmarkTag.bookmark_id.in_(bookmark_ids))
+        .order_by(BookmarkTag.bookmark_id, BookmarkTag.tag)
+    )
+    tags: Dict[str, List[str]] = {}
+    for bookmark_id, tag in (await db.execute(stmt)).all():
+        tags.setdefault(str(bookmark_id), []).append(tag)
+    return tags
+
+
+async def get_tag_counts(db: AsyncSession, user_id: str) -> List[Tuple[str, int]]:
+    """(tag, bookmark count) for all of the user's tags, most used first, from a single GROUP BY."""
+    count = func.count().label("count")
+    stmt = (
+        select(BookmarkTag.tag, count)
+        .where(BookmarkTag.user_id == user_id)
+        .group_by(BookmarkTag.tag)
+        .order_by(count.desc(), BookmarkTag.tag)
+    )
+    return [(tag, int(total)) for tag, total in (await db.execute(stmt)).all()]
+
+
+async def set_bookmark_tags(db: AsyncSession, bookmark_id: str, user_id: str, tags: List[str]) -> BookmarkOut:
+    """Replaces the bookmark's tags with `tags` (already normalized)."""
+    stmt = select(Bookmark).where(Bookmark.id == bookmark_id, Bookmark.user_id == user_id)
+    item = (await db.execute(stmt)).scalars().first()
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bookmark not found")
+
+    await db.execute(delete(BookmarkTag).where(BookmarkTag.bookmark_id == item.id))
+    if tags:
+        await db.execute(
+            insert(BookmarkTag),
+            [{"bookmark_id": item.id, "tag": tag, "user_id": user_id} for tag in tags],
+        )
+    version = await bump_bookmark_version(db, user_id)
+    out = BookmarkOut.model_validate(item)
+    out.tags = sorted(tags)
+    publish_on_commit(db, user_id, "updated", {
+        "bookmarks": [out.model_dump(mode="json")],
+        "bookmark_version": version,
+    })
+    await db.commit()
+    return out
+
+
+async def stream_user_bookmarks(
+    db: AsyncSession,
+    user_id: str,
+    batch_size: int = 500,
+) -> AsyncIterator[Bookmark]:
+    """
+    Yields every bookmark of the user without loading them all into memory.
+    Rows come from a server-side cursor fetched `batch_size` at a time.
+    """
+    stmt = (
+        select(Bookmark)
+        .where(Bookmark.user_id == user_id)
+        .order_by(Bookmark.created_at.asc(), Bookmark.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream_scalars(stmt)
+    async for bookmark in result:
+        yield bookmark
+
+
+def _search_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())[:8]
+
+
+def _ranked_bookmark_ids(dialect: str, user_id: str, query: str, terms: List[str]):
+    """
+    Subquery of (id, rank) for the user's bookmarks matching `query`.
+    Postgres: tsvector prefix match OR trigram-indexed ILIKE on full_name.
+    SQLite: FTS5 prefix match ranked by bm25.
+    """
+    if dialect == "postgresql":
+        search_vector = literal_column("bookmarks.search_vector")
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        like = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        rank = func.ts_rank_cd(search_vector, tsquery) + func.similarity(Bookmark.full_name, query)
+        match = or_(search_vector.op("@@")(tsquery), Bookmark.full_name.ilike(f"%{like}%", escape="\\"))
+        return (
+            select(Bookmark.id.label("id"), rank.label("rank"))
+            .where(Bookmark.user_id == user_id, match)
+            .subquery()
+        )
+
+    if dialect == "sqlite":
+        fts = table("bookmarks_fts", column("rowid"))
+        fts_match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            select(Bookmark.id.label("id"), (-func.bm25(literal_column("bookmarks_fts"))).label("rank"))
+            .join(fts, fts.c.rowid == literal_column("bookmarks.rowid"))
+            .where(Bookmark.user_id == user_id, literal_column("bookmarks_fts").op("MATCH")(fts_match))
+            .subquery()
+        )
+
+    # other dialects: unranked substring match, still keyset-paginated by id
+    pattern = f"%{query}%"
+    return (
+        select(Bookmark.id.label("id"), literal(0.0).label("rank"))
+        .where(
+            Bookmark.user_id == user_id,
+            or_(Bookmark.full_name.ilike(pattern), Bookmark.description.ilike(pattern)),
+        )
+        .subquery()
+    )
+
+
+async def search_user_bookmarks(
+    db: AsyncSession,
+    user_id: str,
+    query: str,
+    limit: int = 20,
+    after: Optional[Tuple[float, UUID]] = None,
+) -> tuple[List[BookmarkOut], Optional[Tuple[float, UUID]]]:
+    """
+    Ranked search over the user's bookmarks (repo_name, full_name, owner_name, description).
+    Keyset-paginated on (rank, id): pass the returned cursor back as `after` for the next page.
+    Returns (items, next_cursor) where next_cursor is None on the last page.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return [], None
+
+    ranked = _ranked_bookmark_ids(db.bind.dialect.name, user_id, query.strip(), terms)
+    stmt = select(Bookmark, ranked.c.rank).join(ranked, Bookmark.id == ranked.c.id)
+    if after:
+        after_rank, after_id = after
+        stmt = stmt.where(
+            or_(
+                ranked.c.rank < after_rank,
+                and_(ranked.c.rank == after_rank, ranked.c.id < after_id),
+            )
+        )
+    stmt = stmt.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_bookmark, last_rank = rows[-1]
+        next_cursor = (float(last_rank), last_bookmark.id)
+
+    items = [BookmarkOut.model_validate(bookmark) for bookmark, _ in rows]
+    return items, next_cursor
+
+
 async def delete_bookmark(db: AsyncSession, bookmark_id: str, user_id: str):
     # Fetch the bookmark and ensure it belongs to the user
     stmt = select(Bookmark).where(
@@ -118,7 +422,10 @@ async def delete_bookmark(db: AsyncSession, bookmark_id: str, user_id: str):
             detail="Bookmark not found"
         )
 
+    await db.execute(delete(BookmarkTag).where(BookmarkTag.bookmark_id == item.id))
     await db.delete(item)
+    version = await bump_bookmark_version(db, user_id)
+    publish_deleted(db, user_id, [str(item.id)], version)
     await db.commit()
 
     return {"message": "Bookmark deleted successfully"}
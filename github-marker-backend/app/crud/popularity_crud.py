@@ -0,0 +1,219 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Bookmark, RepoPopularity, RepoPopularityHourly
+from app.schemas.bookmark import PopularRepo
+
+BUCKET = timedelta(hours=1)
+# Bookmarks get created_at when their transaction starts but only become
+# visible at commit; recounting the previous hour again catches late commits
+LATE_COMMIT_SLACK = timedelta(hours=1)
+# Keeps IN (...) lists and bulk inserts well below driver parameter limits
+CHUNK_SIZE = 500
+
+_METADATA_COLUMNS = ("repo_name", "full_name", "owner_name", "owner_avatar_url", "repo_url", "description")
+
+# repo id -> (change in bookmark count, newest created_at among the recounted rows)
+PopularityChanges = Dict[int, Tuple[int, Optional[datetime]]]
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite hands timestamps back naive (they are stored in UTC)
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def bucket_start(moment: datetime) -> datetime:
+    return _utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+async def _repo_metadata(db: AsyncSession, repo_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Display fields per repo, taken from its most recent bookmark."""
+    metadata: Dict[int, Dict[str, Any]] = {}
+    columns = [getattr(Bookmark, name) for name in _METADATA_COLUMNS]
+    for chunk in _chunks(repo_ids):
+        stmt = (
+            select(Bookmark.github_repo_id, *columns)
+            .where(Bookmark.github_repo_id.in_(chunk))
+            .order_by(Bookmark.created_at.asc())
+        )
+        for row in await db.execute(stmt):
+            metadata[row.github_repo_id] = {name: getattr(row, name) for name in _METADATA_COLUMNS}
+    return metadata
+
+
+async def rebuild_hourly_buckets(db: AsyncSession, since: datetime) -> PopularityChanges:
+    """
+    Recounts the hourly buckets from `since` onwards from `bookmarks` (an
+    index range scan on created_at) and replaces the stored ones. Returns how
+    each repo's count changed compared to the buckets it replaced.
+    """
+    previous_stmt = (
+        select(RepoPopularityHourly.github_repo_id, func.sum(RepoPopularityHourly.bookmark_count))
+        .where(RepoPopularityHourly.bucket_start >= since)
+        .group_by(RepoPopularityHourly.github_repo_id)
+    )
+    previous = {repo_id: int(count) for repo_id, count in await db.execute(previous_stmt)}
+
+    # A second early: SQLite compares timestamps as text, and a row stored as
+    # '... 18:00:00' sorts before the parameter '... 18:00:00.000000'
+    recent = select(Bookmark.github_repo_id, Bookmark.created_at).where(
+        Bookmark.created_at >= since - timedelta(seconds=1)
+    )
+    buckets: Dict[Tuple[int, datetime], List[Any]] = {}
+    result = await db.stream(recent.execution_options(yield_per=1000))
+    async for repo_id, created_at in result:
+        created_at = _utc(created_at)
+        if created_at < since:
+            continue
+        bucket = buckets.setdefault((repo_id, bucket_start(created_at)), [0, created_at])
+        bucket[0] += 1
+        bucket[1] = max(bucket[1], created_at)
+
+    await db.execute(delete(RepoPopularityHourly).where(RepoPopularityHourly.bucket_start >= since))
+    rows = [
+        {"github_repo_id": repo_id, "bucket_start": start, "bookmark_count": count, "last_bookmarked_at": newest}
+        for (repo_id, start), (count, newest) in buckets.items()
+    ]
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await db.execute(insert(RepoPopularityHourly), rows[start:start + CHUNK_SIZE])
+
+    changes: PopularityChanges = {repo_id: (-count, None) for repo_id, count in previous.items()}
+    for (repo_id, _), (count, newest) in buckets.items():
+        delta, latest = changes.get(repo_id, (0, None))
+        changes[repo_id] = (delta + count, newest if latest is None else max(latest, newest))
+    return changes
+
+
+async def prune_hourly_buckets(db: AsyncSession, before: datetime) -> None:
+    await db.execute(delete(RepoPopularityHourly).where(RepoPopularityHourly.bucket_start < before))
+
+
+async def latest_bucket_start(db: AsyncSession) -> Optional[datetime]:
+    latest = (await db.execute(select(func.max(RepoPopularityHourly.bucket_start)))).scalar_one_or_none()
+    return None if latest is None else _utc(latest)
+
+
+async def get_repo_popularity(db: AsyncSession, repo_ids: List[int]) -> Dict[int, RepoPopularity]:
+    """Rollup rows (with the cached repo metadata) for the given repos that have any."""
+    rows: Dict[int, RepoPopularity] = {}
+    for chunk in _chunks(repo_ids):
+        stmt = select(RepoPopularity).where(RepoPopularity.github_repo_id.in_(chunk))
+        rows.update((row.github_repo_id, row) for row in (await db.execute(stmt)).scalars())
+    return rows
+
+
+async def apply_popularity_changes(db: AsyncSession, changes: PopularityChanges) -> None:
+    """Adds recounted deltas to the all-time totals, creating rows for repos seen for the first time."""
+    changed = {repo_id: change for repo_id, change in changes.items() if change[0] or change[1]}
+    existing = await get_repo_popularity(db, list(changed))
+
+    new_ids = [repo_id for repo_id, (delta, _) in changed.items() if repo_id not in existing and delta > 0]
+    metadata = await _repo_metadata(db, new_ids)
+    for repo_id, (delta, newest) in changed.items():
+        row = existing.get(repo_id)
+        if row is None:
+            if repo_id in metadata:
+                db.add(RepoPopularity(
+                    github_repo_id=repo_id, bookmark_count=delta, last_bookmarked_at=newest, **metadata[repo_id]
+                ))
+            continue
+        row.bookmark_count += delta
+        if newest is not None and (row.last_bookmarked_at is None or newest > _utc(row.last_bookmarked_at)):
+            row.last_bookmarked_at = newest
+    await db.flush()
+    await db.execute(
+        delete(RepoPopularity)
+        .where(RepoPopularity.bookmark_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def recount_popularity_totals(db: AsyncSession) -> None:
+    """
+    Recomputes every all-time total from `bookmarks`. The incremental path
+    only sees recent rows, so this is what accounts for deleted old bookmarks.
+    """
+    same_repo = Bookmark.github_repo_id == RepoPopularity.github_repo_id
+    await db.execute(
+        update(RepoPopularity)
+        .values(
+            bookmark_count=select(func.count()).where(same_repo).scalar_subquery(),
+            last_bookmarked_at=select(func.max(Bookmark.created_at)).where(same_repo).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        delete(RepoPopularity)
+        .where(RepoPopularity.bookmark_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+    missing_stmt = (
+        select(Bookmark.github_repo_id, func.count(), func.max(Bookmark.created_at))
+        .where(~exists().where(same_repo))
+        .group_by(Bookmark.github_repo_id)
+    )
+    missing = (await db.execute(missing_stmt)).all()
+    metadata = await _repo_metadata(db, [repo_id for repo_id, _, _ in missing])
+    for repo_id, count, newest in missing:
+        db.add(RepoPopularity(
+            github_repo_id=repo_id, bookmark_count=count, last_bookmarked_at=newest, **metadata[repo_id]
+        ))
+    await db.flush()
+
+
+async def get_popular_repos(db: AsyncSession, since: Optional[datetime], limit: int) -> List[PopularRepo]:
+    """Most bookmarked repos, all time (since=None) or from the hourly buckets starting at `since`."""
+    if since is None:
+        stmt = (
+            select(RepoPopularity)
+            .order_by(RepoPopularity.bookmark_count.desc(), RepoPopularity.github_repo_id.asc())
+            .limit(limit)
+        )
+        return [PopularRepo.model_validate(row) for row in (await db.execute(stmt)).scalars()]
+
+    count = func.sum(RepoPopularityHourly.bookmark_count).label("bookmark_count")
+    window = (
+        select(
+            RepoPopularityHourly.github_repo_id,
+            count,
+            func.max(RepoPopularityHourly.last_bookmarked_at).label("last_bookmarked_at"),
+        )
+        .where(RepoPopularityHourly.bucket_start >= since)
+        .group_by(RepoPopularityHourly.github_repo_id)
+        .order_by(count.desc(), RepoPopularityHourly.github_repo_id.asc())
+        .limit(limit)
+        .subquery()
+    )
+    stmt = (
+        select(RepoPopularity, window.c.bookmark_count, window.c.last_bookmarked_at)
+        .join(window, window.c.github_repo_id == RepoPopularity.github_repo_id)
+        .order_by(window.c.bookmark_count.desc(), RepoPopularity.github_repo_id.asc())
+    )
+    items = []
+    for repo, bookmark_count, last_bookmarked_at in await db.execute(stmt):
+        item = PopularRepo.model_validate(repo)
+        item.bookmark_count = int(bookmark_count)
+        item.last_bookmarked_at = last_bookmarked_at
+        items.append(item)
+    return items
+
+
+async def get_repos_bookmarked_since(db: AsyncSession, since: datetime, limit: int) -> List[RepoPopularity]:
+    """Rollup rows whose repo was bookmarked at or after `since`, most recently bookmarked first."""
+    stmt = (
+        select(RepoPopularity)
+        # a second early for SQLite's text comparison, as in rebuild_hourly_buckets
+        .where(RepoPopularity.last_bookmarked_at >= since - timedelta(seconds=1))
+        .order_by(RepoPopularity.last_bookmarked_at.desc())
+        .limit(limit)
+    )
+    return list((await db.execute(stmt)).scalars())
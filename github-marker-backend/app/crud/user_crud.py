@@ -1,15 +1,50 @@
+from typing import Optional
+
 from fastapi import HTTPException, status
 from pydantic import EmailStr
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
 from app.models.users import User
-from app.utils.security import hash_password
-from app.schemas.user import UserCreate
+from app.utils.cache import make_cache_backend
+from app.utils.security import hash_password_async
+from app.schemas.user import UserCreate, UserOut
 from sqlalchemy.future import select
+from sqlalchemy import event, update
+
+# Active users' UserOut, keyed by user id. Entries are dropped after the commit
+# of any change to the row (ORM updates and bookmark version bumps).
+_profile_cache = make_cache_backend("user_profile", settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+_PENDING_INVALIDATIONS = "user_profile_invalidations"
+
+
+def _invalidate_on_commit(session: Session, user_id) -> None:
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        _invalidate_on_commit(session, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session: Session) -> None:
+    # After (not at) the change: a reader between the UPDATE and the commit
+    # would otherwise put the old row back into the cache
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _profile_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
 
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
-    hashed = hash_password(user_in.password)
+    hashed = await hash_password_async(user_in.password)
     user = User(name=user_in.name, email=str(user_in.email), hashed_password=hashed)
     db.add(user)
     try:
@@ -30,3 +65,46 @@ async def get_user_by_id(db: AsyncSession, user_id: str):
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
+
+async def get_user_profile(db: AsyncSession, user_id: str) -> Optional[UserOut]:
+    """
+    UserOut for an active user, served from the profile cache when possible.
+    Returns None for unknown or inactive users (those are never cached).
+    """
+    cached = await _profile_cache.get(str(user_id))
+    if cached is not None:
+        return UserOut.model_validate(cached)
+
+    user = await get_user_by_id(db, user_id)
+    if not user or not user.is_active:
+        return None
+    profile = UserOut.model_validate(user)
+    await _profile_cache.set(str(user_id), profile.model_dump(mode="json"))
+    return profile
+
+
+async def get_bookmark_version(db: AsyncSession, user_id: str) -> int:
+    """
+    Returns the user's bookmark version counter (0 if the user is unknown).
+    A single primary-key lookup, cheap enough to run before any heavier query.
+    """
+    query = select(User.bookmark_version).where(User.id == str(user_id))
+    result = await db.execute(query)
+    return int(result.scalar_one_or_none() or 0)
+
+
+async def bump_bookmark_version(db: AsyncSession, user_id: str) -> int:
+    """
+    Atomically increments the user's bookmark version and returns the new value.
+    Does not commit: call it inside the same transaction as the bookmark change.
+    The cached profile is dropped once that transaction commits.
+    """
+    stmt = (
+        update(User)
+        .where(User.id == str(user_id))
+        .values(bookmark_version=User.bookmark_version + 1)
+        .returning(User.bookmark_version)
+    )
+    result = await db.execute(stmt)
+    _invalidate_on_commit(db.sync_session, user_id)
+    return int(result.scalar_one_or_none() or 0)
@@ -0,0 +1,81 @@
+"""
+Full-text search DDL for the bookmarks table.
+
+Postgres gets a generated `search_vector` tsvector column with a GIN index plus
+a pg_trgm index on full_name for partial matches. SQLite (used for local runs
+and tests) gets an external-content FTS5 table kept in sync by triggers.
+Neither is part of the ORM model, queries reach them through literal columns.
+"""
+from typing import Optional
+
+from sqlalchemy import DDL, Table, event
+
+POSTGRES_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE bookmarks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(repo_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(full_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(owner_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_bookmarks_search_vector ON bookmarks USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_bookmarks_full_name_trgm ON bookmarks USING gin (full_name gin_trgm_ops)",
+]
+
+SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5(
+        repo_name, full_name, owner_name, description,
+        content='bookmarks', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ai AFTER INSERT ON bookmarks BEGIN
+        INSERT INTO bookmarks_fts(rowid, repo_name, full_name, owner_name, description)
+        VALUES (new.rowid, new.repo_name, new.full_name, new.owner_name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ad AFTER DELETE ON bookmarks BEGIN
+        INSERT INTO bookmarks_fts(bookmarks_fts, rowid, repo_name, full_name, owner_name, description)
+        VALUES ('delete', old.rowid, old.repo_name, old.full_name, old.owner_name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_au AFTER UPDATE ON bookmarks BEGIN
+        INSERT INTO bookmarks_fts(bookmarks_fts, rowid, repo_name, full_name, owner_name, description)
+        VALUES ('delete', old.rowid, old.repo_name, old.full_name, old.owner_name, old.description);
+        INSERT INTO bookmarks_fts(rowid, repo_name, full_name, owner_name, description)
+        VALUES (new.rowid, new.repo_name, new.full_name, new.owner_name, new.description);
+    END
+    """,
+]
+
+
+# What the statements above create, so alembic autogenerate can leave it alone
+# (FTS5 adds its own bookmarks_fts_* shadow tables next to bookmarks_fts)
+FULLTEXT_TABLE_PREFIX = "bookmarks_fts"
+FULLTEXT_COLUMNS = {("bookmarks", "search_vector")}
+FULLTEXT_INDEXES = {"ix_bookmarks_search_vector", "ix_bookmarks_full_name_trgm"}
+
+
+def is_fulltext_object(object_, name: Optional[str], type_: str) -> bool:
+    """True for search objects created by the DDL here, which the ORM models don't describe."""
+    if type_ == "table":
+        return name is not None and name.startswith(FULLTEXT_TABLE_PREFIX)
+    if type_ == "column":
+        return (object_.table.name, name) in FULLTEXT_COLUMNS
+    if type_ == "index":
+        return name in FULLTEXT_INDEXES
+    return False
+
+
+def register_fulltext_ddl(table: Table) -> None:
+    """Attach the dialect specific DDL so `create_all` sets up search as well."""
+    for statement in POSTGRES_STATEMENTS:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_STATEMENTS:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
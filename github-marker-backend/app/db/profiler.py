@@ -0,0 +1,111 @@
+"""
+Per-request SQL statement profiling.
+
+A `QueryProfile` is bound to the current context with `profile_queries()`;
+the engine's cursor hooks (app/db/setup.py) call `record_query` for every
+statement. SQLAlchemy runs those hooks in a greenlet that shares the calling
+task's context, so the profile set by the middleware (or a test) is the one
+that sees the queries. With no profile active, `record_query` is a single
+ContextVar lookup.
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+_PARAM_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    Statement shape with literals and bind markers replaced by `?`, so the
+    same query issued with different parameters (or IN lists of different
+    lengths) counts as a repeat.
+    """
+    normalized = _WHITESPACE_RE.sub(" ", statement).strip()
+    normalized = _PARAM_RE.sub("?", normalized)
+    normalized = _LITERAL_RE.sub("?", normalized)
+    return _PARAM_LIST_RE.sub("(?+)", normalized)
+
+
+class QueryProfile:
+    """Statement count, DB time and repeated statement shapes for one unit of work."""
+
+    __slots__ = ("parent", "count", "duration", "fingerprints")
+
+    def __init__(self, parent: Optional["QueryProfile"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = fingerprint(statement)
+        profile = self
+        while profile is not None:
+            profile.count += 1
+            profile.duration += elapsed
+            profile.fingerprints[shape] += 1
+            profile = profile.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in self.fingerprints.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self) -> Dict[str, object]:
+        return {"count": self.count, "duration_ms": round(self.duration * 1000, 3),
+                "fingerprints": dict(self.fingerprints)}
+
+
+def record_query(statement: str, elapsed: float) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """
+    Collect the statements run inside the block. Nested profiles also report
+    to the enclosing one, so a test can wrap a request that the middleware
+    profiles as well.
+    """
+    profile = QueryProfile(parent=_current_profile.get())
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryProfile]:
+    """
+    Fail when the block runs more than `limit` statements.
+
+        with assert_max_queries(3):
+            client.get("/bookmark/list")
+
+    Works across TestClient / ASGI transports since the request task inherits
+    the caller's context.
+    """
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        shapes = "\n".join(f"  {count}x {shape}" for shape, count in profile.fingerprints.most_common())
+        raise AssertionError(f"expected at most {limit} queries, got {profile.count}:\n{shapes}")
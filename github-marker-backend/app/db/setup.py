@@ -1,9 +1,38 @@
+import asyncio
+import re
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import  declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import DB_ERRORS, DB_POOL_CHECKOUT, DB_POOL_IN_USE, DB_QUERY_LATENCY
+from app.db.profiler import record_query
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long callers waited for a connection."""
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(perf_counter() - started)
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+
+_engine_kwargs = {}
+if make_url(settings.DATABASE_URL).get_backend_name() != "sqlite":
+    # SQLite picks its own pool class depending on file vs memory databases
+    _engine_kwargs["poolclass"] = InstrumentedQueuePool
+    _engine_kwargs["pool_size"] = settings.DB_POOL_SIZE
+    _engine_kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+
+engine = create_async_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO, **_engine_kwargs)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -13,11 +42,91 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+_OPERATION_RE = re.compile(r"\s*(\w+)")
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+    match = _OPERATION_RE.match(statement)
+    DB_QUERY_LATENCY.labels(match.group(1).upper() if match else "OTHER").observe(elapsed)
+    record_query(statement, elapsed)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context):
+    DB_ERRORS.inc()
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+@event.listens_for(engine.sync_engine.pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_IN_USE.inc()
+
+
+@event.listens_for(engine.sync_engine.pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_IN_USE.dec()
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+
+class LazySession:
+    """
+    Stands in for an AsyncSession in requests that mostly wait on GitHub: the
+    session is created on first use, and `release()` hands its connection
+    back to the pool as soon as the database work is done, instead of holding
+    it through the slow upstream calls around it. Using it again afterwards
+    checks a connection out again.
+    """
+
+    def __init__(self):
+        self._session: Optional[AsyncSession] = None
+
+    def __getattr__(self, name: str):
+        if self._session is None:
+            self._session = AsyncSessionLocal()
+        return getattr(self._session, name)
+
+    async def release(self) -> None:
+        """Ends the transaction and returns the connection; commit first, the rest is rolled back."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def close(self) -> None:
+        await self.release()
+        self._session = None
+
+
+async def get_lazy_db():
+    lazy = LazySession()
+    try:
+        yield lazy
+    finally:
+        await lazy.close()
+
+async def warm_up_pool(connections: int) -> None:
+    """Opens `connections` pooled connections at once so early requests don't wait on connects."""
+    if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+        connections = 1
+    connections = min(connections, settings.DB_POOL_SIZE)
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,20 @@
+import uuid
+
+from sqlalchemy import Uuid
+from sqlalchemy.types import TypeDecorator
+
+
+class UUIDType(TypeDecorator):
+    """
+    `Uuid` column that also accepts string ids on every backend.
+
+    User ids travel through the app as JWT subjects (strings). Postgres/asyncpg
+    takes those as-is, but SQLite's non-native Uuid needs real UUID objects.
+    """
+    impl = Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
@@ -1,13 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from jose import ExpiredSignatureError, JWTError
 
-from app.db.setup import init_db
-from app.routers import auth, github, bookmarks
+from app.db.setup import init_db, warm_up_pool
+from app.service.avatar_service import warm_up_avatar_cache
+from app.service.github_service import close_shared_client, warm_up_client
+from app.service.event_bus import event_bus
+from app.service.popularity_service import popularity_refresher
+from app.service.suggest_service import suggest_index_refresher
+from app.routers import auth, avatars, github, bookmarks, metrics
 from app.middleware.auth_middleware import auth_http_middleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.query_profiler import QueryProfilerMiddleware
 from app.core.config import settings
 
 @asynccontextmanager
@@ -15,10 +23,21 @@ async def lifespan(_app: FastAPI):
     # Startup
     await init_db()
     print("DB initialized!")
+    await event_bus.start()
+    # uvicorn only starts accepting once startup finishes, so these are paid before the first request
+    await asyncio.gather(
+        warm_up_pool(settings.DB_WARMUP_CONNECTIONS), warm_up_client(), warm_up_avatar_cache()
+    )
+    await popularity_refresher.start()
+    await suggest_index_refresher.start()
 
     yield  # Application runs here
 
     # Shutdown
+    await suggest_index_refresher.close()
+    await popularity_refresher.close()
+    await event_bus.close()
+    await close_shared_client()
     print("Shutting down...")
 
 app = FastAPI(lifespan=lifespan, title="GitHub Task")
@@ -30,10 +49,27 @@ app.add_middleware(
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    level=settings.COMPRESSION_LEVEL,
+)
 
 # Adding routers to the app
 app.include_router(auth.router)
 app.include_router(github.router)
 app.include_router(bookmarks.router)
+app.include_router(avatars.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 # Added Middleware
 app.middleware("http")(auth_http_middleware)
+if settings.SQL_PROFILING or settings.DEBUG:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+        expose_headers=settings.DEBUG,
+    )
+if settings.METRICS_ENABLED:
+    # added last so it is outermost and also times auth rejections
+    app.add_middleware(MetricsMiddleware)
@@ -1,17 +1,21 @@
 # app/middleware/auth_middleware.py
-from typing import List, Optional, Set, Dict
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Dict
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from jose import ExpiredSignatureError, JWTError
 from app.core.config import settings
 from app.service.auth_service import verify_token  # import your verify_token implementation
 
-# Build a set of allowed origins for quick checks (from settings.cors_origins_list)
-ALLOWED_ORIGINS: Set[str] = set(settings.cors_origins_list or [])
+
+@lru_cache(maxsize=1)
+def allowed_origins() -> FrozenSet[str]:
+    """Set of allowed origins for quick checks, built on the first request that needs it."""
+    return frozenset(settings.cors_origins_list or [])
+
 
 EXCLUDED_PATHS = [
     "/", "/auth/login", "/auth/register", "/auth/refresh",
-    "/openapi.json", "/docs", "/redoc", "/docs/oauth2-redirect", "/health",
+    "/openapi.json", "/docs", "/redoc", "/docs/oauth2-redirect", "/health", "/metrics", "/avatars",
 ]
 
 def is_excluded_path(path: str, excluded: Optional[List[str]] = None) -> bool:
@@ -23,7 +27,7 @@ def get_cors_headers(request: Request) -> Dict[str, str]:
     """Helper function to create necessary CORS headers if origin is allowed."""
     origin = request.headers.get("origin")
     headers = {}
-    if origin and origin in ALLOWED_ORIGINS:
+    if origin and origin in allowed_origins():
         headers = {
             "Access-Control-Allow-Origin": origin,
             "Access-Control-Allow-Credentials": "true",
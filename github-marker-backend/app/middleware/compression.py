@@ -0,0 +1,140 @@
+# app/middleware/compression.py
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, fall back to gzip only
+    brotli = None
+
+# Streaming responses (SSE, exports) are never buffered here, so only the
+# content types of complete bodies need to be checked.
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+SKIP_STATUS_CODES = {204, 304}
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best encoding the client accepts: br > gzip > none."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(token.strip())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    return compressor.compress(body) + compressor.flush()
+
+
+def revalidated_etag(etag: str, if_none_match: str) -> str:
+    """
+    The ETag a 304 should carry: the suffixed form (as sent on the compressed
+    200) when that is the validator the client revalidated with, so it matches
+    the representation the client has cached.
+    """
+    if not etag.endswith('"') or etag.startswith("W/"):
+        return etag
+    sent = {tag.strip() for tag in if_none_match.split(",")}
+    for suffix in ENCODING_SUFFIXES:
+        suffixed = f'{etag[:-1]}{suffix}"'
+        if suffixed in sent or f"W/{suffixed}" in sent:
+            return suffixed
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete (non-streaming) responses with brotli or gzip.
+
+    Bodies smaller than `minimum_size` are sent as-is since the framing
+    overhead outweighs the savings. Strong ETags get an encoding suffix so
+    the compressed and identity representations never share a validator;
+    a 304 gets back the suffixed ETag the client revalidated with.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, level: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match", "")
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None and not if_none_match:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 304 and if_none_match:
+                    headers = MutableHeaders(raw=list(message["headers"]))
+                    etag = headers.get("etag")
+                    if etag:
+                        headers["ETag"] = revalidated_etag(etag, if_none_match)
+                        message["headers"] = headers.raw
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            body = message.get("body", b"")
+
+            if message.get("more_body", False) or not self._should_compress(start_message, headers, body):
+                # streaming or not worth compressing: forward untouched
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, self.level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and etag.endswith('"') and not etag.startswith("W/"):
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            start_message["headers"] = headers.raw
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, start_message: Message, headers: MutableHeaders, body: bytes) -> bool:
+        if start_message["status"] in SKIP_STATUS_CODES or "content-encoding" in headers:
+            return False
+        if len(body) < self.minimum_size:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
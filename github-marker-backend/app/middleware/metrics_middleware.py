@@ -0,0 +1,55 @@
+# app/middleware/metrics_middleware.py
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency, status counts and in-flight requests.
+
+    Routes are labelled by their path template (`/bookmark/{bookmark_id}`), never
+    the raw path, to keep label cardinality bounded. The router stores the matched
+    route in the shared scope, so it is read back after the request instead of
+    matching paths twice. Requests rejected before routing (auth, 404) are
+    labelled `<unmatched>`. Event streams stay open for as long as the client
+    listens, so their duration is not recorded as latency (see `sse_connections`).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        event_stream = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, event_stream
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                event_stream = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", ())
+                )
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            if not event_stream:
+                HTTP_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
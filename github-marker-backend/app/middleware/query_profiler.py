@@ -0,0 +1,44 @@
+# app/middleware/query_profiler.py
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.profiler import profile_queries
+
+
+class QueryProfilerMiddleware:
+    """
+    Counts the SQL statements each request runs and warns about N+1 patterns:
+    the same statement shape repeated `n_plus_one_threshold` times or more.
+
+    With `expose_headers` (debug mode) the totals are also returned as
+    `X-DB-Queries` and `Server-Timing: db;dur=...`, which browsers show in the
+    network panel. Streaming responses report the queries run before the first
+    byte.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5, expose_headers: bool = False) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+            async def send_wrapper(message: Message) -> None:
+                if self.expose_headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(profile.count)
+                    headers.append("Server-Timing", profile.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        repeated = profile.repeated(self.n_plus_one_threshold)
+        if repeated:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for shape, count in repeated:
+                print(f"WARNING: possible N+1 on {scope['method']} {route}: "
+                      f"{count} of {profile.count} queries were: {shape}")
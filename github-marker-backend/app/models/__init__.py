@@ -1,4 +1,5 @@
 from app.models.users import User
-from app.models.bookmark import Bookmark
+from app.models.bookmark import Bookmark, BookmarkTag
+from app.models.popularity import RepoPopularity, RepoPopularityHourly
 
-__all__ = ["User", "Bookmark"]
+__all__ = ["User", "Bookmark", "BookmarkTag", "RepoPopularity", "RepoPopularityHourly"]
@@ -1,16 +1,18 @@
 from sqlalchemy.orm import relationship
 
 from app.db.setup import Base
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Uuid, DateTime
+from app.db.fulltext import register_fulltext_ddl
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Index
+from app.db.types import UUIDType
 from sqlalchemy.sql import func
 from uuid import uuid4
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
 
-    id = Column(Uuid, primary_key=True, index=True, default=uuid4)
+    id = Column(UUIDType, primary_key=True, index=True, default=uuid4)
     github_repo_id = Column(Integer, index=True, nullable=False)
-    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False)
     repo_name = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=False)
     owner_name = Column(String(255), nullable=False)
@@ -20,3 +22,30 @@ class Bookmark(Base):
     repo_url = Column(String(500))
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # per-user scans in creation order (export, stats) without a sort
+        Index("ix_bookmarks_user_id_created_at", "user_id", "created_at"),
+        # recent bookmarks across all users (popular repos rollup)
+        Index("ix_bookmarks_created_at", "created_at"),
+    )
+
+
+register_fulltext_ddl(Bookmark.__table__)
+
+
+class BookmarkTag(Base):
+    """
+    A tag on one bookmark. user_id is copied from the bookmark so per-user tag
+    filters and counts are answered from the (user_id, tag, bookmark_id)
+    index alone.
+    """
+    __tablename__ = "bookmark_tags"
+
+    bookmark_id = Column(UUIDType, ForeignKey("bookmarks.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(50), primary_key=True)
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_bookmark_tags_user_id_tag_bookmark_id", "user_id", "tag", "bookmark_id"),
+    )
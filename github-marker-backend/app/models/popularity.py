@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.db.setup import Base
+
+
+class RepoPopularity(Base):
+    """
+    All-time bookmark count per repository across every user, with the repo
+    metadata shown on the leaderboard. A rollup of `bookmarks` maintained by
+    app.service.popularity_service; request handlers only read it.
+    """
+    __tablename__ = "repo_popularity"
+
+    github_repo_id = Column(Integer, primary_key=True, autoincrement=False)
+    bookmark_count = Column(Integer, nullable=False)
+    last_bookmarked_at = Column(DateTime(timezone=True))
+    repo_name = Column(String(255), nullable=False)
+    full_name = Column(String(255), nullable=False)
+    owner_name = Column(String(255), nullable=False)
+    owner_avatar_url = Column(String(500))
+    repo_url = Column(String(500))
+    description = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_repo_popularity_bookmark_count", "bookmark_count"),
+        Index("ix_repo_popularity_last_bookmarked_at", "last_bookmarked_at"),
+    )
+
+
+class RepoPopularityHourly(Base):
+    """
+    Bookmarks created per repository per hour, kept only as far back as the
+    longest leaderboard window so windowed counts are sums over a few buckets.
+    """
+    __tablename__ = "repo_popularity_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    github_repo_id = Column(Integer, primary_key=True, autoincrement=False)
+    bookmark_count = Column(Integer, nullable=False)
+    last_bookmarked_at = Column(DateTime(timezone=True), nullable=False)
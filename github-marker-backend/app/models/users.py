@@ -1,13 +1,16 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Uuid
+from sqlalchemy import Column, String, Boolean, DateTime, BigInteger
+from app.db.types import UUIDType
 from sqlalchemy.sql import func
 from app.db.setup import Base
 from uuid import uuid4
 
 class User(Base):
     __tablename__ = "users"
-    id = Column(Uuid, primary_key=True, index=True, default=uuid4)
+    id = Column(UUIDType, primary_key=True, index=True, default=uuid4)
     name = Column(String(128), nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(256), nullable=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # bumped on every change to the user's bookmarks, used for ETags and cache keys
+    bookmark_version = Column(BigInteger, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -5,10 +5,11 @@ from app.crud.user_crud import create_user
 from app.db.setup import get_db
 from app.schemas.user import UserOut, UserCreate, UserLogin
 from app.service.auth_service import create_access_token, create_refresh_token, verify_token
-from app.utils.security import verify_password
-from app.crud.user_crud import get_user_by_email, get_user_by_id
+from app.utils.security import verify_password_async
+from app.crud.user_crud import get_user_by_email, get_user_profile
 from app.core.config import settings
 from app.utils.security import set_auth_cookies
+from app.utils.rate_limit import enforce_auth_rate_limit, refund_auth_attempt
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -17,7 +18,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post('/register', response_model=UserOut, status_code=status.HTTP_201_CREATED)
-async def register(user_in: UserCreate, response: Response, db: AsyncSession = Depends(get_db)):
+async def register(user_in: UserCreate, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    await enforce_auth_rate_limit(request, "register", str(user_in.email))
     user = await create_user(db, user_in)
     access = create_access_token(subject=str(user.id))
     refresh = create_refresh_token(subject=str(user.id))
@@ -26,10 +28,12 @@ async def register(user_in: UserCreate, response: Response, db: AsyncSession = D
 
 
 @router.post('/login', response_model=UserOut)
-async def login(form_data: UserLogin, response: Response, db: AsyncSession = Depends(get_db)):
+async def login(form_data: UserLogin, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    await enforce_auth_rate_limit(request, "login", str(form_data.email))
     user = await get_user_by_email(db, form_data.email)
-    if not user or not user.is_active or not verify_password(form_data.password, user.hashed_password):
+    if not user or not user.is_active or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    await refund_auth_attempt(request, "login", str(form_data.email))
     access = create_access_token(subject=str(user.id))
     refresh = create_refresh_token(subject=str(user.id))
     set_auth_cookies(response, access, refresh)
@@ -44,9 +48,10 @@ async def refresh_token(request: Request, response: Response, db: AsyncSession =
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing refresh token")
     # verify refresh token
     user_id = verify_token(refresh, expected_type='refresh')
-    user_details = await get_user_by_id(db, user_id)
+    # only active users are returned
+    user_details = await get_user_profile(db, user_id)
 
-    if not user_details or not user_details.is_active:
+    if not user_details:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid User")
     access = create_access_token(subject=str(user_details.id))
     refresh = create_refresh_token(subject=str(user_details.id))
@@ -63,7 +68,7 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-    user_details = await get_user_by_id(db, user_id)
+    user_details = await get_user_profile(db, user_id)
     if not user_details:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.service.avatar_service import AVATAR_SIZES, get_avatar
+from app.utils.http_cache import etag_matches, not_modified
+
+router = APIRouter(prefix="/avatars", tags=["Avatars"])
+
+
+@router.get("/{owner_id}", response_class=FileResponse)
+async def avatar(
+    request: Request,
+    owner_id: int,
+    size: int = Query(64, ge=1, le=AVATAR_SIZES[-1], alias="s", description="Edge length in pixels"),
+):
+    """
+    Serves a GitHub owner's avatar as a locally cached thumbnail. The size
+    is rounded up to one of the cached variants. Public, no auth required.
+    """
+    item, file_stat = await get_avatar(owner_id, size)
+    cache_control = f"public, max-age={settings.AVATAR_MAX_AGE}"
+    if etag_matches(request, item.etag):
+        return not_modified(item.etag, cache_control, vary=None)
+    return FileResponse(
+        item.path,
+        stat_result=file_stat,
+        media_type=item.content_type,
+        headers={"ETag": item.etag, "Cache-Control": cache_control},
+    )
@@ -1,25 +1,45 @@
+import asyncio
 import csv
 import io
-from typing import Optional
+from datetime import date
+from typing import AsyncIterator, List, Literal, Optional
 
 from fastapi import APIRouter, File, HTTPException, Request, Depends, Query, status, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 
-from app.schemas.bookmark import BookmarkResponse, BookmarkStatsResponse
-from app.crud.bookmark_crud import create_bookmark, get_bookmark_by_full_name, delete_bookmark, get_bookmark_counts_by_date, get_user_bookmarks, get_total_bookmarks_count, get_today_bookmarks_count
-from app.db.setup import get_db
-from app.service.github_service import get_repository_byid
+from app.schemas.bookmark import BookmarkResponse, BookmarkStatsResponse, BookmarkSearchResponse, BookmarkOut
+from app.schemas.bookmark import BatchAddRequest, BatchDeleteRequest, BatchItemResult, BatchResult
+from app.schemas.bookmark import BookmarkTagsUpdate, TagCount, TagListResponse, MAX_TAGS_PER_BOOKMARK, normalize_tag
+from app.crud.bookmark_crud import create_bookmark, get_bookmark_by_full_name, delete_bookmark, get_bookmark_counts_by_date, get_user_bookmarks, get_total_bookmarks_count, get_today_bookmarks_count, search_user_bookmarks, stream_user_bookmarks
+from app.crud.bookmark_crud import create_bookmarks_bulk, delete_bookmarks_bulk, publish_created
+from app.crud.bookmark_crud import get_recent_repo_ids, get_tag_counts, set_bookmark_tags
+from app.crud.popularity_crud import get_repo_popularity
+from app.db.setup import get_db, get_lazy_db, AsyncSessionLocal, LazySession
+from app.service.github_service import get_repository_byid, get_repositories_byid, get_starred_repositories
 from app.schemas.bookmark import BookmarkListResponse
 from app.utils.helpers import parse_date_or_none
-from app.utils.helpers import extract_owner_repo
-from app.schemas.bookmark import ImportResult
+from app.utils.helpers import extract_owner_repo, encode_search_cursor, decode_search_cursor
+from app.utils.http_cache import conditional_json_response, etag_matches, make_etag, not_modified
+from app.crud.user_crud import bump_bookmark_version, get_bookmark_version
+from app.schemas.bookmark import ImportResult, BookmarkExport, StarredImportResult
+from app.schemas.bookmark import PopularRepo, PopularReposResponse, PopularWindow, RecommendationsResponse, RecommendedRepo
 from app.service.github_service import validate_github_repo
 from app.models import Bookmark
+from app.core.config import settings
+from app.core.metrics import SSE_CONNECTIONS
+from app.service.event_bus import encode_event, event_bus
+from app.service.popularity_service import get_popular
+from app.service.recommendation_service import get_model
 
 router = APIRouter(prefix="/bookmark", tags=["Manage Bookmarks"])
 
+# First column must stay the repo URL so exports can be fed back into /import
+EXPORT_CSV_COLUMNS = ["url", "full_name", "repo_name", "owner_name", "description", "created_at"]
+EXPORT_FLUSH_BYTES = 64 * 1024
+
 
 
 
@@ -43,12 +63,132 @@ async def create_bookmark_endpoint(
 
     return await create_bookmark(db, item_in, user_id)
 
+@router.post("/batch", response_model=BatchResult)
+async def create_bookmarks_batch(
+    body: BatchAddRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bookmarks up to 100 repositories at once. GitHub metadata is fetched
+    concurrently and all new rows are written in one transaction.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    resolved = await get_repositories_byid(body.repo_ids)
+    found = [item for item in resolved.values() if item is not None and not isinstance(item, HTTPException)]
+    created, existing = await create_bookmarks_bulk(db, found, user_id)
+    created_by_repo = {bookmark.github_repo_id: bookmark for bookmark in created}
+
+    results = []
+    for repo_id, item in resolved.items():
+        if isinstance(item, HTTPException):
+            results.append(BatchItemResult(id=str(repo_id), status="failed", detail=str(item.detail)))
+        elif item is None:
+            results.append(BatchItemResult(id=str(repo_id), status="not_found", detail="Repository not found"))
+        elif repo_id in existing:
+            results.append(BatchItemResult(id=str(repo_id), status="exists", detail="Bookmark already exists"))
+        else:
+            bookmark = BookmarkOut.model_validate(created_by_repo[repo_id])
+            results.append(BatchItemResult(id=str(repo_id), status="created", bookmark=bookmark))
+
+    succeeded = sum(1 for result in results if result.status == "created")
+    return BatchResult(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        bookmark_version=await get_bookmark_version(db, user_id),
+    )
+
+@router.delete("/batch", response_model=BatchResult)
+async def remove_bookmarks_batch(
+    body: BatchDeleteRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Deletes up to 100 of the user's bookmarks with a single statement.
+    Ids that don't exist or belong to someone else come back as not_found.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    bookmark_ids = list(dict.fromkeys(body.bookmark_ids))
+    deleted = await delete_bookmarks_bulk(db, bookmark_ids, user_id)
+
+    results = [
+        BatchItemResult(id=str(bookmark_id), status="deleted")
+        if str(bookmark_id) in deleted
+        else BatchItemResult(id=str(bookmark_id), status="not_found", detail="Bookmark not found")
+        for bookmark_id in bookmark_ids
+    ]
+    return BatchResult(
+        results=results,
+        succeeded=len(deleted),
+        failed=len(results) - len(deleted),
+        bookmark_version=await get_bookmark_version(db, user_id),
+    )
+
+async def _event_stream(user_id: str, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    # Subscribe before reading the version so a change in between isn't lost
+    subscription = event_bus.subscribe(user_id)
+    SSE_CONNECTIONS.inc()
+    try:
+        # reconnecting clients (EventSource retries on its own) wait 5s between attempts
+        yield "retry: 5000\n\n"
+        if last_event_id is not None:
+            # The request's session is gone by the time the body streams, so use our own
+            async with AsyncSessionLocal() as db:
+                version = await get_bookmark_version(db, user_id)
+            if last_event_id != str(version):
+                yield encode_event("resync", {"bookmark_version": version})
+        while True:
+            try:
+                yield await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # comment line: keeps proxies from closing the idle connection, ignored by EventSource
+                yield ": heartbeat\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+        SSE_CONNECTIONS.dec()
+
+
+@router.get("/events")
+async def bookmark_events(request: Request):
+    """
+    Server-sent events for the user's bookmark changes, to apply incrementally
+    instead of polling /list and /stats:
+
+    - `created`: `{"bookmarks": [...], "bookmark_version": n}`
+    - `updated`: `{"bookmarks": [...], "bookmark_version": n}` (tags changed)
+    - `deleted`: `{"ids": [...], "bookmark_version": n}`
+    - `resync`: events were missed (slow client, or changes while disconnected); refetch.
+
+    Event ids are bookmark versions. A reconnect whose Last-Event-ID is not
+    the current version starts with a `resync`.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    return StreamingResponse(
+        _event_stream(str(user_id), request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/list", response_model=BookmarkListResponse)
 async def list_my_bookmarks(
     request: Request,
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
+    tag: Optional[List[str]] = Query(
+        None, max_length=MAX_TAGS_PER_BOOKMARK, description="Only bookmarks having all of these tags (repeatable)"
+    ),
 ):
     # user_id from middleware
     try:
@@ -56,19 +196,154 @@ async def list_my_bookmarks(
     except AttributeError:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    items, total = await get_user_bookmarks(db, user_id, page=page, per_page=per_page)
+    try:
+        tags = sorted({normalize_tag(value) for value in tag or ()})
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+    # Cheap version lookup first: an unchanged bookmark set short-circuits to 304
+    version = await get_bookmark_version(db, user_id)
+    etag = make_etag("list", user_id, version, page, per_page, *tags)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    items, total = await get_user_bookmarks(db, user_id, page=page, per_page=per_page, tags=tags)
 
     has_next = (page * per_page) < total
     has_prev = page > 1
 
-    return BookmarkListResponse(
+    payload = BookmarkListResponse(
         items=items,
         page=page,
         per_page=per_page,
         total=total,
         has_next=has_next,
         has_prev=has_prev,
+        bookmark_version=version,
+    )
+    return conditional_json_response(request, payload, etag=etag)
+
+@router.get("/search", response_model=BookmarkSearchResponse)
+async def search_my_bookmarks(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Words or prefixes to look for"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Ranked search over the current user's bookmarks by repo name, full name,
+    owner and description. Use `next_cursor` to fetch the following page.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    after = decode_search_cursor(cursor)
+
+    version = await get_bookmark_version(db, user_id)
+    etag = make_etag("search", user_id, version, q, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    items, next_cursor = await search_user_bookmarks(db, user_id, q, limit=limit, after=after)
+
+    payload = BookmarkSearchResponse(
+        items=items,
+        query=q,
+        limit=limit,
+        next_cursor=encode_search_cursor(*next_cursor) if next_cursor else None,
+        has_next=next_cursor is not None,
+        bookmark_version=version,
+    )
+    return conditional_json_response(request, payload, etag=etag)
+
+@router.get("/tags", response_model=TagListResponse)
+async def list_my_tags(request: Request, db: AsyncSession = Depends(get_db)):
+    """All of the user's tags with how many bookmarks carry each, most used first."""
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    version = await get_bookmark_version(db, user_id)
+    etag = make_etag("tags", user_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    counts = await get_tag_counts(db, user_id)
+    payload = TagListResponse(
+        tags=[TagCount(tag=tag, count=count) for tag, count in counts],
+        bookmark_version=version,
     )
+    return conditional_json_response(request, payload, etag=etag)
+
+@router.get("/popular", response_model=PopularReposResponse)
+async def list_popular_repositories(
+    request: Request,
+    window: PopularWindow = Query("7d", description="24h, 7d or all"),
+    limit: int = Query(20, ge=1, le=settings.POPULAR_SNAPSHOT_SIZE),
+):
+    """
+    Repositories bookmarked by the most users. Served from this worker's
+    in-memory snapshot of the popularity rollup, refreshed every
+    POPULAR_REFRESH_SECONDS; windows are counted in whole hours.
+    """
+    snapshot = await get_popular(window, limit)
+    etag = make_etag("popular", window, limit, snapshot.loaded_at.isoformat())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    payload = PopularReposResponse(window=window, items=snapshot.windows[window], refreshed_at=snapshot.loaded_at)
+    return conditional_json_response(request, payload, etag=etag)
+
+@router.get("/recommendations", response_model=RecommendationsResponse)
+async def recommend_repositories(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Repositories often bookmarked by users who bookmarked the same ones as
+    you. Scored in memory from the precomputed similarity model: the request
+    reads only your recent bookmark repo ids and the metadata of the results.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    version = await get_bookmark_version(db, user_id)
+    model = await get_model()
+    model_version = model.version if model is not None else None
+    etag = make_etag("recommendations", user_id, version, model_version, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    items = []
+    if model is not None:
+        repo_ids = await get_recent_repo_ids(db, user_id, settings.RECOMMENDATIONS_MAX_USER_ITEMS)
+        scored = model.recommend(repo_ids, limit)
+        repos = await get_repo_popularity(db, [repo_id for repo_id, _ in scored])
+        items = [
+            RecommendedRepo(**PopularRepo.model_validate(repos[repo_id]).model_dump(), score=score)
+            for repo_id, score in scored
+            if repo_id in repos
+        ]
+    payload = RecommendationsResponse(items=items, model_version=model_version, bookmark_version=version)
+    return conditional_json_response(request, payload, etag=etag)
+
+@router.put("/{bookmark_id}/tags", response_model=BookmarkOut)
+async def update_bookmark_tags(
+    bookmark_id: UUID,
+    body: BookmarkTagsUpdate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Replaces the bookmark's tags. Tags are lowercased; an empty list removes them all."""
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    return await set_bookmark_tags(db, str(bookmark_id), user_id, body.tags)
 
 @router.delete("/{bookmark_id}")
 async def remove_bookmark(
@@ -96,6 +371,12 @@ async def bookmark_stats(
     s_date = parse_date_or_none(start_date)
     e_date = parse_date_or_none(end_date)
 
+    # today_count rolls over at midnight, so the date is part of the validator
+    version = await get_bookmark_version(db, user_id)
+    etag = make_etag("stats", user_id, version, s_date, e_date, date.today())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     # Get total bookmark count
     total_bookmarks = await get_total_bookmarks_count(db, user_id=str(user_id))
 
@@ -105,10 +386,64 @@ async def bookmark_stats(
     # Get date breakdown
     rows = await get_bookmark_counts_by_date(db, user_id=str(user_id), start_date=s_date, end_date=e_date)
 
-    return BookmarkStatsResponse(
+    payload = BookmarkStatsResponse(
         total_bookmarks=total_bookmarks,
         today_count=today_count,
-        data=rows
+        data=rows,
+        bookmark_version=version,
+    )
+    return conditional_json_response(request, payload, etag=etag)
+
+
+async def _export_chunks(user_id: str, export_format: str) -> AsyncIterator[str]:
+    # The request's session is gone by the time the body streams, so use our own
+    async with AsyncSessionLocal() as db:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(EXPORT_CSV_COLUMNS)
+
+        async for bookmark in stream_user_bookmarks(db, user_id):
+            if export_format == "csv":
+                writer.writerow([
+                    bookmark.repo_url,
+                    bookmark.full_name,
+                    bookmark.repo_name,
+                    bookmark.owner_name,
+                    bookmark.description or "",
+                    bookmark.created_at.isoformat() if bookmark.created_at else "",
+                ])
+            else:
+                buffer.write(BookmarkExport.model_validate(bookmark).model_dump_json())
+                buffer.write("\n")
+
+            if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_bookmarks(
+    request: Request,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+):
+    """
+    Streams all of the user's bookmarks as CSV (re-importable through /bookmark/import)
+    or NDJSON. Memory use is constant regardless of the number of bookmarks.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(user_id, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="bookmarks.{export_format}"'},
     )
 
 
@@ -116,8 +451,13 @@ async def bookmark_stats(
 async def import_bookmarks(
         request: Request,
         file: UploadFile = File(...),
-        db: AsyncSession = Depends(get_db)
+        db: LazySession = Depends(get_lazy_db)
 ):
+    """
+    Bookmarks the repositories listed (one URL per row, first column) in a
+    CSV. Every row is checked against GitHub first; the database is only
+    touched afterwards, so no pooled connection waits on those calls.
+    """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV.")
 
@@ -135,8 +475,10 @@ async def import_bookmarks(
     successful = 0
     failed = 0
     errors = []
+    imported = []
 
-
+    # 1. GitHub lookups: (raw_url, repo) or (raw_url, error) per row, in order
+    checked = []
     for row in rows:
             # Assume URL is in the first column of the CSV
             if not row: continue
@@ -148,46 +490,53 @@ async def import_bookmarks(
             owner_repo = extract_owner_repo(raw_url)
 
             if not owner_repo:
-                failed += 1
-                errors.append(f"Invalid URL format: {raw_url}")
+                checked.append((raw_url, f"Invalid URL format: {raw_url}"))
                 continue
 
             # Validate against GitHub API
             try:
                 item_in = await validate_github_repo(owner_repo)
             except HTTPException:
+                item_in = None
+            checked.append((raw_url, item_in or f"Repo not found on GitHub: {raw_url}"))
+
+    # 2. Database: skip existing bookmarks (and repeats within the file), insert the rest
+    seen = set()
+    for raw_url, item_in in checked:
+            if isinstance(item_in, str):
                 failed += 1
-                errors.append(f"Repo not found on GitHub: {raw_url}")
+                errors.append(item_in)
                 continue
-            is_exist = await get_bookmark_by_full_name(db, item_in.full_name, user_id)
+            is_exist = item_in.full_name in seen or await get_bookmark_by_full_name(db, item_in.full_name, user_id)
 
             if is_exist:
                 failed += 1
                 errors.append(f"Bookmark already exists for {raw_url}")
                 continue
-            if item_in:
-                try:
-                    item = Bookmark(
-                        repo_name=item_in.repo_name,
-                        github_repo_id=item_in.repo_id,
-                        owner_name=item_in.owner_name,
-                        owner_id=item_in.owner_id,
-                        owner_avatar_url=item_in.owner_avatar_url,
-                        owner_url=item_in.owner_url,
-                        repo_url=str(item_in.repo_url),
-                        description=item_in.description,
-                        full_name=item_in.full_name,
-                        user_id=user_id,
-                    )
-                    db.add(item)
-                    successful += 1
-                except Exception as e:
-                    failed += 1
-                    errors.append(f"Failed to save bookmark for {raw_url}: {str(e)}")
-            else:
+            seen.add(item_in.full_name)
+            try:
+                item = Bookmark(
+                    repo_name=item_in.repo_name,
+                    github_repo_id=item_in.repo_id,
+                    owner_name=item_in.owner_name,
+                    owner_id=item_in.owner_id,
+                    owner_avatar_url=item_in.owner_avatar_url,
+                    owner_url=item_in.owner_url,
+                    repo_url=str(item_in.repo_url),
+                    description=item_in.description,
+                    full_name=item_in.full_name,
+                    user_id=user_id,
+                )
+                db.add(item)
+                imported.append(item)
+                successful += 1
+            except Exception as e:
                 failed += 1
-                errors.append(f"Repo not found on GitHub: {raw_url}")
+                errors.append(f"Failed to save bookmark for {raw_url}: {str(e)}")
 
+    if successful:
+        version = await bump_bookmark_version(db, user_id)
+        publish_created(db, user_id, imported, version)
     await db.commit()
 
     return ImportResult(
@@ -195,4 +544,35 @@ async def import_bookmarks(
         successful_imports=successful,
         failed_imports=failed,
         errors=errors
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/import/starred", response_model=StarredImportResult)
+async def import_starred_repositories(
+    request: Request,
+    username: str = Query(..., min_length=1, max_length=39, pattern=r"^[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?$",
+                          description="GitHub user whose starred repositories to bookmark"),
+    db: LazySession = Depends(get_lazy_db),
+):
+    """
+    Bookmarks every repository a GitHub user has starred. Metadata comes from
+    the starred list itself and all new rows are written in one transaction,
+    so thousands of stars take a few dozen GitHub calls.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+    starred = await get_starred_repositories(username)
+    created, existing = await create_bookmarks_bulk(db, starred["items"], user_id)
+
+    return StarredImportResult(
+        username=username,
+        total_starred=len(starred["items"]),
+        imported=len(created),
+        already_bookmarked=len(existing),
+        pages_fetched=starred["pages_fetched"],
+        failed_pages=starred["failed_pages"],
+        truncated=starred["truncated"],
+        bookmark_version=await get_bookmark_version(db, user_id),
+    )
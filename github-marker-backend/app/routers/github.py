@@ -1,31 +1,96 @@
-from typing import Literal
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Literal, Optional, Union
 
+import httpx
 from fastapi import APIRouter, status, Query, HTTPException, Request, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Literal
+from fastapi.responses import StreamingResponse
 
-from app.schemas.github import SearchResponse
+from app.schemas.github import SearchResponse, GitHubRepo, GitHubUser, CombinedSearchResponse, SearchSection
+from app.schemas.github import SuggestResponse
 from app.service.github_service import search_github_users, search_github_repositories
-from app.db.setup import get_db
+from app.service.github_service import apply_bookmark_overlay, iter_search_window, GITHUB_SEARCH_RESULT_CAP
+from app.service.suggest_service import MAX_SUGGESTIONS, suggest
+from app.db.setup import get_lazy_db, LazySession
+from app.core.config import settings
+from app.utils.http_cache import conditional_json_response, PRIVATE_REVALIDATE
 
 router = APIRouter(prefix="/github", tags=["Github Search"])
 
+MAX_SEARCH_WINDOW = 500
 
 
+def _has_next(page: int, limit: int, total_count: int) -> bool:
+    # pages past GitHub's result cap can't be fetched, however many matches there are
+    return page * limit < min(total_count, GITHUB_SEARCH_RESULT_CAP)
+
+
+def _search_section(github_response: Dict[str, Any], page: int, limit: int) -> SearchSection:
+    total_count = github_response.get("total_count", 0)
+    return SearchSection(
+        total_count=total_count,
+        has_next=_has_next(page, limit, total_count),
+        items=github_response.get("items", []),
+        stale=github_response.get("stale", False),
+        error=github_response.get("error"),
+    )
+
+
+async def _search_ndjson(
+        search_type: str, github_query: str, text: str, page: int, limit: int, user_id: Optional[str],
+) -> AsyncIterator[str]:
+    """
+    First line: the SearchResponse fields without items (`stale` as of the
+    first upstream page). Then one item per line, written as each upstream
+    page arrives. A failure after the first line ends the stream with an
+    {"error": ...} line.
+    """
+    if search_type == "user":
+        url, model = settings.github_search_user_path, GitHubUser
+    else:
+        url, model = settings.github_search_repos_path, GitHubRepo
+    # Own session: the request-scoped one is closed before streaming starts
+    db = LazySession() if search_type == "repo" and user_id else None
+
+    header_sent = False
+    try:
+        async for total_count, items, stale in iter_search_window(url, model, github_query, page, limit):
+            if not header_sent:
+                header = SearchResponse(
+                    search_type=search_type, search_text=text, page=page, per_page=limit,
+                    total_count=total_count, items=[],
+                    has_next=_has_next(page, limit, total_count), has_prev=page > 1, stale=stale,
+                )
+                yield header.model_dump_json(exclude={"items"}) + "\n"
+                header_sent = True
+            if db is not None:
+                items = await apply_bookmark_overlay(db, user_id, items)
+                await db.release()  # not held while the next upstream page is awaited
+            yield "".join(item.model_dump_json() + "\n" for item in items)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        print(f"GitHub search stream failed: {e}")
+        yield json.dumps({"error": "GitHub search failed"}) + "\n"
+    finally:
+        if db is not None:
+            await db.close()
+
 
 @router.get(
     "/search",
-    response_model=SearchResponse,
+    response_model=Union[SearchResponse, CombinedSearchResponse],
     summary="Search GitHub Users or Repositories with Pagination Metadata",
     status_code=status.HTTP_200_OK,
 )
 async def search_github_endpoint(
-        search_type: Literal["user", "repo"] = Query(..., description="The type of search to perform: 'user' or 'repo'"),
+        search_type: Literal["user", "repo", "all"] = Query(..., description="The type of search to perform: 'user', 'repo' or 'all' (both at once)"),
         text: str = Query(..., description="The simple text string to search for (e.g., 'FastAPI')"),
         page: int = Query(1, ge=1, description="The page number to fetch (must be >= 1)"),
-        limit: int = Query(10, ge=1, le=100, alias="per_page", description="The number of items per page (max 100)"),
+        limit: int = Query(10, ge=1, le=MAX_SEARCH_WINDOW, alias="per_page",
+                           description="The number of items per page (max 500; above 100 GitHub pages are fetched concurrently)"),
+        response_format: Literal["json", "ndjson"] = Query("json", alias="format",
+                                                           description="'ndjson' streams items as upstream pages arrive"),
         request: Request = None,
-        db: AsyncSession = Depends(get_db),
+        db: LazySession = Depends(get_lazy_db),
 ):
     """
     Provides a proxy endpoint to search for users or repositories on GitHub.
@@ -33,9 +98,64 @@ async def search_github_endpoint(
     (e.g., 'text' becomes 'text in:login' or 'text in:name').
 
     Returns matching entities along with total count and pagination details.
+    As on GitHub, only the first 1000 results can be paged through: a window
+    starting past them is a 422, and `has_next` stops at that cap.
+
+    Note: Rate limits from GitHub apply to this API call. Results may be cached
+    privately by the browser for `SEARCH_CACHE_MAX_AGE` seconds.
+
+    While GitHub is failing, a recently fetched copy of the same page is
+    returned with `stale: true`; without one the search answers 502/503
+    (503 with Retry-After while the GitHub circuit is open).
+
+    With `format=ndjson` the first line carries the pagination metadata and
+    every following line is one item.
 
-    Note: Rate limits from GitHub apply to this API call.
+    `search_type=all` runs the user and repository searches concurrently and
+    returns them as separate `users` / `repos` sections. If one of them fails
+    upstream the other is still returned and the failed one carries an `error`.
     """
+    if (page - 1) * limit >= GITHUB_SEARCH_RESULT_CAP:
+        # GitHub answers 422 past its cap; a window there would be empty with no total
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Only the first {GITHUB_SEARCH_RESULT_CAP} search results are available.",
+        )
+
+    user_id = getattr(request.state, "user_id", None) if request else None
+
+    if search_type == "all":
+        if response_format == "ndjson":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="format=ndjson is only supported for search_type 'user' or 'repo'."
+            )
+        users_response, repos_response = await asyncio.gather(
+            search_github_users(query=f"{text} in:login", page=page, per_page=limit),
+            search_github_repositories(
+                query=f"{text} in:name",
+                page=page,
+                per_page=limit,
+                db=db if user_id else None,
+                user_id=user_id
+            ),
+        )
+        await db.release()
+        combined = CombinedSearchResponse(
+            search_text=text,
+            page=page,
+            per_page=limit,
+            has_prev=page > 1,
+            users=_search_section(users_response, page, limit),
+            repos=_search_section(repos_response, page, limit),
+        )
+        # don't let the browser hold on to a half-failed or stale result
+        partial = combined.users.error or combined.repos.error or combined.users.stale or combined.repos.stale
+        return conditional_json_response(
+            request,
+            combined,
+            cache_control=PRIVATE_REVALIDATE if partial else f"private, max-age={settings.SEARCH_CACHE_MAX_AGE}",
+        )
 
     # --- 1. Construct the Structured GitHub Query based on type ---
     github_query: str
@@ -49,7 +169,13 @@ async def search_github_endpoint(
         # This is a fallback, as Literal type should prevent it
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid 'search type' specified. Must be 'user' or 'repo'."
+            detail="Invalid 'search type' specified. Must be 'user', 'repo' or 'all'."
+        )
+
+    if response_format == "ndjson":
+        return StreamingResponse(
+            _search_ndjson(search_type, github_query, text, page, limit, user_id),
+            media_type="application/x-ndjson",
         )
 
     if search_type == "user":
@@ -59,8 +185,6 @@ async def search_github_endpoint(
             per_page=limit
         )
     else:
-        # Extract user_id from request context if available
-        user_id = getattr(request.state, "user_id", None) if request else None
         github_response = await search_github_repositories(
             query=github_query,  # Pass the structured query
             page=page,
@@ -68,10 +192,19 @@ async def search_github_endpoint(
             db=db if user_id else None,  # Pass db only if user is authenticated
             user_id=user_id
         )
+        await db.release()
+
+    if "error" in github_response:
+        raise HTTPException(
+            status_code=github_response["status_code"],
+            detail=github_response["error"],
+            headers=github_response["headers"],
+        )
 
     total_count = github_response.get("total_count", 0)
     items = github_response.get("items", [])
-    has_next = (page * limit) < total_count
+    stale = github_response.get("stale", False)
+    has_next = _has_next(page, limit, total_count)
     has_prev = page > 1
     # 3. Construct the final structured response, including both queries
     final_response = SearchResponse(
@@ -83,6 +216,37 @@ async def search_github_endpoint(
         items=items,
         has_next=has_next,
         has_prev=has_prev,
+        stale=stale,
+    )
+
+    return conditional_json_response(
+        request,
+        final_response,
+        cache_control=PRIVATE_REVALIDATE if stale else f"private, max-age={settings.SEARCH_CACHE_MAX_AGE}",
     )
 
-    return final_response
\ No newline at end of file
+
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    summary="Typeahead suggestions for the search box",
+    status_code=status.HTTP_200_OK,
+)
+async def suggest_endpoint(
+        request: Request,
+        q: str = Query(..., min_length=1, max_length=100, description="What has been typed so far"),
+        limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+):
+    """
+    Repositories (`owner/repo`) and users whose full name, repository name or
+    login starts with `q`, case-insensitively: repos bookmarked on this
+    service (most bookmarked first) and names from recent GitHub searches.
+
+    Answered from this worker's in-memory index, never from GitHub, so it is
+    cheap enough to call on every keystroke.
+    """
+    return conditional_json_response(
+        request,
+        SuggestResponse(query=q, items=suggest(q.strip(), limit)),
+        cache_control=f"private, max-age={settings.SEARCH_CACHE_MAX_AGE}",
+    )
@@ -1,8 +1,21 @@
-from typing import List
+import re
+from datetime import datetime
+from typing import List, Literal
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from uuid import UUID
 
+MAX_TAGS_PER_BOOKMARK = 20
+_TAG_RE = re.compile(r"^[a-z0-9][a-z0-9._-]{0,49}$")
+
+
+def normalize_tag(tag: str) -> str:
+    """Tags are stored lowercased: `Python ` and `python` are the same tag."""
+    normalized = tag.strip().lower()
+    if not _TAG_RE.match(normalized):
+        raise ValueError(f"Invalid tag {tag!r}: use up to 50 letters, digits, '.', '_' or '-'")
+    return normalized
+
 
 class BookmarkBase(BaseModel):
     repo_name: str
@@ -22,6 +35,12 @@ class BookmarkCreate(BookmarkBase):
 class BookmarkOut(BookmarkBase):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
     id: UUID
+    tags: List[str] = []  # filled in where the endpoint loads them (list, tag updates)
+
+
+class BookmarkExport(BookmarkOut):
+    repo_id: int = Field(validation_alias="github_repo_id")
+    created_at: datetime | None = None
 
 
 class BookmarkResponse(BookmarkBase):
@@ -36,6 +55,35 @@ class BookmarkListResponse(BaseModel):
     total: int
     has_next: bool
     has_prev: bool
+    bookmark_version: int = 0
+
+
+class BookmarkSearchResponse(BaseModel):
+    items: List[BookmarkOut]
+    query: str
+    limit: int
+    next_cursor: str | None = None
+    has_next: bool
+    bookmark_version: int = 0
+
+
+class BookmarkTagsUpdate(BaseModel):
+    tags: List[str] = Field(..., max_length=MAX_TAGS_PER_BOOKMARK)
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, tags: List[str]) -> List[str]:
+        return list(dict.fromkeys(normalize_tag(tag) for tag in tags))
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class TagListResponse(BaseModel):
+    tags: List[TagCount]
+    bookmark_version: int = 0
 
 
 class DateCount(BaseModel):
@@ -47,9 +95,75 @@ class BookmarkStatsResponse(BaseModel):
     total_bookmarks: int
     today_count: int
     data: List[DateCount]
+    bookmark_version: int = 0
+
+PopularWindow = Literal["24h", "7d", "all"]
+
+
+class PopularRepo(BaseModel):
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+    repo_id: int = Field(validation_alias="github_repo_id")
+    repo_name: str
+    full_name: str
+    owner_name: str
+    owner_avatar_url: str | None = None
+    repo_url: str | None = None
+    description: str | None = None
+    bookmark_count: int  # bookmarks by all users within the window
+    last_bookmarked_at: datetime | None = None
+
+
+class PopularReposResponse(BaseModel):
+    window: PopularWindow
+    items: List[PopularRepo]
+    refreshed_at: datetime | None = None  # when this worker's snapshot was loaded
+
+
+class RecommendedRepo(PopularRepo):
+    score: float  # summed similarity to the user's bookmarks
+
+
+class RecommendationsResponse(BaseModel):
+    items: List[RecommendedRepo]
+    model_version: str | None = None  # None until a model has been built
+    bookmark_version: int = 0
+
 
 class ImportResult(BaseModel):
     total_processed: int
     successful_imports: int
     failed_imports: int
-    errors: list[str]
\ No newline at end of file
+    errors: list[str]
+
+
+class StarredImportResult(BaseModel):
+    username: str
+    total_starred: int
+    imported: int
+    already_bookmarked: int
+    pages_fetched: int
+    failed_pages: List[int] = []
+    truncated: bool = False  # more stars than STARRED_IMPORT_MAX_PAGES covers
+    bookmark_version: int = 0
+
+
+class BatchAddRequest(BaseModel):
+    repo_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+
+class BatchDeleteRequest(BaseModel):
+    bookmark_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
+class BatchItemResult(BaseModel):
+    id: str  # the repo id or bookmark id exactly as sent
+    status: Literal["created", "exists", "deleted", "not_found", "failed"]
+    bookmark: BookmarkOut | None = None
+    detail: str | None = None
+
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+    bookmark_version: int = 0
@@ -1,4 +1,4 @@
-from typing import Literal, List, Union
+from typing import Literal, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -29,7 +29,30 @@ class SearchResponse(BaseModel):
     has_next: bool
     has_prev: bool
     items: List[Union[GitHubUser, GitHubRepo]]
+    stale: bool = False  # GitHub failed; these are the last results fetched for this page
 
 
+class Suggestion(BaseModel):
+    type: SearchType  # "repo": name is owner/repo; "user": name is a login
+    name: str
+
+class SuggestResponse(BaseModel):
+    query: str
+    items: List[Suggestion]
+
 
+class SearchSection(BaseModel):
+    total_count: int
+    has_next: bool
+    items: List[Union[GitHubUser, GitHubRepo]]
+    stale: bool = False
+    error: Optional[str] = None  # set when this half of the search failed upstream
 
+class CombinedSearchResponse(BaseModel):
+    search_type: Literal["all"] = "all"
+    search_text: str
+    page: int
+    per_page: int
+    has_prev: bool
+    users: SearchSection
+    repos: SearchSection
@@ -41,6 +41,7 @@ class UserOut(BaseModel):
     email: EmailStr
     is_active: bool
     created_at: datetime
+    bookmark_version: int = 0
 
     class Config:
         from_attributes = True
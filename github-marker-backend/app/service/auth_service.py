@@ -2,13 +2,16 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from app.core.config import settings
 from fastapi import HTTPException, status
-from jose import jwt
-from jose.exceptions import JWTError, ExpiredSignatureError
+
+# jose (and the cryptography backend it loads) is imported on first use, not
+# at worker start: see benchmarks/import_time.py
 
 
 # To create an access token
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
@@ -18,6 +21,8 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
 def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     # default 7 days
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
@@ -27,6 +32,9 @@ def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None
 
 
 def verify_token(token: str, expected_type: Optional[str] = None) -> str:
+    from jose import jwt
+    from jose.exceptions import JWTError, ExpiredSignatureError
+
     try:
         payload = jwt.decode(
             token,
@@ -34,7 +42,6 @@ def verify_token(token: str, expected_type: Optional[str] = None) -> str:
             algorithms=[settings.JWT_ALGORITHM],
             options={"verify_exp": True}   # <--- IMPORTANT
         )
-        print(payload, "payload")
         sub: str = payload.get("sub")
         ttype: str = payload.get("type")
 
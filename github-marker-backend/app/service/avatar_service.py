@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+from app.service.github_service import get_shared_client
+
+# Thumbnail sizes we ask GitHub for (it resizes server side with `s=`).
+# Requests snap up to the next size so the cache holds a handful of variants per owner.
+AVATAR_SIZES = (32, 48, 64, 96, 128, 256)
+MAX_AVATAR_BYTES = 1024 * 1024
+
+_CONTENT_TYPES = {"png": "image/png", "jpg": "image/jpeg", "gif": "image/gif", "webp": "image/webp"}
+_EXTENSIONS = {content_type: ext for ext, content_type in _CONTENT_TYPES.items()}
+
+
+@dataclass
+class Avatar:
+    path: str
+    etag: str
+    content_type: str
+    size_bytes: int
+    stored_at: float
+
+
+def snap_size(requested: int) -> int:
+    index = bisect_left(AVATAR_SIZES, requested)
+    return AVATAR_SIZES[min(index, len(AVATAR_SIZES) - 1)]
+
+
+class AvatarDiskCache:
+    """
+    Size-bounded LRU of avatar thumbnails on disk.
+
+    Files are named `{owner_id}-{size}-{etag}.{ext}`, so the index can be
+    rebuilt from a directory listing after a restart (recency then starts out
+    as write order). Files are written via temp file + rename off the event
+    loop, so readers never see a partial image. The index is per worker
+    process; workers sharing a directory only evict files they know about,
+    so an indexed file can still vanish under another worker's eviction.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Tuple[int, int], Avatar]" = OrderedDict()
+
+    def load(self) -> None:
+        """Blocking directory scan (a stat per file), run in a thread before the cache is used."""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            stem, _, ext = name.partition(".")
+            parts = stem.split("-")
+            if ext not in _CONTENT_TYPES or len(parts) != 3 or not parts[0].isdigit() or not parts[1].isdigit():
+                continue
+            path = os.path.join(self.directory, name)
+            stat = os.stat(path)
+            avatar = Avatar(path, f'"{parts[2]}"', _CONTENT_TYPES[ext], stat.st_size, stat.st_mtime)
+            found.append((stat.st_mtime, (int(parts[0]), int(parts[1])), avatar))
+        for _, key, avatar in sorted(found, key=lambda item: item[0]):
+            self._entries[key] = avatar
+            self.total_bytes += avatar.size_bytes
+        self._evict()
+
+    def get(self, owner_id: int, size: int) -> Optional[Avatar]:
+        avatar = self._entries.get((owner_id, size))
+        if avatar is None:
+            CACHE_LOOKUPS.labels("avatar_disk", "miss").inc()
+            return None
+        self._entries.move_to_end((owner_id, size))
+        CACHE_LOOKUPS.labels("avatar_disk", "hit").inc()
+        return avatar
+
+    def write(self, owner_id: int, size: int, body: bytes, content_type: str) -> Avatar:
+        """Blocking file write, run in a thread. Call `add` with the result."""
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        ext = _EXTENSIONS[content_type]
+        path = os.path.join(self.directory, f"{owner_id}-{size}-{etag}.{ext}")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(body)
+        os.replace(tmp_path, path)
+        return Avatar(path, f'"{etag}"', content_type, len(body), time())
+
+    def add(self, owner_id: int, size: int, avatar: Avatar) -> None:
+        self._discard((owner_id, size), keep_path=avatar.path)
+        self._entries[(owner_id, size)] = avatar
+        self.total_bytes += avatar.size_bytes
+        self._evict()
+
+    def forget(self, owner_id: int, size: int) -> None:
+        """Drops the entry of a file that's already gone."""
+        avatar = self._entries.pop((owner_id, size), None)
+        if avatar is not None:
+            self.total_bytes -= avatar.size_bytes
+
+    def _discard(self, key: Tuple[int, int], keep_path: Optional[str] = None) -> None:
+        avatar = self._entries.pop(key, None)
+        if avatar is None:
+            return
+        self.total_bytes -= avatar.size_bytes
+        if avatar.path != keep_path:
+            try:
+                os.remove(avatar.path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._discard(next(iter(self._entries)))
+
+
+_cache: Optional[AvatarDiskCache] = None
+_cache_lock = asyncio.Lock()
+_inflight: Dict[Tuple[int, int], asyncio.Task] = {}
+
+
+async def _get_cache() -> AvatarDiskCache:
+    global _cache
+    if _cache is None:
+        async with _cache_lock:
+            if _cache is None:
+                cache = AvatarDiskCache(settings.AVATAR_CACHE_DIR, settings.AVATAR_CACHE_MAX_BYTES)
+                await asyncio.to_thread(cache.load)
+                _cache = cache
+    return _cache
+
+
+async def warm_up_avatar_cache() -> None:
+    """Indexes the avatar directory at startup rather than on the first avatar request."""
+    await _get_cache()
+
+
+async def _stat_file(path: str) -> Optional[os.stat_result]:
+    try:
+        return await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        return None
+
+
+def _sniff_content_type(body: bytes) -> Optional[str]:
+    if body.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if body.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if body.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if body[:4] == b"RIFF" and body[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+async def _download(owner_id: int, size: int) -> Avatar:
+    url = f"{settings.AVATAR_BASE_URL}u/{owner_id}"
+    try:
+        resp = await get_shared_client().get(url, params={"s": size, "v": 4}, follow_redirects=True)
+    except httpx.RequestError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Failed to fetch avatar: {exc}")
+
+    if resp.status_code == 404:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Avatar not found")
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Avatar host returned status {resp.status_code}")
+
+    body = resp.content
+    content_type = _sniff_content_type(body)
+    if content_type is None or len(body) > MAX_AVATAR_BYTES:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Avatar host returned an unexpected body")
+
+    cache = await _get_cache()
+    avatar = await asyncio.to_thread(cache.write, owner_id, size, body, content_type)
+    cache.add(owner_id, size, avatar)
+    return avatar
+
+
+async def get_avatar(owner_id: int, requested_size: int) -> Tuple[Avatar, os.stat_result]:
+    """
+    Thumbnail of `owner_id` at the nearest supported size, from the disk cache
+    or downloaded once, with a stat of its file for the response. Concurrent
+    misses for the same thumbnail share one download. Entries older than
+    AVATAR_REFRESH_SECONDS are refetched, falling back to the stored copy if
+    GitHub can't be reached. An entry whose file has vanished (evicted by
+    another worker sharing the directory) is dropped and downloaded again.
+    """
+    size = snap_size(requested_size)
+    key = (owner_id, size)
+    cache = await _get_cache()
+    cached = cache.get(owner_id, size)
+    cached_stat = None
+    if cached is not None:
+        cached_stat = await _stat_file(cached.path)
+        if cached_stat is None:
+            cache.forget(owner_id, size)
+            cached = None
+        elif time() - cached.stored_at < settings.AVATAR_REFRESH_SECONDS:
+            return cached, cached_stat
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_download(owner_id, size))
+        _inflight[key] = task
+        task.add_done_callback(lambda _task: _inflight.pop(key, None))
+    try:
+        avatar = await asyncio.shield(task)
+    except HTTPException as exc:
+        if cached is not None and exc.status_code != status.HTTP_404_NOT_FOUND:
+            return cached, cached_stat
+        raise
+
+    avatar_stat = await _stat_file(avatar.path)
+    if avatar_stat is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Avatar was evicted, retry")
+    return avatar, avatar_stat
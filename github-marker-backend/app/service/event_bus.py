@@ -0,0 +1,197 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import SSE_DROPPED_EVENTS
+
+NOTIFY_CHANNEL = "bookmark_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7900
+_PENDING_EVENTS = "bookmark_events_pending"
+
+
+class Subscription:
+    """One SSE connection: a bounded queue of already-encoded messages for one user."""
+
+    def __init__(self, user_id: str, maxsize: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=maxsize)
+
+
+def encode_event(event_type: str, data: Dict[str, Any]) -> str:
+    """SSE wire format. The bookmark version doubles as the event id (Last-Event-ID on reconnect)."""
+    lines = []
+    if "bookmark_version" in data:
+        lines.append(f"id: {data['bookmark_version']}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class MemoryEventBus:
+    """
+    In-process pub/sub keyed by user id. Publishing never blocks: a client
+    whose queue is full loses its backlog and gets a single `resync` event
+    telling it to refetch, so a stalled connection costs at most `queue_size`
+    messages. Only reaches subscribers in this worker process.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(str(user_id), self.queue_size)
+        self._subscribers[subscription.user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        self._deliver(str(user_id), event_type, data)
+
+    def _deliver(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers:
+            return
+        message = encode_event(event_type, data)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                SSE_DROPPED_EVENTS.inc(subscription.queue.qsize())
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(
+                    encode_event("resync", {"bookmark_version": data.get("bookmark_version")})
+                )
+
+
+class PostgresEventBus(MemoryEventBus):
+    """
+    Fans events out to every worker through Postgres LISTEN/NOTIFY. Publishing
+    sends a NOTIFY; each worker (the sender included) delivers what it hears
+    on the channel to its own subscribers. Events too large for a NOTIFY
+    payload (big batches) are reduced to a `resync`.
+    """
+
+    def __init__(self, queue_size: int, dsn: str):
+        super().__init__(queue_size)
+        self.dsn = dsn
+        self._listener = None
+        self._publisher = None
+        self._pending: Set[asyncio.Task] = set()
+        self._reconnect: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._publisher = await asyncpg.connect(self.dsn)
+        self._listener = await asyncpg.connect(self.dsn)
+        self._listener.add_termination_listener(self._listener_lost)
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+        await self._disconnect()
+
+    async def _disconnect(self) -> None:
+        for connection in (self._listener, self._publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+    def _listener_lost(self, _connection) -> None:
+        if self._closing or (self._reconnect is not None and not self._reconnect.done()):
+            return
+        print("WARNING: event bus lost its LISTEN connection, reconnecting")
+        self._reconnect = asyncio.get_running_loop().create_task(self._restart())
+
+    async def _restart(self) -> None:
+        delay = 1.0
+        while not self._closing:
+            try:
+                await self._disconnect()
+                await self.start()
+                return
+            except Exception as e:
+                print(f"Event bus reconnect failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    def _on_notify(self, _connection, _pid: int, _channel: str, payload: str) -> None:
+        message = json.loads(payload)
+        self._deliver(message["user_id"], message["type"], message["data"])
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps({"user_id": str(user_id), "type": event_type, "data": data}, default=str)
+        if len(payload.encode("utf-8")) > MAX_NOTIFY_PAYLOAD:
+            payload = json.dumps({
+                "user_id": str(user_id),
+                "type": "resync",
+                "data": {"bookmark_version": data.get("bookmark_version")},
+            })
+        task = asyncio.get_running_loop().create_task(self._notify(payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _notify(self, payload: str) -> None:
+        try:
+            await self._publisher.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload)
+        except Exception as e:
+            print(f"Event bus NOTIFY failed: {e}")
+
+
+def _make_event_bus() -> Union[MemoryEventBus, PostgresEventBus]:
+    if settings.EVENT_BUS == "postgres":
+        # asyncpg takes a plain postgresql:// DSN, without SQLAlchemy's driver suffix
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+        return PostgresEventBus(settings.EVENTS_QUEUE_SIZE, dsn)
+    return MemoryEventBus(settings.EVENTS_QUEUE_SIZE)
+
+
+event_bus = _make_event_bus()
+
+
+def publish_on_commit(db: AsyncSession, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Queues an event for the user's subscribers, sent only once the current
+    transaction commits (and dropped on rollback), so clients never hear
+    about changes that didn't happen. Build `data` before committing:
+    expired ORM attributes can't be loaded from the commit hook.
+    """
+    pending: List[Tuple[str, str, Dict[str, Any]]] = db.sync_session.info.setdefault(_PENDING_EVENTS, [])
+    pending.append((str(user_id), event_type, data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for user_id, event_type, data in session.info.pop(_PENDING_EVENTS, ()):
+        event_bus.publish(user_id, event_type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS, None)
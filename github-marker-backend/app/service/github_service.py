@@ -1,21 +1,227 @@
+import asyncio
+from time import perf_counter
+
 import httpx
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Iterable, List, Optional, Tuple, Type, Union
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.github import GitHubUser, GitHubRepo
 from app.core.config import settings
+from app.core.metrics import GITHUB_HEDGED_REQUESTS, GITHUB_LATENCY, GITHUB_RATE_LIMIT_REMAINING, GITHUB_RESPONSES
 from app.schemas.bookmark import BookmarkCreate
-from app.crud.bookmark_crud import is_repo_bookmarked
+from app.crud.bookmark_crud import get_bookmark_ids_by_repo
+from app.service.suggest_service import record_search_results
+from app.utils.cache import TTLCache
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED
+
+
+_HTTPX_TIMEOUT = httpx.Timeout(settings.GITHUB_TIMEOUT_SECONDS, connect=settings.GITHUB_CONNECT_TIMEOUT_SECONDS)
+
+# GitHub refuses to page past the first 1000 search results
+GITHUB_SEARCH_RESULT_CAP = 1000
+GITHUB_MAX_PER_PAGE = 100
+
+# Last (remaining, limit) seen per rate-limit resource ("core", "search", ...)
+_rate_limits: Dict[str, Tuple[int, int]] = {}
+
+# (url, query, page, per_page) -> {"total_count": int, "items": [GitHubRepo | GitHubUser]}
+_search_cache = TTLCache("github_search", maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+# Same pages (same objects, so only the keys cost memory) kept longer, for when GitHub fails
+_stale_search_cache = TTLCache("github_search_stale", maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_STALE_TTL)
+_search_inflight: Dict[Tuple, asyncio.Task] = {}
+_prefetches_running = 0
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+# host -> its circuit breaker
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedges_running = 0
 
 
-_HTTPX_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+class GitHubUnavailable(httpx.TransportError):
+    """Raised instead of calling GitHub while its circuit is open; a RequestError like any other failure."""
+
+    def __init__(self, message: str, retry_after: float, request: httpx.Request):
+        super().__init__(message, request=request)
+        self.retry_after = retry_after
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(
+            f"github:{host}", settings.GITHUB_BREAKER_FAILURES, settings.GITHUB_BREAKER_COOLDOWN_SECONDS
+        )
+    return breaker
+
+
+def retry_after_header(exc: httpx.RequestError) -> Optional[Dict[str, str]]:
+    """Retry-After for a 503 caused by an open circuit."""
+    if isinstance(exc, GitHubUnavailable):
+        return {"Retry-After": str(max(int(exc.retry_after + 0.999), 1))}
+    return None
+
+
+def _endpoint_label(url: httpx.URL) -> str:
+    """Bounded metric label from a GitHub URL: search/repositories, repositories, repos, ..."""
+    base_url = httpx.URL(settings.GITHUB_API_BASE_URL)
+    if url.host != base_url.host or url.port != base_url.port:
+        return url.host  # other GitHub hosts (avatars) by host only
+    base_path = base_url.path
+    parts = [part for part in url.path[len(base_path):].split("/") if part]
+    if not parts:
+        return "root"
+    if parts[0] == "search" and len(parts) > 1:
+        return f"search/{parts[1]}"
+    return parts[0]
+
+
+def _may_hedge(request: httpx.Request, endpoint: str) -> bool:
+    if request.method != "GET" or _hedges_running >= settings.GITHUB_HEDGE_CONCURRENCY:
+        return False
+    if get_breaker(request.url.host).state != CLOSED:
+        return False
+    resource = "search" if endpoint.startswith("search/") else "core"
+    return has_rate_limit_budget(resource, settings.GITHUB_HEDGE_MIN_BUDGET)
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Records latency, status and rate-limit headers for every GitHub call.
+    Calls go through the host's circuit breaker (transport errors and 5xx
+    count as failures) and slow GETs are hedged; both are counted once per
+    call, whichever copy answered.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def _hedged(self, request: httpx.Request, endpoint: str) -> httpx.Response:
+        """
+        Sends `request` again if it hasn't been answered after
+        GITHUB_HEDGE_AFTER_SECONDS and returns the first response; a copy
+        that fails is only reported if the other one fails too.
+        """
+        global _hedges_running
+        primary = asyncio.ensure_future(self._transport.handle_async_request(request))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=settings.GITHUB_HEDGE_AFTER_SECONDS)
+            if done or not _may_hedge(request, endpoint):
+                return await primary
+        except BaseException:
+            primary.cancel()
+            raise
+
+        _hedges_running += 1
+        hedge = asyncio.ensure_future(self._transport.handle_async_request(request))
+        pending = {primary, hedge}
+        failure: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                answered = [task for task in done if task.exception() is None]
+                if answered:
+                    winner = primary if primary in answered else answered[0]
+                    for task in answered:
+                        if task is not winner:
+                            await task.result().aclose()
+                    GITHUB_HEDGED_REQUESTS.labels(endpoint, "hedge" if winner is hedge else "primary").inc()
+                    return winner.result()
+                failure = next(iter(done)).exception()
+            raise failure
+        finally:
+            _hedges_running -= 1
+            for task in pending:
+                task.cancel()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = _endpoint_label(request.url)
+        breaker = get_breaker(request.url.host)
+        if not breaker.allow():
+            GITHUB_RESPONSES.labels(endpoint, "circuit_open").inc()
+            raise GitHubUnavailable(
+                f"GitHub circuit open for {request.url.host}", breaker.retry_after(), request=request
+            )
+
+        started = perf_counter()
+        try:
+            if settings.GITHUB_HEDGE_AFTER_SECONDS and request.method == "GET":
+                response = await self._hedged(request, endpoint)
+            else:
+                response = await self._transport.handle_async_request(request)
+        except httpx.RequestError:
+            breaker.record_failure()
+            GITHUB_RESPONSES.labels(endpoint, "error").inc()
+            raise
+        except BaseException:
+            breaker.release()  # cancelled: no verdict on GitHub
+            raise
+        finally:
+            GITHUB_LATENCY.labels(endpoint).observe(perf_counter() - started)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        GITHUB_RESPONSES.labels(endpoint, str(response.status_code)).inc()
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit():
+            resource = response.headers.get("x-ratelimit-resource", "core")
+            GITHUB_RATE_LIMIT_REMAINING.labels(resource).set(int(remaining))
+            limit = response.headers.get("x-ratelimit-limit", "")
+            _rate_limits[resource] = (int(remaining), int(limit) if limit.isdigit() else 0)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=_HTTPX_TIMEOUT, transport=_InstrumentedTransport())
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Long-lived client so searches and prefetches reuse warm keep-alive connections."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = _new_client()
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    global _shared_client
+    for task in list(_search_inflight.values()):
+        task.cancel()
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
+async def warm_up_client() -> None:
+    """
+    Connects the shared client (DNS, TCP, TLS) before traffic arrives. /rate_limit
+    doesn't count against the limit and primes the budget used by prefetching.
+    """
+    try:
+        await get_shared_client().get(f"{settings.GITHUB_API_BASE_URL}rate_limit", timeout=5.0)
+    except httpx.RequestError as e:
+        print(f"WARNING: GitHub warm-up failed: {e}")
+
+
+def has_rate_limit_budget(resource: str, min_fraction: float) -> bool:
+    """False once less than `min_fraction` of the resource's rate limit is left."""
+    seen = _rate_limits.get(resource)
+    if seen is None:
+        return True
+    remaining, limit = seen
+    return remaining > limit * min_fraction
 
 
 async def _get_json(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict[str, Any]]:
     created_client = False
     if client is None:
-        client = httpx.AsyncClient(timeout=_HTTPX_TIMEOUT)
+        client = _new_client()
         created_client = True
 
     try:
@@ -25,7 +231,8 @@ async def _get_json(url: str, client: Optional[httpx.AsyncClient] = None) -> Opt
             await client.aclose()
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Failed to connect to GitHub: {exc}"
+            detail=f"Failed to connect to GitHub: {exc}",
+            headers=retry_after_header(exc),
         )
 
     # handle 404 as None
@@ -76,61 +283,203 @@ def _build_bookmark_from_repo_json(repo: Dict[str, Any]) -> BookmarkCreate:
     return item
 
 
-async def search_github_users(
-        query: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
-    async with httpx.AsyncClient(timeout=_HTTPX_TIMEOUT) as client:
-        try:
-            params = {
-                "q": query,
-                "page": page,
-                "per_page": per_page
-            }
-            response = await client.get(settings.github_search_user_path, params=params)
-            response.raise_for_status()
-            data = response.json()
-            items = [GitHubUser(**item) for item in data.get("items", [])]
-            return {"total_count": data.get("total_count", 0), "items": items}
-
-        except httpx.HTTPStatusError as e:
-            print(f"GitHub API HTTP error: {e.response.status_code} - {e.response.text}")
-            return {"total_count": 0, "items": []}
-        except httpx.RequestError as e:
-            print(f"An error occurred while requesting GitHub API: {e}")
-            return {"total_count": 0, "items": []}
+async def _fetch_search_page(key: Tuple, model: Type[Union[GitHubUser, GitHubRepo]], ttl: Optional[float]) -> Dict[str, Any]:
+    url, query, page, per_page = key
+    response = await get_shared_client().get(url, params={"q": query, "page": page, "per_page": per_page})
+    response.raise_for_status()
+    data = response.json()
+    result = {
+        "total_count": data.get("total_count", 0),
+        "items": [model(**item) for item in data.get("items", [])],
+    }
+    _search_cache.set(key, result, ttl)
+    _stale_search_cache.set(key, result)
+    record_search_results(result["items"])
+    return result
+
+
+def _search_fetch_finished(key: Tuple, task: asyncio.Task) -> None:
+    _search_inflight.pop(key, None)
+    # read here too: every waiter may have been cancelled (shield), leaving the error unretrieved
+    if not task.cancelled() and task.exception() is not None:
+        print(f"GitHub search fetch failed: {task.exception()!r}")
+
+
+def _start_search_fetch(key: Tuple, model: Type[Union[GitHubUser, GitHubRepo]], ttl: Optional[float] = None) -> asyncio.Task:
+    task = asyncio.create_task(_fetch_search_page(key, model, ttl))
+    _search_inflight[key] = task
+    task.add_done_callback(lambda done: _search_fetch_finished(key, done))
+    return task
+
+
+async def _search_page(url: str, model: Type[Union[GitHubUser, GitHubRepo]], query: str, page: int, per_page: int) -> Dict[str, Any]:
+    """
+    One page of GitHub search results from the cache, from a fetch (or
+    prefetch) already in flight for the same page, or from GitHub.
+    Cached items are shared: copy them before changing fields.
+
+    If GitHub fails (or its circuit is open) a page fetched within
+    SEARCH_STALE_TTL is returned instead, with "stale": True.
+    """
+    key = (url, query, page, per_page)
+    cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+    task = _search_inflight.get(key) or _start_search_fetch(key, model)
+    try:
+        # shielded so a client disconnect doesn't cancel a fetch others may be waiting on
+        return await asyncio.shield(task)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        stale = _stale_search_cache.get(key)
+        if stale is None:
+            raise
+        print(f"WARNING: serving a stale GitHub search page: {e!r}")
+        return {**stale, "stale": True}
+
+
+def _prefetch_finished(task: asyncio.Task) -> None:
+    global _prefetches_running
+    _prefetches_running -= 1  # failures are logged by _search_fetch_finished
+
+
+def prefetch_next_search_page(url: str, model: Type[Union[GitHubUser, GitHubRepo]], query: str,
+                              page: int, per_page: int, total_count: int) -> None:
+    """
+    Start fetching page + 1 in the background so "next" is served from the
+    cache. Skipped when there is no next page, it's already cached or being
+    fetched, SEARCH_PREFETCH_CONCURRENCY prefetches are running, or the search
+    rate limit is running low.
+    """
+    global _prefetches_running
+    if not settings.SEARCH_PREFETCH_ENABLED:
+        return
+    if page * per_page >= min(total_count, GITHUB_SEARCH_RESULT_CAP):
+        return
+    key = (url, query, page + 1, per_page)
+    if key in _search_cache or key in _search_inflight:
+        return
+    if _prefetches_running >= settings.SEARCH_PREFETCH_CONCURRENCY:
+        return
+    if not has_rate_limit_budget("search", settings.SEARCH_PREFETCH_MIN_BUDGET):
+        return
+
+    _prefetches_running += 1
+    _start_search_fetch(key, model, ttl=settings.SEARCH_PREFETCH_TTL).add_done_callback(_prefetch_finished)
+
+
+def _window_pages(offset: int, limit: int) -> List[Tuple[int, int, int]]:
+    """
+    (github_page, start, stop) for each 100-item GitHub page covering results
+    [offset, offset + limit), where start:stop slices that page's items.
+    """
+    stop = min(offset + limit, GITHUB_SEARCH_RESULT_CAP)
+    slices = []
+    for github_page in range(offset // GITHUB_MAX_PER_PAGE + 1, (stop - 1) // GITHUB_MAX_PER_PAGE + 2):
+        page_start = (github_page - 1) * GITHUB_MAX_PER_PAGE
+        slices.append((github_page, max(offset - page_start, 0), min(stop - page_start, GITHUB_MAX_PER_PAGE)))
+    return slices
+
+
+async def iter_search_window(
+        url: str, model: Type[Union[GitHubUser, GitHubRepo]], query: str,
+        page: int, per_page: int) -> AsyncIterator[Tuple[int, List[Union[GitHubUser, GitHubRepo]], bool]]:
+    """
+    Yields (total_count, items, stale) for the window `page` of size
+    `per_page`, one upstream page at a time and in order. `stale` is set for
+    pages served from the stale copy because GitHub failed.
+
+    Up to 100 results is a single GitHub page (and the next one is prefetched).
+    Larger windows are split into 100-item GitHub pages that are all requested
+    at once, so the whole window costs about one round trip; each page is
+    yielded as soon as it and the pages before it have arrived.
+    """
+    if per_page <= GITHUB_MAX_PER_PAGE:
+        result = await _search_page(url, model, query, page, per_page)
+        stale = result.get("stale", False)
+        if not stale:
+            prefetch_next_search_page(url, model, query, page, per_page, result["total_count"])
+        yield result["total_count"], result["items"], stale
+        return
+
+    slices = _window_pages((page - 1) * per_page, per_page)
+    tasks = [
+        asyncio.ensure_future(_search_page(url, model, query, github_page, GITHUB_MAX_PER_PAGE))
+        for github_page, _, _ in slices
+    ]
+    try:
+        for task, (_, start, stop) in zip(tasks, slices):
+            result = await task
+            yield result["total_count"], result["items"][start:stop], result.get("stale", False)
+    finally:
+        # the fetches themselves are shielded and still fill the cache
+        for task in tasks:
+            task.cancel()
+
+
+async def _collect_search_window(
+        url: str, model: Type[Union[GitHubUser, GitHubRepo]], query: str, page: int, per_page: int) -> Dict[str, Any]:
+    total_count, items, stale = 0, [], False
+    try:
+        async for total_count, page_items, page_stale in iter_search_window(url, model, query, page, per_page):
+            items.extend(page_items)
+            stale = stale or page_stale
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        if not items:
+            raise
+        # keep the leading pages that did arrive
+        print(f"GitHub search window truncated after {len(items)} items: {e}")
+    return {"total_count": total_count, "items": items, "stale": stale}
+
+
+def _search_failure(exc: Union[httpx.HTTPStatusError, httpx.RequestError]) -> Dict[str, Any]:
+    """Empty result describing why GitHub search failed, with the status and headers to answer with."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        print(f"GitHub API HTTP error: {exc.response.status_code} - {exc.response.text}")
+        return {
+            "total_count": 0, "items": [], "error": f"GitHub returned status {exc.response.status_code}",
+            "status_code": status.HTTP_502_BAD_GATEWAY, "headers": None,
+        }
+    print(f"An error occurred while requesting GitHub API: {exc!r}")
+    return {
+        "total_count": 0, "items": [], "error": "Failed to connect to GitHub",
+        "status_code": status.HTTP_503_SERVICE_UNAVAILABLE, "headers": retry_after_header(exc),
+    }
 
 
-async def search_github_repositories(
-        query: str, page: int = 1, per_page: int = 10, db: Optional[AsyncSession] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+async def apply_bookmark_overlay(db: AsyncSession, user_id: str, items: List[GitHubRepo]) -> List[GitHubRepo]:
+    """Copies of `items` with isAdded/bookmarkId filled in from one bulk lookup."""
+    bookmarked = await get_bookmark_ids_by_repo(db, [item.id for item in items], user_id)
+    return [
+        item.model_copy(update={"isAdded": item.id in bookmarked, "bookmarkId": bookmarked.get(item.id)})
+        for item in items
+    ]
 
-    async with httpx.AsyncClient(timeout=_HTTPX_TIMEOUT) as client:
-        try:
-            params = {
-                "q": query,
-                "page": page,
-                "per_page": per_page
-            }
 
-            response = await client.get(settings.github_search_repos_path, params=params)
-            response.raise_for_status()
+async def search_github_users(
+        query: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+    """
+    {"total_count", "items", "stale"}; upstream failures without a stale copy
+    give no items plus an "error" message and the "status_code" to report.
+    """
+    try:
+        return await _collect_search_window(settings.github_search_user_path, GitHubUser, query, page, per_page)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        return _search_failure(e)
 
-            data = response.json()
-            items = [GitHubRepo(**item) for item in data.get("items", [])]
 
-            # Check if each repo is already bookmarked by the user
-            if db and user_id:
-                for item in items:
-                    is_bookmarked, bookmark_id = await is_repo_bookmarked(db, item.id, user_id)
-                    item.isAdded = is_bookmarked
-                    item.bookmarkId = bookmark_id
+async def search_github_repositories(
+        query: str, page: int = 1, per_page: int = 10, db: Optional[AsyncSession] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+    try:
+        result = await _collect_search_window(settings.github_search_repos_path, GitHubRepo, query, page, per_page)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        return _search_failure(e)
 
-            return {"total_count": data.get("total_count", 0), "items": items}
+    items = result["items"]
+    # Check which repos are already bookmarked by the user
+    if db and user_id:
+        items = await apply_bookmark_overlay(db, user_id, items)
 
-        except httpx.HTTPStatusError as e:
-            print(f"GitHub API error:{e}")
-            return {"total_count": 0, "items": []}
-        except httpx.RequestError as e:
-            print(f"An error occurred while requesting GitHub Repositories: {e}")
-            return {"total_count": 0, "items": []}
+    return {"total_count": result["total_count"], "items": items, "stale": result["stale"]}
 
 
 async def get_repository_byid(repo_id: int, client: Optional[httpx.AsyncClient] = None) -> BookmarkCreate | None:
@@ -142,6 +491,113 @@ async def get_repository_byid(repo_id: int, client: Optional[httpx.AsyncClient]
     return _build_bookmark_from_repo_json(repo_json)
 
 
+async def get_repositories_byid(
+        repo_ids: Iterable[int], concurrency: int = 10) -> Dict[int, Union[BookmarkCreate, HTTPException, None]]:
+    """
+    Resolves many repositories concurrently over one shared client.
+    Maps each id to its BookmarkCreate, None when GitHub says 404, or the
+    HTTPException raised for that id (so one failure doesn't sink the batch).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    ids = list(dict.fromkeys(repo_ids))
+
+    async with _new_client() as client:
+        async def fetch(repo_id: int):
+            async with semaphore:
+                return await get_repository_byid(repo_id, client=client)
+
+        results = await asyncio.gather(*(fetch(repo_id) for repo_id in ids), return_exceptions=True)
+
+    resolved: Dict[int, Union[BookmarkCreate, HTTPException, None]] = {}
+    for repo_id, result in zip(ids, results):
+        if isinstance(result, BaseException) and not isinstance(result, HTTPException):
+            raise result
+        resolved[repo_id] = result
+    return resolved
+
+
+def _starred_page(resp: httpx.Response) -> List[BookmarkCreate]:
+    items = []
+    for repo in resp.json():
+        try:
+            items.append(_build_bookmark_from_repo_json(repo))
+        except HTTPException:
+            continue  # skip entries GitHub sent without the fields we need
+    return items
+
+
+def _link_page(resp: httpx.Response, rel: str) -> Optional[int]:
+    """Page number of the `rel` link in GitHub's Link header, if any."""
+    url = resp.links.get(rel, {}).get("url")
+    if not url:
+        return None
+    page = httpx.URL(url).params.get("page", "")
+    return int(page) if page.isdigit() else None
+
+
+async def get_starred_repositories(username: str) -> Dict[str, Any]:
+    """
+    All repositories `username` has starred, newest star first, as BookmarkCreate
+    items built from the list payload (no per-repo lookups).
+
+    The first page's Link header says how many pages there are; the rest are
+    then fetched at once, at most GITHUB_STARRED_CONCURRENCY at a time, so
+    5000 stars cost 50 requests and about 50 / concurrency round trips. Pages
+    that fail are reported in `failed_pages` and the others still returned.
+    """
+    url = f"{settings.GITHUB_API_BASE_URL}users/{username}/starred"
+    client = get_shared_client()
+
+    async def fetch(page: int) -> httpx.Response:
+        resp = await client.get(url, params={"per_page": GITHUB_MAX_PER_PAGE, "page": page})
+        resp.raise_for_status()
+        return resp
+
+    try:
+        first = await fetch(1)
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="GitHub user not found")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"GitHub returned status {exc.response.status_code}: {exc.response.text[:300]}"
+        )
+    except httpx.RequestError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to connect to GitHub: {exc}",
+            headers=retry_after_header(exc),
+        )
+
+    total_pages = _link_page(first, "last") or 1
+    last_page = min(total_pages, settings.STARRED_IMPORT_MAX_PAGES)
+    semaphore = asyncio.Semaphore(settings.GITHUB_STARRED_CONCURRENCY)
+
+    async def fetch_limited(page: int) -> httpx.Response:
+        async with semaphore:
+            return await fetch(page)
+
+    responses = await asyncio.gather(*(fetch_limited(page) for page in range(2, last_page + 1)), return_exceptions=True)
+
+    items = _starred_page(first)
+    failed_pages = []
+    for page, resp in enumerate(responses, start=2):
+        if isinstance(resp, (httpx.HTTPStatusError, httpx.RequestError)):
+            print(f"GitHub starred page {page} for {username} failed: {resp}")
+            failed_pages.append(page)
+        elif isinstance(resp, BaseException):
+            raise resp
+        else:
+            items.extend(_starred_page(resp))
+
+    return {
+        "items": items,
+        "pages_fetched": last_page - len(failed_pages),
+        "failed_pages": failed_pages,
+        "truncated": total_pages > last_page,
+    }
+
+
 async def validate_github_repo(owner_repo: str, client: Optional[httpx.AsyncClient] = None) -> BookmarkCreate | None:
 
     if "/" not in owner_repo:
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from time import monotonic, perf_counter
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import POPULARITY_REFRESH
+from app.crud.popularity_crud import (
+    apply_popularity_changes,
+    bucket_start,
+    get_popular_repos,
+    latest_bucket_start,
+    LATE_COMMIT_SLACK,
+    prune_hourly_buckets,
+    rebuild_hourly_buckets,
+    recount_popularity_totals,
+)
+from app.db.setup import AsyncSessionLocal, engine
+from app.schemas.bookmark import PopularRepo
+
+# window name -> how far back it reaches (None: all time)
+WINDOWS: Dict[str, Optional[timedelta]] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "all": None,
+}
+RETENTION = max(span for span in WINDOWS.values() if span is not None)
+
+# pg_advisory_lock key held by the one worker that maintains the rollup
+_ADVISORY_LOCK_KEY = 0x6D61726B706F70  # "markpop"
+
+
+class PopularSnapshot(NamedTuple):
+    loaded_at: datetime
+    windows: Dict[str, List[PopularRepo]]
+
+
+_snapshot: Optional[PopularSnapshot] = None
+_snapshot_lock = asyncio.Lock()
+
+
+async def load_snapshot() -> PopularSnapshot:
+    """Reads the top POPULAR_SNAPSHOT_SIZE repos of every window into this worker's memory."""
+    global _snapshot
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        windows = {
+            name: await get_popular_repos(
+                db, None if span is None else bucket_start(now - span), settings.POPULAR_SNAPSHOT_SIZE
+            )
+            for name, span in WINDOWS.items()
+        }
+    _snapshot = PopularSnapshot(now, windows)
+    return _snapshot
+
+
+async def get_popular(window: str, limit: int) -> PopularSnapshot:
+    """The current snapshot, cut to `limit` repos per window. Only the first call can touch the database."""
+    snapshot = _snapshot
+    if snapshot is None:
+        async with _snapshot_lock:
+            snapshot = _snapshot or await load_snapshot()
+    return PopularSnapshot(snapshot.loaded_at, {window: snapshot.windows[window][:limit]})
+
+
+async def refresh_rollup(db: AsyncSession, reconcile: bool) -> None:
+    """
+    Brings the rollup tables up to date. The incremental pass recounts only
+    the hours from the newest stored bucket on and applies the difference to
+    the all-time totals; a reconcile recounts the whole retention window and
+    every total.
+    """
+    now = datetime.now(timezone.utc)
+    oldest = bucket_start(now - RETENTION)
+    if reconcile:
+        await rebuild_hourly_buckets(db, oldest)
+        await recount_popularity_totals(db)
+    else:
+        latest = await latest_bucket_start(db)
+        since = oldest if latest is None else max(latest - LATE_COMMIT_SLACK, oldest)
+        await apply_popularity_changes(db, await rebuild_hourly_buckets(db, since))
+    await prune_hourly_buckets(db, oldest)
+
+
+class PopularityRefresher:
+    """
+    Background task in every worker. Each round, the worker holding the
+    advisory lock refreshes the rollup, then every worker reloads its
+    snapshot. The lock lives on a connection this worker keeps checked out;
+    if the worker dies the lock goes with its connection and another worker
+    takes over on its next round.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._leader: Optional[AsyncConnection] = None
+        self._reconciled_at: Optional[float] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._resign()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._refresh()
+            except Exception as e:
+                print(f"WARNING: popular repos refresh failed: {e}")
+                await self._resign()
+            try:
+                await load_snapshot()
+            except Exception as e:
+                print(f"WARNING: popular repos snapshot failed: {e}")
+            await asyncio.sleep(settings.POPULAR_REFRESH_SECONDS)
+
+    async def _lead(self) -> bool:
+        if self._leader is not None:
+            return True
+        connection = await engine.connect()
+        # SQLite has no advisory locks; every worker on it refreshes (local runs use one)
+        if connection.dialect.name == "postgresql":
+            locked = (await connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            )).scalar()
+            # the lock is session level: it outlives this transaction
+            await connection.commit()
+            if not locked:
+                await connection.close()
+                return False
+        self._leader = connection
+        self._reconciled_at = None  # the previous leader's increments may be incomplete
+        return True
+
+    async def _resign(self) -> None:
+        leader, self._leader = self._leader, None
+        if leader is not None:
+            try:
+                # discarded rather than returned to the pool, which would keep the lock held
+                await leader.invalidate()
+                await leader.close()
+            except Exception as e:
+                print(f"WARNING: closing the popular repos connection failed: {e}")
+
+    async def _refresh(self) -> None:
+        if not await self._lead():
+            return
+        reconcile = self._reconciled_at is None or monotonic() - self._reconciled_at >= settings.POPULAR_RECONCILE_SECONDS
+        started = perf_counter()
+        async with AsyncSession(bind=self._leader, expire_on_commit=False) as db:
+            await refresh_rollup(db, reconcile)
+            await db.commit()
+        POPULARITY_REFRESH.labels("reconcile" if reconcile else "incremental").observe(perf_counter() - started)
+        if reconcile:
+            self._reconciled_at = monotonic()
+
+
+popularity_refresher = PopularityRefresher()
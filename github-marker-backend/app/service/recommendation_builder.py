@@ -0,0 +1,192 @@
+"""
+Offline build of the "bookmarked this, also bookmarked" model:
+
+    python -m app.service.recommendation_builder
+    python -m app.service.recommendation_builder --neighbors 100 --keep 3
+
+Reads (user, repo) pairs from `bookmarks` once, in user order and in
+batches, and computes item-item cosine similarity
+    sim(i, j) = users(i and j) / sqrt(users(i) * users(j))
+a block of items at a time, keeping the top `--neighbors` per item. Memory
+is about 12 bytes per bookmark plus one block of the co-occurrence matrix;
+users with more than RECOMMENDATIONS_MAX_USER_ITEMS bookmarks contribute
+only their most recent ones (they would otherwise dominate both).
+
+The result is written as .npy arrays (a CSR matrix over item indices plus
+the sorted repo ids) into a new version directory. The `current` symlink is
+then swapped atomically; workers notice it and memory-map the new files.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.setup import AsyncSessionLocal
+from app.models import Bookmark
+from app.service.recommendation_service import CURRENT_LINK, MANIFEST
+
+FETCH_BATCH = 10_000
+# Items whose co-occurrence rows are multiplied out at once
+BLOCK_ITEMS = 4096
+
+
+async def load_pairs(max_user_items: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(user index, repo id) per bookmark, at most `max_user_items` most recent per user."""
+    stmt = (
+        select(Bookmark.user_id, Bookmark.github_repo_id)
+        .order_by(Bookmark.user_id.asc(), Bookmark.created_at.desc())
+        .execution_options(yield_per=FETCH_BATCH)
+    )
+    user_chunks: List[np.ndarray] = []
+    repo_chunks: List[np.ndarray] = []
+    last_user, user_index, taken = None, -1, 0
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            users = np.empty(len(partition), dtype=np.int32)
+            repos = np.empty(len(partition), dtype=np.int64)
+            keep = np.ones(len(partition), dtype=bool)
+            for row, (user_id, repo_id) in enumerate(partition):
+                if user_id != last_user:
+                    last_user, user_index, taken = user_id, user_index + 1, 0
+                taken += 1
+                keep[row] = taken <= max_user_items
+                users[row] = user_index
+                repos[row] = repo_id
+            user_chunks.append(users[keep])
+            repo_chunks.append(repos[keep])
+
+    if not user_chunks:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+    return np.concatenate(user_chunks), np.concatenate(repo_chunks)
+
+
+def _top_k_per_row(n_rows: int, rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, k: int):
+    """Keeps each row's `k` largest entries; returns (row counts, columns, values) in row order."""
+    order = np.lexsort((-vals, rows))
+    rows, cols, vals = rows[order], cols[order], vals[order]
+    starts = np.searchsorted(rows, np.arange(n_rows))
+    rank = np.arange(len(rows)) - starts[rows]
+    keep = rank < k
+    return np.bincount(rows[keep], minlength=n_rows), cols[keep], vals[keep]
+
+
+def build_similarity(users: np.ndarray, repo_ids: np.ndarray, neighbors: int):
+    """Sorted item repo ids and the top-`neighbors` cosine similarity CSR (indptr, indices, scores)."""
+    items, item_index = np.unique(repo_ids, return_inverse=True)
+    n_users = int(users.max()) + 1 if len(users) else 0
+    user_items = sp.csr_matrix(
+        (np.ones(len(users), dtype=np.float32), (users, item_index)), shape=(n_users, len(items))
+    )
+    user_items.sum_duplicates()
+    user_items.data[:] = 1.0  # the same repo bookmarked twice still counts once
+    item_users = user_items.T.tocsr()
+    popularity = np.asarray(item_users.sum(axis=1)).ravel()
+    inverse_norm = 1.0 / np.sqrt(np.maximum(popularity, 1.0))
+
+    counts: List[np.ndarray] = []
+    indices: List[np.ndarray] = []
+    scores: List[np.ndarray] = []
+    for start in range(0, len(items), BLOCK_ITEMS):
+        stop = min(start + BLOCK_ITEMS, len(items))
+        cooccurrence = (item_users[start:stop] @ user_items).tocoo()
+        rows, cols = cooccurrence.row, cooccurrence.col
+        not_self = cols != rows + start
+        rows, cols = rows[not_self], cols[not_self]
+        similarity = cooccurrence.data[not_self] * inverse_norm[rows + start] * inverse_norm[cols]
+        row_counts, cols, vals = _top_k_per_row(stop - start, rows, cols, similarity, neighbors)
+        counts.append(row_counts)
+        indices.append(cols.astype(np.int32))
+        scores.append(vals.astype(np.float32))
+
+    indptr = np.zeros(len(items) + 1, dtype=np.int64)
+    if counts:
+        np.cumsum(np.concatenate(counts), out=indptr[1:])
+    return (
+        items,
+        indptr,
+        np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+        np.concatenate(scores) if scores else np.empty(0, dtype=np.float32),
+        n_users,
+    )
+
+
+def publish(directory: str, arrays: dict, manifest: dict, keep: int) -> str:
+    """
+    Writes a new version directory and points `current` at it with an atomic
+    rename, so a worker never sees half a model. Keeps the newest `keep`
+    versions (a worker may still have the previous one mapped).
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = manifest["version"]
+    staging = os.path.join(directory, f".{version}.tmp")
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), array)
+    with open(os.path.join(staging, MANIFEST), "w") as handle:
+        json.dump(manifest, handle, indent=2)
+    os.rename(staging, os.path.join(directory, version))
+
+    link = os.path.join(directory, CURRENT_LINK)
+    temporary_link = f"{link}.tmp"
+    if os.path.lexists(temporary_link):
+        os.remove(temporary_link)
+    os.symlink(version, temporary_link)
+    os.replace(temporary_link, link)
+
+    versions = sorted(
+        entry for entry in os.listdir(directory)
+        if not entry.startswith(".") and entry != CURRENT_LINK and os.path.isdir(os.path.join(directory, entry))
+    )
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+    return version
+
+
+async def build(directory: str, neighbors: int, max_user_items: int, keep: int) -> dict:
+    started = perf_counter()
+    users, repo_ids = await load_pairs(max_user_items)
+    loaded = perf_counter()
+    items, indptr, indices, scores, n_users = build_similarity(users, repo_ids, neighbors)
+    built_at = datetime.now(timezone.utc)
+    manifest = {
+        "version": built_at.strftime("%Y%m%dT%H%M%S%fZ"),
+        "built_at": built_at.isoformat(),
+        "users": n_users,
+        "items": int(len(items)),
+        "bookmarks": int(len(repo_ids)),
+        "neighbors": neighbors,
+        "nnz": int(len(indices)),
+        "load_seconds": round(loaded - started, 3),
+        "build_seconds": round(perf_counter() - loaded, 3),
+    }
+    arrays = {"items": items, "indptr": indptr, "indices": indices, "scores": scores}
+    publish(directory, arrays, manifest, keep)
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the repository recommendation model.")
+    parser.add_argument("--directory", default=settings.RECOMMENDATIONS_DIR)
+    parser.add_argument("--neighbors", type=int, default=settings.RECOMMENDATIONS_NEIGHBORS)
+    parser.add_argument("--max-user-items", type=int, default=settings.RECOMMENDATIONS_MAX_USER_ITEMS)
+    parser.add_argument("--keep", type=int, default=2, help="model versions to keep on disk")
+    args = parser.parse_args()
+
+    manifest = asyncio.run(build(args.directory, args.neighbors, args.max_user_items, max(args.keep, 1)))
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
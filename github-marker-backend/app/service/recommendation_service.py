@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+from time import monotonic
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Layout written by app.service.recommendation_builder:
+#   <RECOMMENDATIONS_DIR>/<version>/{items,indptr,indices,scores}.npy + manifest.json
+#   <RECOMMENDATIONS_DIR>/current -> <version>
+ARRAYS = ("items", "indptr", "indices", "scores")
+MANIFEST = "manifest.json"
+CURRENT_LINK = "current"
+
+
+class RecommendationModel:
+    """
+    Top-K item-item similarities as memory-mapped CSR arrays: the neighbours of
+    item i are indices[indptr[i]:indptr[i+1]] with their scores, and items[i]
+    is the GitHub repo id of item i (sorted, so lookups are a binary search).
+    Read-only; a rebuild produces a new instance.
+    """
+
+    def __init__(self, version: str, manifest: Dict[str, Any], arrays: Dict[str, Any]):
+        self.version = version
+        self.manifest = manifest
+        self.items = arrays["items"]
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.scores = arrays["scores"]
+
+    @classmethod
+    def load(cls, directory: str, version: str) -> "RecommendationModel":
+        import numpy as np  # only workers that serve recommendations pay for numpy
+
+        path = os.path.join(directory, version)
+        with open(os.path.join(path, MANIFEST)) as handle:
+            manifest = json.load(handle)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        return cls(version, manifest, arrays)
+
+    def recommend(self, repo_ids: Sequence[int], limit: int) -> List[Tuple[int, float]]:
+        """
+        Repos scored by summed similarity to `repo_ids`, best first, excluding
+        `repo_ids` themselves. Touches only the neighbour rows of those repos.
+        """
+        import numpy as np
+
+        if not repo_ids or len(self.items) == 0:
+            return []
+        owned = np.unique(np.asarray(repo_ids, dtype=np.int64))
+        positions = np.searchsorted(self.items, owned)
+        found = positions < len(self.items)
+        found[found] = self.items[positions[found]] == owned[found]
+        rows = positions[found]
+        if len(rows) == 0:
+            return []
+
+        starts, stops = self.indptr[rows], self.indptr[rows + 1]
+        lengths = stops - starts
+        # gather every neighbour slice at once: offsets = start of each row + position within it
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        neighbours = self.indices[offsets]
+        candidates, inverse = np.unique(neighbours, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.scores[offsets])
+
+        candidates_repo = self.items[candidates]
+        fresh = ~np.isin(candidates_repo, owned)
+        candidates_repo, totals = candidates_repo[fresh], totals[fresh]
+        if len(totals) > limit:
+            best = np.argpartition(-totals, limit)[:limit]
+            candidates_repo, totals = candidates_repo[best], totals[best]
+        order = np.lexsort((candidates_repo, -totals))
+        return [(int(candidates_repo[i]), float(totals[i])) for i in order]
+
+
+_model: Optional[RecommendationModel] = None
+_checked_at: Optional[float] = None
+_load_lock = asyncio.Lock()
+
+
+def _current_version(directory: str) -> Optional[str]:
+    try:
+        return os.readlink(os.path.join(directory, CURRENT_LINK))
+    except OSError:
+        return None
+
+
+async def get_model() -> Optional[RecommendationModel]:
+    """
+    The model `current` points at. The link is re-read at most every
+    RECOMMENDATIONS_RELOAD_SECONDS; a new version is mapped in a thread and
+    swapped in as one reference, so requests see either the old or the new
+    model. None until a model has been built.
+    """
+    global _model, _checked_at
+    if _checked_at is not None and monotonic() - _checked_at < settings.RECOMMENDATIONS_RELOAD_SECONDS:
+        return _model
+    async with _load_lock:
+        if _checked_at is not None and monotonic() - _checked_at < settings.RECOMMENDATIONS_RELOAD_SECONDS:
+            return _model
+        directory = settings.RECOMMENDATIONS_DIR
+        version = _current_version(directory)
+        if version is not None and (_model is None or _model.version != version):
+            try:
+                _model = await asyncio.to_thread(RecommendationModel.load, directory, version)
+            except (OSError, ValueError) as e:
+                # keep serving the previous model; a half-deleted version is retried next time
+                print(f"WARNING: could not load recommendations {version}: {e}")
+        _checked_at = monotonic()
+    return _model
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Union
+
+from app.core.config import settings
+from app.crud.popularity_crud import get_popular_repos, get_repos_bookmarked_since, LATE_COMMIT_SLACK
+from app.db.setup import AsyncSessionLocal
+from app.schemas.github import GitHubRepo, GitHubUser, Suggestion
+from app.utils.prefix_index import IndexEntry, PrefixIndex
+
+MAX_SUGGESTIONS = 20
+# Weight of a name only seen in GitHub search results; bookmarked repos weigh their bookmark count
+SEARCH_RESULT_WEIGHT = 0.5
+# Search result names wait this long to be added in one batch with the ones from other pages
+SEARCH_RESULT_FLUSH_SECONDS = 1.0
+# Repos added to the index between yields to the event loop during a refresh
+REFRESH_BATCH_SIZE = 500
+
+# ("repo", full_name) found by full name or repo name, ("user", login) by login
+_index = PrefixIndex(settings.SUGGEST_INDEX_SIZE, settings.SUGGEST_MAX_SCAN, MAX_SUGGESTIONS)
+_pending_search_results: List[IndexEntry] = []
+_flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+def repo_entries(full_name: str, owner_name: str, weight: float) -> Iterator[IndexEntry]:
+    """A repo's two index names: itself, by full name or repo name, and its owner."""
+    yield ("repo", full_name), (full_name, full_name.partition("/")[2]), weight
+    yield ("user", owner_name), (owner_name,), weight
+
+
+def _flush_search_results() -> None:
+    global _flush_handle
+    _flush_handle = None
+    entries = _pending_search_results[:]
+    _pending_search_results.clear()
+    _index.add_many(entries)
+
+
+def record_search_results(items: Iterable[Union[GitHubUser, GitHubRepo]]) -> None:
+    """Makes the names on a GitHub search page suggestible, shortly, off the request."""
+    global _flush_handle
+    for item in items:
+        if isinstance(item, GitHubRepo):
+            _pending_search_results.extend(repo_entries(item.full_name, item.owner.login, SEARCH_RESULT_WEIGHT))
+        else:
+            _pending_search_results.append((("user", item.login), (item.login,), SEARCH_RESULT_WEIGHT))
+    if _flush_handle is None and _pending_search_results:
+        _flush_handle = asyncio.get_running_loop().call_later(SEARCH_RESULT_FLUSH_SECONDS, _flush_search_results)
+
+
+def suggest(prefix: str, limit: int) -> List[Suggestion]:
+    if not prefix:
+        return []
+    return [Suggestion(type=kind, name=name) for (kind, name), _ in _index.search(prefix, limit)]
+
+
+class SuggestIndexRefresher:
+    """
+    Background task in every worker that feeds bookmarked repos into the
+    suggestion index: the most bookmarked ones on the first round, then
+    every SUGGEST_REFRESH_SECONDS the ones bookmarked since the previous
+    round. Both read the popularity rollup rather than `bookmarks`; the
+    rollup trails new bookmarks by up to a refresh, so each round reaches
+    back LATE_COMMIT_SLACK further (adding a repo twice is a no-op).
+
+    A repo takes two names (itself and its owner), so a round reads at most
+    half of SUGGEST_INDEX_SIZE repos and doesn't evict what it just added.
+    They go in batches of REFRESH_BATCH_SIZE with a yield to the event loop
+    between them.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._since: Optional[datetime] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"WARNING: suggestion index refresh failed: {e}")
+            await asyncio.sleep(settings.SUGGEST_REFRESH_SECONDS)
+
+    async def refresh(self) -> None:
+        started = datetime.now(timezone.utc)
+        max_repos = settings.SUGGEST_INDEX_SIZE // 2
+        async with AsyncSessionLocal() as db:
+            if self._since is None:
+                repos = await get_popular_repos(db, None, max_repos)
+            else:
+                repos = await get_repos_bookmarked_since(db, self._since - LATE_COMMIT_SLACK, max_repos)
+        for start in range(0, len(repos), REFRESH_BATCH_SIZE):
+            _index.add_many(
+                entry
+                for repo in repos[start : start + REFRESH_BATCH_SIZE]
+                for entry in repo_entries(repo.full_name, repo.owner_name, repo.bookmark_count)
+            )
+            await asyncio.sleep(0)
+        self._since = started
+
+
+suggest_index_refresher = SuggestIndexRefresher()
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional, Set, Tuple, Union
+
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire `ttl` seconds after
+    being set (per-entry TTLs may be shorter or longer than the default).
+
+    Not shared between workers. Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is not _MISSING:
+            expires_at, value = entry
+            if expires_at > monotonic():
+                self._data.move_to_end(key)
+                CACHE_LOOKUPS.labels(self.name, "hit").inc()
+                return value
+            del self._data[key]
+        CACHE_LOOKUPS.labels(self.name, "miss").inc()
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > monotonic()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Async facade over TTLCache so callers can swap in RedisBackend."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self._cache = TTLCache(name, maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value)
+
+    def invalidate(self, key: str) -> None:
+        self._cache.pop(key)
+
+
+class RedisBackend:
+    """
+    Shared cache in Redis, values stored as JSON under `{name}:{key}`.
+    Lookups that fail (Redis down) count as misses so callers fall back to
+    the database. Needs the optional `redis` package.
+    """
+
+    def __init__(self, name: str, url: str, ttl: float):
+        import redis.asyncio as redis  # optional dependency, only needed when REDIS_URL is set
+
+        self.name = name
+        self.ttl = int(ttl)
+        self._redis = redis.from_url(url)
+        self._pending: Set[asyncio.Task] = set()
+
+    async def get(self, key: str) -> Any:
+        try:
+            raw = await self._redis.get(f"{self.name}:{key}")
+        except Exception as e:
+            print(f"Redis get failed for {self.name}: {e}")
+            raw = None
+        CACHE_LOOKUPS.labels(self.name, "miss" if raw is None else "hit").inc()
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self._redis.set(f"{self.name}:{key}", json.dumps(value), ex=self.ttl)
+        except Exception as e:
+            print(f"Redis set failed for {self.name}: {e}")
+
+    async def _delete(self, key: str) -> None:
+        try:
+            await self._redis.delete(f"{self.name}:{key}")
+        except Exception as e:
+            print(f"Redis delete failed for {self.name}: {e}")
+
+    def invalidate(self, key: str) -> None:
+        # Called from sync contexts (session events), so the delete runs as a task
+        task = asyncio.get_running_loop().create_task(self._delete(key))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def make_cache_backend(name: str, maxsize: int, ttl: float) -> Union[MemoryBackend, RedisBackend]:
+    """RedisBackend when REDIS_URL is configured (consistent across workers), else per-process memory."""
+    if settings.REDIS_URL:
+        return RedisBackend(name, settings.REDIS_URL, ttl)
+    return MemoryBackend(name, maxsize, ttl)
@@ -0,0 +1,69 @@
+from time import monotonic
+
+from app.core.metrics import CIRCUIT_STATE
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    Closed: calls go through; `failure_threshold` failures in a row open it.
+    Open: calls are refused for `cooldown` seconds.
+    Half-open: one probe call at a time is let through; its success closes
+    the circuit, its failure opens it for another cooldown.
+
+    Callers ask `allow()` before a call and then report exactly one of
+    `record_success()`, `record_failure()` or `release()` (call abandoned,
+    e.g. cancelled, so no verdict). Only touched from the event loop.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cooldown: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        CIRCUIT_STATE.labels(name).set(_STATE_VALUES[CLOSED])
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            print(f"WARNING: circuit {self.name} {self.state} -> {state}")
+            self.state = state
+            CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 when not open)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._opened_at + self.cooldown - monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._probing = False
+        self._failures = 0
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = monotonic()
+            self._set_state(OPEN)
+
+    def release(self) -> None:
+        self._probing = False
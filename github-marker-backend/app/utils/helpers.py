@@ -1,6 +1,9 @@
+import base64
+import json
 import re
 from datetime import date
-from typing import Optional
+from typing import Optional, Tuple
+from uuid import UUID
 
 from fastapi import HTTPException, status
 
@@ -14,6 +17,22 @@ def parse_date_or_none(value: Optional[str]) -> Optional[date]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format. Use YYYY-MM-DD")
 
 
+def encode_search_cursor(rank: float, bookmark_id: UUID) -> str:
+    raw = json.dumps([rank, str(bookmark_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, UUID]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, bookmark_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), UUID(bookmark_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 def extract_owner_repo(url: str):
     pattern = r"github\.com/([^/]+)/([^/]+)"
     match = re.search(pattern, url)
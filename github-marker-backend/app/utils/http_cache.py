@@ -0,0 +1,70 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.metrics import CACHE_LOOKUPS
+from app.middleware.compression import ENCODING_SUFFIXES
+
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from arbitrary parts (ids, versions, query params)."""
+    raw = "|".join(str(part) for part in parts).encode("utf-8")
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def _normalize_etag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison of If-None-Match against our ETag (RFC 9110 13.1.2).
+    Encoding suffixes added by the compression middleware are ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_normalize_etag(tag) == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE, vary: Optional[str] = "Cookie") -> Response:
+    CACHE_LOOKUPS.labels("http_etag", "hit").inc()
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+def conditional_json_response(
+    request: Request,
+    payload: BaseModel,
+    cache_control: str = PRIVATE_REVALIDATE,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Serialize `payload` and attach validators. If no ETag is given it is derived
+    from the serialized body. Returns `304` when the client already has it.
+    """
+    body = payload.model_dump_json(by_alias=True).encode("utf-8")
+    etag = etag or f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    CACHE_LOOKUPS.labels("http_etag", "miss").inc()
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Cookie"},
+    )
@@ -0,0 +1,172 @@
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush, nsmallest
+from itertools import count
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Prefixes up to this long match too many keys to rank on every lookup
+SHORT_PREFIX = 2
+# Fewer new keys than this are inserted in place; more are spliced in with one copy of the key list
+SPLICE_MIN_KEYS = 128
+
+# (name, its keys, weight) as taken by PrefixIndex.add_many
+IndexEntry = Tuple[Hashable, Iterable[str], float]
+
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix lookup over a bounded set of names, each with a
+    weight. Every (lowercased key, name) pair sits in one sorted list, so a
+    lookup is a bisect to the first key with the prefix plus a scan of at
+    most `max_scan` following keys, of which the heaviest names are
+    returned. A name can be reachable from several keys ("owner/repo" and
+    "repo").
+
+    One- and two-letter prefixes would hit the scan limit before seeing the
+    heaviest names, so their best `top_size` are ranked over the whole
+    range once, kept, and updated as names come and go.
+
+    Names are added in batches: a large batch's pairs are sorted and spliced
+    into the key list in one pass, so it costs about one copy of the list
+    however many names it holds. Past `maxsize` names the lightest, least
+    recently added ones are dropped down to nine tenths of it, popped from a
+    heap rather than found by ranking every name.
+
+    Not shared between workers. Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, maxsize: int, max_scan: int, top_size: int):
+        self.maxsize = maxsize
+        self.max_scan = max_scan
+        self.top_size = top_size
+        self._keys: List[Tuple[str, Hashable]] = []
+        # name -> (weight, last added (sequence number), its keys); tuples, so the GC can untrack them
+        self._names: Dict[Hashable, Tuple[float, int, Tuple[str, ...]]] = {}
+        # (weight, sequence, name) per add; entries a later add superseded are skipped when popped
+        self._eviction_heap: List[Tuple[float, int, Hashable]] = []
+        # short prefix -> its best names, best first
+        self._top: Dict[str, List[Hashable]] = {}
+        self._sequence = count()
+
+    def add(self, name: Hashable, keys: Iterable[str], weight: float = 0.0) -> None:
+        """Adds `name` under `keys`, or raises its weight to `weight` if it's already there."""
+        self.add_many([(name, keys, weight)])
+
+    def add_many(self, entries: Iterable[IndexEntry]) -> None:
+        """Adds each name under its keys, or raises its weight if it's already there."""
+        new_pairs: List[Tuple[str, Hashable]] = []
+        raised: Set[Hashable] = set()
+        for name, keys, weight in entries:
+            entry = self._names.get(name)
+            sequence = next(self._sequence)
+            if entry is None:
+                lowered = tuple(sorted({key.lower() for key in keys if key}))
+                new_pairs.extend((key, name) for key in lowered)
+                raised.add(name)
+            else:
+                if weight > entry[0]:
+                    raised.add(name)
+                weight, lowered = max(weight, entry[0]), entry[2]
+            self._names[name] = (weight, sequence, lowered)
+            heappush(self._eviction_heap, (weight, sequence, name))
+
+        if new_pairs:
+            self._merge_keys(sorted(new_pairs))
+        if len(self._names) > self.maxsize:
+            raised.difference_update(self._evict(len(self._names) - self.maxsize * 9 // 10))
+        self._update_top(raised)
+        if len(self._eviction_heap) > 2 * len(self._names) + 1024:
+            self._eviction_heap = [(weight, sequence, name) for name, (weight, sequence, _) in self._names.items()]
+            heapify(self._eviction_heap)
+
+    def _merge_keys(self, pairs: List[Tuple[str, Hashable]]) -> None:
+        """Inserts sorted `pairs` one by one (a memmove each) when few, else splices them in with one copy."""
+        keys = self._keys
+        if len(pairs) < SPLICE_MIN_KEYS:
+            for pair in pairs:
+                insort(keys, pair)
+            return
+        merged: List[Tuple[str, Hashable]] = []
+        position = 0
+        for pair in pairs:
+            insert_at = bisect_left(keys, pair, position)
+            merged.extend(keys[position:insert_at])
+            merged.append(pair)
+            position = insert_at
+        merged.extend(keys[position:])
+        self._keys = merged
+
+    def _evict(self, how_many: int) -> Set[Hashable]:
+        dropped: Set[Hashable] = set()
+        while len(dropped) < how_many and self._eviction_heap:
+            weight, sequence, name = heappop(self._eviction_heap)
+            entry = self._names.get(name)
+            if entry is not None and entry[0] == weight and entry[1] == sequence:
+                del self._names[name]
+                dropped.add(name)
+        self._keys = [pair for pair in self._keys if pair[1] not in dropped]
+
+        for prefix, top in list(self._top.items()):
+            kept = [name for name in top if name not in dropped]
+            if len(kept) == len(top):
+                continue
+            if len(top) < self.top_size:
+                self._top[prefix] = kept  # held every match, so it still does
+            else:
+                # names ranked below the dropped ones may now belong in it
+                self._top[prefix] = self._rank_all(prefix)
+        return dropped
+
+    def _rank(self, name: Hashable, prefix: str) -> Tuple[float, int, Hashable]:
+        """Heaviest first, then the one whose matching key is shortest (closest to what was typed)."""
+        weight, _, keys = self._names[name]
+        return -weight, min(len(key) for key in keys if key.startswith(prefix)), name
+
+    def _rank_all(self, prefix: str) -> List[Hashable]:
+        return nsmallest(self.top_size, self._matches(prefix, None), key=lambda name: self._rank(name, prefix))
+
+    def _update_top(self, names: Set[Hashable]) -> None:
+        """Merges new or heavier `names` into the kept lists of the short prefixes they match."""
+        candidates: Dict[str, Set[Hashable]] = {}
+        for name in names:
+            weight, _, keys = self._names[name]
+            for key in keys:
+                for length in range(1, SHORT_PREFIX + 1):
+                    top = self._top.get(key[:length])
+                    if top is None:
+                        continue
+                    # lighter than the last of a full list can't get in
+                    if len(top) >= self.top_size and weight < self._names[top[-1]][0]:
+                        continue
+                    candidates.setdefault(key[:length], set()).add(name)
+        for prefix, added in candidates.items():
+            merged = added.union(self._top[prefix])
+            self._top[prefix] = nsmallest(self.top_size, merged, key=lambda name: self._rank(name, prefix))
+
+    def _matches(self, prefix: str, max_scan: Optional[int]) -> List[Hashable]:
+        keys = self._keys
+        start = bisect_left(keys, (prefix,))
+        stop = len(keys) if max_scan is None else min(start + max_scan, len(keys))
+        names = {}
+        for position in range(start, stop):
+            key, name = keys[position]
+            if not key.startswith(prefix):
+                break
+            names[name] = None
+        return list(names)
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[Hashable, float]]:
+        """(name, weight) of the best `limit` names with a key starting with `prefix`."""
+        prefix = prefix.lower()
+        if len(prefix) <= SHORT_PREFIX and limit <= self.top_size:
+            top = self._top.get(prefix)
+            if top is None:
+                top = self._top[prefix] = self._rank_all(prefix)
+            ranked = top[:limit]
+        else:
+            ranked = nsmallest(
+                limit, self._matches(prefix, self.max_scan), key=lambda name: self._rank(name, prefix)
+            )
+        return [(name, self._names[name][0]) for name in ranked]
+
+    def __len__(self) -> int:
+        return len(self._names)
@@ -0,0 +1,165 @@
+import math
+from collections import OrderedDict
+from time import monotonic, time
+from typing import List, Tuple, Union
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMITED
+
+# Atomic refill + take for one bucket stored as a Redis hash {t: tokens, ts: last refill}.
+# Returns the seconds to wait (0 when a token was taken).
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+# Give one token back (capped at capacity) if the bucket still exists.
+_REDIS_REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 't'))
+if tokens then
+    redis.call('HSET', KEYS[1], 't', math.min(tonumber(ARGV[1]), tokens + 1))
+end
+return 0
+"""
+
+
+class MemoryTokenBuckets:
+    """
+    Token buckets for many keys in one process: `capacity` tokens, refilled at
+    `rate` per second. State is (tokens, last_update) per key, kept in
+    least-recently-touched order; a bucket idle long enough to be full again
+    is indistinguishable from a new one, so those are dropped from the front
+    on every call (amortized O(1), memory bounded by the keys active within
+    one refill period).
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.full_after = capacity / rate
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str) -> float:
+        now = monotonic()
+        while self._buckets:
+            oldest_key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.full_after:
+                break
+            del self._buckets[oldest_key]
+
+        tokens, updated = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        return wait
+
+    async def refund(self, key: str) -> None:
+        state = self._buckets.get(key)
+        if state is not None:
+            self._buckets[key] = (min(self.capacity, state[0] + 1), state[1])
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisTokenBuckets:
+    """Same buckets in Redis (shared by all workers), one hash per key expiring once full."""
+
+    def __init__(self, name: str, url: str, capacity: float, rate: float):
+        import redis.asyncio as redis  # optional dependency, only needed when REDIS_URL is set
+
+        self.name = name
+        self.capacity = capacity
+        self.rate = rate
+        self._redis = redis.from_url(url)
+        self._take = self._redis.register_script(_REDIS_TAKE)
+        self._refund = self._redis.register_script(_REDIS_REFUND)
+
+    def _key(self, key: str) -> str:
+        return f"ratelimit:{self.name}:{key}"
+
+    async def take(self, key: str) -> float:
+        try:
+            wait = await self._take(keys=[self._key(key)], args=[self.capacity, self.rate, time()])
+        except Exception as e:
+            # fail open: an unreachable Redis must not lock everyone out
+            print(f"Rate limiter {self.name} unavailable: {e}")
+            return 0.0
+        return float(wait)
+
+    async def refund(self, key: str) -> None:
+        try:
+            await self._refund(keys=[self._key(key)], args=[self.capacity])
+        except Exception as e:
+            print(f"Rate limiter {self.name} unavailable: {e}")
+
+
+TokenBuckets = Union[MemoryTokenBuckets, RedisTokenBuckets]
+
+
+def token_buckets(name: str, capacity: float, per_minute: float) -> TokenBuckets:
+    rate = per_minute / 60
+    if settings.REDIS_URL:
+        return RedisTokenBuckets(name, settings.REDIS_URL, capacity, rate)
+    return MemoryTokenBuckets(capacity, rate)
+
+
+_auth_ip_buckets = token_buckets("auth_ip", settings.AUTH_RATE_IP_BURST, settings.AUTH_RATE_IP_PER_MINUTE)
+_auth_email_buckets = token_buckets("auth_email", settings.AUTH_RATE_EMAIL_BURST, settings.AUTH_RATE_EMAIL_PER_MINUTE)
+
+
+def _auth_checks(request: Request, action: str, email: str) -> List[Tuple[str, TokenBuckets, str]]:
+    # Behind a proxy, run uvicorn with --proxy-headers so request.client is the real peer
+    client_ip = request.client.host if request.client else "unknown"
+    return [
+        ("ip", _auth_ip_buckets, f"{action}:{client_ip}"),
+        ("email", _auth_email_buckets, f"{action}:{email.strip().lower()}"),
+    ]
+
+
+async def enforce_auth_rate_limit(request: Request, action: str, email: str) -> None:
+    """
+    Throttle login/registration attempts per client IP and per email before
+    any password hashing happens. Raises 429 with Retry-After when either
+    bucket is empty; the email bucket is only charged once the IP passed.
+    """
+    if not settings.AUTH_RATE_LIMIT_ENABLED:
+        return
+
+    for scope, buckets, key in _auth_checks(request, action, email):
+        wait = await buckets.take(key)
+        if wait > 0:
+            RATE_LIMITED.labels(action, scope).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(max(math.ceil(wait), 1))},
+            )
+
+
+async def refund_auth_attempt(request: Request, action: str, email: str) -> None:
+    """Return the tokens of a successful attempt, so only failures use up the budget."""
+    if not settings.AUTH_RATE_LIMIT_ENABLED:
+        return
+    for _, buckets, key in _auth_checks(request, action, email):
+        await buckets.refund(key)
@@ -1,20 +1,40 @@
-import bcrypt
+import asyncio
+import os
+
 from fastapi import Response
 
 from app.core.config import settings
 
+# bcrypt releases the GIL, but a thread per request would still crowd the
+# event loop's thread off the CPU during a login burst; queue beyond this.
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY or max((os.cpu_count() or 1) // 2, 1))
+
 
 def hash_password(password: str) -> str:
+    import bcrypt  # deferred to the first login/registration
+
     password_bytes = password.encode('utf-8')
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    import bcrypt
+
     plain_bytes = plain.encode('utf-8')
     hashed_bytes = hashed.encode('utf-8')
     return bcrypt.checkpw(plain_bytes, hashed_bytes)
 
+
+async def hash_password_async(password: str) -> str:
+    async with _hash_slots:
+        return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    async with _hash_slots:
+        return await asyncio.to_thread(verify_password, plain, hashed)
+
 def set_auth_cookies(response: Response, access_token_value: str, refresh_token_value: str):
 
     refresh_token_age = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
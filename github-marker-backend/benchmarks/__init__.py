@@ -0,0 +1,18 @@
+"""
+Microbenchmarks for the backend hot paths.
+
+    python -m benchmarks                          # run everything
+    python -m benchmarks -k crud                  # only names containing "crud"
+    python -m benchmarks --save benchmarks/baselines/baseline.json
+    python -m benchmarks --compare benchmarks/baselines/baseline.json --tolerance 0.25
+    python -m benchmarks.import_time              # cold-start import budget (see that module)
+
+Baselines are machine specific: regenerate them on the machine that runs the comparison.
+"""
+import os
+
+# Settings() is built at import time; give the app a throwaway config so the
+# suite runs without a .env file or a running Postgres.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost")
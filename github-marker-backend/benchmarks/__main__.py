@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import sys
+
+from benchmarks import runner
+
+# importing the modules registers their benchmarks
+from benchmarks import bench_auth, bench_crud, bench_helpers, bench_metrics, bench_schemas  # noqa: F401
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the backend microbenchmarks.")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before failing, as a fraction (default 0.25)")
+    args = parser.parse_args()
+
+    results = asyncio.run(runner.run_all(args.pattern))
+
+    if args.save:
+        runner.save(results, args.save)
+    if args.compare and not runner.compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
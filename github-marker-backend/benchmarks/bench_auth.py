@@ -0,0 +1,15 @@
+from app.service.auth_service import create_access_token, verify_token
+from benchmarks.runner import benchmark
+
+SUBJECT = "3b0c5f5e-8d7a-4c36-9d0e-2f6f0a6c9b11"
+
+
+@benchmark("auth.create_access_token")
+def bench_create_access_token():
+    return lambda: create_access_token(SUBJECT)
+
+
+@benchmark("auth.verify_token")
+def bench_verify_token():
+    token = create_access_token(SUBJECT)
+    return lambda: verify_token(token, expected_type="access")
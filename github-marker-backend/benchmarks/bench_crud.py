@@ -0,0 +1,124 @@
+"""
+CRUD functions against a seeded SQLite database (aiosqlite).
+One user owns SEED_BOOKMARKS bookmarks; a second user adds background rows.
+"""
+import os
+import tempfile
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud.bookmark_crud import (
+    get_bookmark_counts_by_date,
+    get_bookmark_ids_by_repo,
+    get_today_bookmarks_count,
+    get_total_bookmarks_count,
+    get_user_bookmarks,
+    is_repo_bookmarked,
+    search_user_bookmarks,
+)
+from app.crud.user_crud import get_bookmark_version, get_user_by_id
+from app.db.setup import Base
+from app.models import Bookmark, User
+from benchmarks.payloads import repo_json
+from benchmarks.runner import benchmark
+
+SEED_BOOKMARKS = 5000
+USER_ID = uuid.UUID(int=1)
+OTHER_USER_ID = uuid.UUID(int=2)
+
+_session: AsyncSession | None = None
+
+
+def _bookmark_values(repo_id: int, user_id: uuid.UUID) -> dict:
+    repo = repo_json(repo_id)
+    return {
+        "github_repo_id": repo["id"],
+        "user_id": user_id,
+        "repo_name": repo["name"],
+        "full_name": repo["full_name"],
+        "owner_name": repo["owner"]["login"],
+        "owner_id": repo["owner"]["id"],
+        "owner_avatar_url": repo["owner"]["avatar_url"],
+        "owner_url": repo["owner"]["html_url"],
+        "repo_url": repo["html_url"],
+        "description": repo["description"],
+    }
+
+
+async def _seeded_session() -> AsyncSession:
+    global _session
+    if _session is not None:
+        return _session
+
+    path = os.path.join(tempfile.mkdtemp(prefix="gm-bench-"), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": USER_ID, "name": "Bench", "email": "bench@example.com", "hashed_password": "x"},
+            {"id": OTHER_USER_ID, "name": "Other", "email": "other@example.com", "hashed_password": "x"},
+        ])
+        await conn.execute(insert(Bookmark), [_bookmark_values(i, USER_ID) for i in range(1, SEED_BOOKMARKS + 1)])
+        await conn.execute(insert(Bookmark), [_bookmark_values(i, OTHER_USER_ID) for i in range(1, SEED_BOOKMARKS + 1)])
+
+    _session = async_sessionmaker(engine, expire_on_commit=False)()
+    return _session
+
+
+@benchmark("crud.get_user_bookmarks[page 10 x 50]")
+async def bench_get_user_bookmarks():
+    db = await _seeded_session()
+    return lambda: get_user_bookmarks(db, USER_ID, page=10, per_page=50)
+
+
+@benchmark("crud.get_total_bookmarks_count")
+async def bench_total_count():
+    db = await _seeded_session()
+    return lambda: get_total_bookmarks_count(db, USER_ID)
+
+
+@benchmark("crud.get_today_bookmarks_count")
+async def bench_today_count():
+    db = await _seeded_session()
+    return lambda: get_today_bookmarks_count(db, USER_ID)
+
+
+@benchmark("crud.get_bookmark_counts_by_date[30 days]")
+async def bench_counts_by_date():
+    db = await _seeded_session()
+    start = date.today() - timedelta(days=30)
+    return lambda: get_bookmark_counts_by_date(db, USER_ID, start_date=start, end_date=date.today())
+
+
+@benchmark("crud.is_repo_bookmarked")
+async def bench_is_repo_bookmarked():
+    db = await _seeded_session()
+    return lambda: is_repo_bookmarked(db, SEED_BOOKMARKS // 2, USER_ID)
+
+
+@benchmark("crud.get_bookmark_ids_by_repo[100 ids]")
+async def bench_bookmark_ids_by_repo():
+    db = await _seeded_session()
+    repo_ids = list(range(SEED_BOOKMARKS // 2, SEED_BOOKMARKS // 2 + 100))
+    return lambda: get_bookmark_ids_by_repo(db, repo_ids, USER_ID)
+
+
+@benchmark("crud.search_user_bookmarks[fts5]")
+async def bench_search():
+    db = await _seeded_session()
+    return lambda: search_user_bookmarks(db, USER_ID, "async frame", limit=20)
+
+
+@benchmark("crud.get_bookmark_version")
+async def bench_bookmark_version():
+    db = await _seeded_session()
+    return lambda: get_bookmark_version(db, USER_ID)
+
+
+@benchmark("crud.get_user_by_id")
+async def bench_get_user_by_id():
+    db = await _seeded_session()
+    return lambda: get_user_by_id(db, USER_ID)
@@ -0,0 +1,24 @@
+from app.utils.helpers import extract_owner_repo
+from benchmarks.runner import benchmark
+
+# Roughly what CSV imports look like: mostly full URLs, some shorthand, some junk
+URL_MIX = [
+    "https://github.com/fastapi/fastapi",
+    "https://github.com/sqlalchemy/sqlalchemy.git",
+    "http://github.com/encode/httpx/tree/master/httpx",
+    "github.com/pydantic/pydantic",
+    "https://www.github.com/python/cpython/issues/1234",
+    "tiangolo/typer",
+    " encode/starlette ",
+    "https://gitlab.com/group/project",
+    "not a url at all",
+    "",
+] * 10
+
+
+@benchmark("helpers.extract_owner_repo[100 urls]")
+def bench_extract_owner_repo():
+    def run():
+        for url in URL_MIX:
+            extract_owner_repo(url)
+    return run
@@ -0,0 +1,101 @@
+"""
+Per-request overhead of the metrics layer.
+
+Runs a no-op ASGI app with and without MetricsMiddleware and reports the
+difference per request, plus the cost of the raw recording primitives and of
+the SQL profiler hook with and without an active profile.
+
+    python -m benchmarks.bench_metrics
+
+The same measurements are registered with the suite (`python -m benchmarks -k metrics`).
+"""
+import asyncio
+import time
+
+from app.core.metrics import Counter, Histogram
+from app.db.profiler import QueryProfile, record_query
+from app.middleware.metrics_middleware import MetricsMiddleware
+from benchmarks.runner import benchmark
+
+ITERATIONS = 200_000
+
+
+class _Route:
+    path = "/bookmark/list"
+
+
+async def _noop_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _time_app(app, iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        await app({"type": "http", "method": "GET", "path": "/bookmark/list"}, _receive, _send)
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def _call_app(app):
+    return lambda: app({"type": "http", "method": "GET", "path": "/bookmark/list"}, _receive, _send)
+
+
+@benchmark("metrics.asgi_noop_app")
+def bench_noop_app():
+    return _call_app(_noop_app)
+
+
+@benchmark("metrics.asgi_noop_app+MetricsMiddleware")
+def bench_instrumented_app():
+    return _call_app(MetricsMiddleware(_noop_app))
+
+
+_STATEMENT = (
+    "SELECT bookmarks.id, bookmarks.github_repo_id, bookmarks.full_name FROM bookmarks "
+    "WHERE bookmarks.github_repo_id = $1::INTEGER AND bookmarks.user_id = $2::UUID"
+)
+
+
+@benchmark("metrics.record_query (profiling off)")
+def bench_record_query_inactive():
+    return lambda: record_query(_STATEMENT, 0.001)
+
+
+@benchmark("metrics.QueryProfile.record")
+def bench_profile_record():
+    profile = QueryProfile()
+    return lambda: profile.record(_STATEMENT, 0.001)
+
+
+def _time_call(fn, iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def main() -> None:
+    baseline = asyncio.run(_time_app(_noop_app, ITERATIONS))
+    instrumented = asyncio.run(_time_app(MetricsMiddleware(_noop_app), ITERATIONS))
+
+    counter = Counter("bench_counter_total", "benchmark only", ["route"]).labels("/x")
+    histogram = Histogram("bench_latency_seconds", "benchmark only", ["route"]).labels("/x")
+
+    print(f"no-op ASGI app:               {baseline:8.0f} ns/request")
+    print(f"with MetricsMiddleware:       {instrumented:8.0f} ns/request")
+    print(f"middleware overhead:          {instrumented - baseline:8.0f} ns/request")
+    print(f"Counter.inc (labelled child): {_time_call(counter.inc, ITERATIONS):8.0f} ns")
+    print(f"Histogram.observe:            {_time_call(lambda: histogram.observe(0.012), ITERATIONS):8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
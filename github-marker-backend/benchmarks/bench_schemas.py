@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import UUID
+
+from app.schemas.bookmark import BookmarkListResponse, BookmarkOut
+from app.schemas.github import GitHubRepo, SearchResponse
+from app.service.github_service import _build_bookmark_from_repo_json
+from benchmarks.payloads import repo_json, search_repositories_json
+from benchmarks.runner import benchmark
+
+SEARCH_PAYLOAD = search_repositories_json(page=1, per_page=100)
+
+
+@benchmark("github._build_bookmark_from_repo_json")
+def bench_build_bookmark():
+    repo = repo_json(42)
+    return lambda: _build_bookmark_from_repo_json(repo)
+
+
+@benchmark("schemas.GitHubRepo[100 items]")
+def bench_github_repos():
+    items = SEARCH_PAYLOAD["items"]
+    return lambda: [GitHubRepo(**item) for item in items]
+
+
+@benchmark("schemas.SearchResponse[100 items].model_dump_json")
+def bench_search_response():
+    items = SEARCH_PAYLOAD["items"]
+
+    def run():
+        repos = [GitHubRepo(**item) for item in items]
+        SearchResponse(
+            search_type="repo", search_text="fast", page=1, per_page=100,
+            total_count=SEARCH_PAYLOAD["total_count"], has_next=True, has_prev=False, items=repos,
+        ).model_dump_json()
+    return run
+
+
+def _bookmark_row(index: int) -> SimpleNamespace:
+    repo = repo_json(index)
+    return SimpleNamespace(
+        id=UUID(int=index),
+        github_repo_id=repo["id"],
+        repo_name=repo["name"],
+        full_name=repo["full_name"],
+        repo_url=repo["html_url"],
+        owner_name=repo["owner"]["login"],
+        owner_id=repo["owner"]["id"],
+        owner_avatar_url=repo["owner"]["avatar_url"],
+        owner_url=repo["owner"]["html_url"],
+        description=repo["description"],
+        created_at=datetime(2025, 11, 20, tzinfo=timezone.utc),
+    )
+
+
+@benchmark("schemas.BookmarkListResponse[100 items].model_dump_json")
+def bench_bookmark_list():
+    rows = [_bookmark_row(index) for index in range(1, 101)]
+
+    def run():
+        items = [BookmarkOut.model_validate(row) for row in rows]
+        BookmarkListResponse(
+            items=items, page=1, per_page=100, total=5000, has_next=True, has_prev=False,
+        ).model_dump_json()
+    return run
@@ -0,0 +1,102 @@
+"""
+Cold-start budget: how long a fresh interpreter takes to `import app.main`.
+
+    python -m benchmarks.import_time                      # fail if over the budget
+    python -m benchmarks.import_time --budget-ms 500
+    python -m benchmarks.import_time --save benchmarks/baselines/importtime.txt
+
+Each run is a new `python -X importtime` process; the fastest of `--runs` is
+kept (the first run after a code change also pays for writing .pyc files).
+Also fails when a dependency that should load on first use (DEFERRED) is
+imported eagerly again. Like the other baselines, the budget is machine
+specific: check it on the machine that produced the saved profile.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Tuple
+
+MODULE = "app.main"
+IMPORT_BUDGET_MS = 800.0
+RUNS = 5
+
+# Only needed by some requests; importing them at worker start is a regression
+DEFERRED = ("jose", "bcrypt", "numpy", "scipy")
+
+
+class ImportEntry(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    depth: int
+    name: str
+
+
+def _parse(profile: str) -> List[ImportEntry]:
+    entries = []
+    for line in profile.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append(ImportEntry(int(self_us), int(cumulative_us), depth, stripped))
+    return entries
+
+
+def profile_import(module: str = MODULE) -> Tuple[str, List[ImportEntry]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),  # the benchmarks package set a throwaway app config
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    profile = "\n".join(line for line in completed.stderr.splitlines() if line.startswith("import time:"))
+    return profile + "\n", _parse(profile)
+
+
+def cumulative_ms(entries: List[ImportEntry], module: str = MODULE) -> float:
+    for entry in entries:
+        if entry.name == module:
+            return entry.cumulative_us / 1000
+    raise ValueError(f"{module} not in the import profile")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the app's import time against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--save", metavar="PATH", help="write the fastest run's -X importtime profile")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list (by self time)")
+    args = parser.parse_args()
+
+    profile_import()  # warm the .pyc cache
+    runs = [profile_import() for _ in range(args.runs)]
+    profile, entries = min(runs, key=lambda run: cumulative_ms(run[1]))
+    took = cumulative_ms(entries)
+
+    print(f"{'module':<58} {'self':>10} {'cumulative':>12}")
+    for entry in sorted(entries, key=lambda e: e.self_us, reverse=True)[:args.top]:
+        print(f"{entry.name:<58} {entry.self_us / 1000:>7.1f} ms {entry.cumulative_us / 1000:>9.1f} ms")
+    print(f"\nimport {MODULE}: {took:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+
+    if args.save:
+        with open(args.save, "w") as handle:
+            handle.write(profile)
+
+    ok = True
+    eager = sorted({e.name for e in entries if e.name.split(".")[0] in DEFERRED})
+    if eager:
+        print(f"FAIL: imported at startup but meant to load on first use: {', '.join(eager)}")
+        ok = False
+    if took > args.budget_ms:
+        print(f"FAIL: import {MODULE} is over budget by {took - args.budget_ms:.1f} ms")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Deterministic GitHub API payloads with the same shape (and roughly the same
+size) as real responses, for benchmarks and the fake GitHub server.
+"""
+from typing import Any, Dict, List
+
+_API = "https://api.github.com"
+_LANGUAGES = ["Python", "TypeScript", "Go", "Rust", "JavaScript", "C++", None]
+_WORDS = ["fast", "async", "web", "framework", "api", "toolkit", "data", "cli", "server", "client"]
+
+
+def owner_json(owner_id: int) -> Dict[str, Any]:
+    login = f"owner-{owner_id}"
+    return {
+        "login": login,
+        "id": owner_id,
+        "node_id": f"MDQ6VXNlcj{owner_id:08d}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{owner_id}?v=4",
+        "gravatar_id": "",
+        "url": f"{_API}/users/{login}",
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"{_API}/users/{login}/followers",
+        "following_url": f"{_API}/users/{login}/following{{/other_user}}",
+        "gists_url": f"{_API}/users/{login}/gists{{/gist_id}}",
+        "starred_url": f"{_API}/users/{login}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{_API}/users/{login}/subscriptions",
+        "organizations_url": f"{_API}/users/{login}/orgs",
+        "repos_url": f"{_API}/users/{login}/repos",
+        "events_url": f"{_API}/users/{login}/events{{/privacy}}",
+        "received_events_url": f"{_API}/users/{login}/received_events",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def repo_json(repo_id: int) -> Dict[str, Any]:
+    owner = owner_json(1000 + repo_id % 97)
+    name = f"{_WORDS[repo_id % len(_WORDS)]}-{_WORDS[(repo_id // 10) % len(_WORDS)]}-{repo_id}"
+    full_name = f"{owner['login']}/{name}"
+    url = f"{_API}/repos/{full_name}"
+    return {
+        "id": repo_id,
+        "node_id": f"MDEwOlJlcG9zaXRvcnk{repo_id:08d}",
+        "name": name,
+        "full_name": full_name,
+        "private": False,
+        "owner": owner,
+        "html_url": f"https://github.com/{full_name}",
+        "description": " ".join(_WORDS[(repo_id + i) % len(_WORDS)] for i in range(12)).capitalize(),
+        "fork": False,
+        "url": url,
+        "forks_url": f"{url}/forks",
+        "keys_url": f"{url}/keys{{/key_id}}",
+        "collaborators_url": f"{url}/collaborators{{/collaborator}}",
+        "teams_url": f"{url}/teams",
+        "hooks_url": f"{url}/hooks",
+        "issue_events_url": f"{url}/issues/events{{/number}}",
+        "events_url": f"{url}/events",
+        "branches_url": f"{url}/branches{{/branch}}",
+        "tags_url": f"{url}/tags",
+        "languages_url": f"{url}/languages",
+        "stargazers_url": f"{url}/stargazers",
+        "contributors_url": f"{url}/contributors",
+        "commits_url": f"{url}/commits{{/sha}}",
+        "issues_url": f"{url}/issues{{/number}}",
+        "pulls_url": f"{url}/pulls{{/number}}",
+        "releases_url": f"{url}/releases{{/id}}",
+        "created_at": "2019-03-14T09:26:53Z",
+        "updated_at": "2025-11-20T12:01:44Z",
+        "pushed_at": "2025-11-19T22:15:02Z",
+        "git_url": f"git://github.com/{full_name}.git",
+        "ssh_url": f"git@github.com:{full_name}.git",
+        "clone_url": f"https://github.com/{full_name}.git",
+        "homepage": f"https://{name}.dev",
+        "size": 1000 + repo_id % 50000,
+        "stargazers_count": (repo_id * 7919) % 90000,
+        "watchers_count": (repo_id * 7919) % 90000,
+        "language": _LANGUAGES[repo_id % len(_LANGUAGES)],
+        "has_issues": True,
+        "has_projects": True,
+        "has_downloads": True,
+        "has_wiki": False,
+        "has_pages": False,
+        "forks_count": (repo_id * 31) % 5000,
+        "archived": False,
+        "disabled": False,
+        "open_issues_count": repo_id % 300,
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT",
+                    "url": f"{_API}/licenses/mit", "node_id": "MDc6TGljZW5zZTEz"},
+        "topics": [_WORDS[(repo_id + i) % len(_WORDS)] for i in range(4)],
+        "visibility": "public",
+        "forks": (repo_id * 31) % 5000,
+        "open_issues": repo_id % 300,
+        "watchers": (repo_id * 7919) % 90000,
+        "default_branch": "main",
+        "score": 1.0,
+    }
+
+
+def search_repositories_json(page: int = 1, per_page: int = 100, total_count: int = 1000) -> Dict[str, Any]:
+    start = (page - 1) * per_page + 1
+    end = min(start + per_page, total_count + 1)
+    items: List[Dict[str, Any]] = [repo_json(repo_id) for repo_id in range(start, end)]
+    return {"total_count": total_count, "incomplete_results": False, "items": items}
+
+
+def search_users_json(page: int = 1, per_page: int = 100, total_count: int = 1000) -> Dict[str, Any]:
+    start = (page - 1) * per_page + 1
+    end = min(start + per_page, total_count + 1)
+    items = [dict(owner_json(owner_id), score=1.0) for owner_id in range(start, end)]
+    return {"total_count": total_count, "incomplete_results": False, "items": items}
@@ -0,0 +1,119 @@
+import inspect
+import json
+import platform
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+# name -> factory returning the zero-argument callable (sync or async) to time
+_BENCHMARKS: Dict[str, Callable[[], Any]] = {}
+
+MIN_REPEAT_SECONDS = 0.05
+REPEATS = 7
+
+Target = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark. The decorated function does the setup (it may be async)
+    and returns the callable to time; calling it may return an awaitable.
+    """
+    def decorator(factory: Callable[[], Any]):
+        if name in _BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        _BENCHMARKS[name] = factory
+        return factory
+    return decorator
+
+
+async def _run_loops(target: Target, loops: int, is_async: bool) -> float:
+    started = time.perf_counter_ns()
+    if is_async:
+        for _ in range(loops):
+            await target()
+    else:
+        for _ in range(loops):
+            target()
+    return (time.perf_counter_ns() - started) / loops
+
+
+async def _measure(target: Target) -> Dict[str, Any]:
+    # lambdas wrapping coroutine functions aren't coroutine functions themselves,
+    # so look at what one call returns instead
+    probe = target()
+    is_async = inspect.isawaitable(probe)
+    if is_async:
+        await probe
+
+    # calibrate: grow the loop count until one repeat takes long enough to time
+    loops = 1
+    while True:
+        per_call = await _run_loops(target, loops, is_async)
+        if per_call * loops >= MIN_REPEAT_SECONDS * 1e9 or loops >= 1_000_000:
+            break
+        estimate = int(MIN_REPEAT_SECONDS * 1e9 / max(per_call, 1.0)) + 1
+        loops = min(max(loops * 2, estimate), 1_000_000)
+
+    timings = [await _run_loops(target, loops, is_async) for _ in range(REPEATS)]
+    return {
+        "median_ns": round(statistics.median(timings), 1),
+        "min_ns": round(min(timings), 1),
+        "stdev_ns": round(statistics.stdev(timings), 1),
+        "loops": loops,
+        "repeats": REPEATS,
+    }
+
+
+async def run_all(pattern: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, factory in sorted(_BENCHMARKS.items()):
+        if pattern and pattern not in name:
+            continue
+        target = factory()
+        if inspect.isawaitable(target):
+            target = await target
+        results[name] = await _measure(target)
+        print(f"{name:<58} {_fmt(results[name]['median_ns']):>12}")
+    return results
+
+
+def _fmt(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def save(results: Dict[str, Dict[str, Any]], path: str) -> None:
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    """Print a comparison table. Returns False if any benchmark regressed beyond tolerance."""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)["benchmarks"]
+
+    ok = True
+    print(f"\n{'benchmark':<58} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<58} {'-':>12} {_fmt(current['median_ns']):>12}      new")
+            continue
+        ratio = current["median_ns"] / previous["median_ns"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  SLOWER"
+            ok = False
+        print(f"{name:<58} {_fmt(previous['median_ns']):>12} {_fmt(current['median_ns']):>12} {ratio - 1:>+7.0%}{flag}")
+    return ok
@@ -0,0 +1,19 @@
+"""
+End-to-end load test against a local fake GitHub API. Runs fully offline.
+
+    python -m loadtest                                   # spawn fake GitHub + app on SQLite, 30s mixed load
+    python -m loadtest --duration 60 --concurrency 50
+    python -m loadtest --rate 200                        # open-loop: 200 req/s regardless of latency
+    python -m loadtest --mix search=50,list=30,add=20
+    python -m loadtest --database-url postgresql+asyncpg://user:pw@localhost/gm_load
+    python -m loadtest --target http://127.0.0.1:8000    # app already running (must use the fake GitHub below)
+    python -m loadtest --json results.json
+    python -m loadtest --launcher uvicorn                # plain uvicorn (asyncio loop, h11) instead of python -m app
+    python -m loadtest --login-flood 200                 # compare p95 of the other operations with and without
+    python -m loadtest --login-flood 200 --flood-ips 500 # same flood spread over many source addresses
+
+The fake GitHub server can also be run on its own and pointed at by the app:
+
+    python -m loadtest.fake_github --port 9100 --latency-ms 80 --error-rate 0.02
+    GITHUB_API_BASE_URL=http://127.0.0.1:9100/ uvicorn app.main:app
+"""
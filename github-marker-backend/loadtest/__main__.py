@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from loadtest import runner
+from loadtest.fake_github import FakeGitHubConfig
+from loadtest.scenario import DEFAULT_MIX, Scenario, parse_mix
+
+
+def parse_args() -> argparse.Namespace:
+    github = FakeGitHubConfig()
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test against a local fake GitHub API.")
+    parser.add_argument("--target", help="URL of an already running app (default: start one)")
+    parser.add_argument("--database-url", help="DATABASE_URL for the spawned app (default: fresh SQLite file)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned app")
+    parser.add_argument("--launcher", choices=["app", "uvicorn"], default="app",
+                        help="'app': python -m app (uvloop, httptools, tuned limits); "
+                             "'uvicorn': plain uvicorn with the asyncio loop and h11, for comparison")
+    parser.add_argument("--github-port", type=int, default=None, help="fake GitHub port (default: any free port)")
+    parser.add_argument("--github-latency-ms", type=float, default=github.latency_ms)
+    parser.add_argument("--github-jitter-ms", type=float, default=github.jitter_ms)
+    parser.add_argument("--github-error-rate", type=float, default=github.error_rate)
+    parser.add_argument("--github-search-rate-limit", type=int, default=github.search_rate_limit)
+    parser.add_argument("--github-core-rate-limit", type=int, default=github.core_rate_limit)
+    parser.add_argument("--repo-count", type=int, default=github.repo_count)
+    parser.add_argument("--users", type=int, default=20, help="virtual users to register")
+    parser.add_argument("--seed-bookmarks", type=int, default=200, help="bookmarks created per user before the run")
+    parser.add_argument("--concurrency", type=int, default=20, help="closed-loop workers / open-loop in-flight cap")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop arrival rate in req/s")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--mix", default=None,
+                        help="operation weights, e.g. search=50,list=30 (default: "
+                             + ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()) + ")")
+    parser.add_argument("--login-flood", type=float, default=None, metavar="RATE",
+                        help="also send RATE wrong-password logins per second during the run")
+    parser.add_argument("--flood-ips", type=int, default=1, help="source addresses the login flood is spread over")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the traffic")
+    parser.add_argument("--json", dest="json_path", help="also write the results as JSON")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    log_dir = tempfile.mkdtemp(prefix="gm-loadtest-")
+    github_process = app_process = None
+
+    github_port = args.github_port or runner.free_port()
+    github_url = f"http://127.0.0.1:{github_port}/"
+    try:
+        github_process = runner.start_process([
+            "-m", "loadtest.fake_github",
+            "--port", str(github_port),
+            "--latency-ms", str(args.github_latency_ms),
+            "--jitter-ms", str(args.github_jitter_ms),
+            "--error-rate", str(args.github_error_rate),
+            "--search-rate-limit", str(args.github_search_rate_limit),
+            "--core-rate-limit", str(args.github_core_rate_limit),
+            "--repo-count", str(args.repo_count),
+            "--seed", str(args.seed),
+        ], {}, os.path.join(log_dir, "fake_github.log"))
+        await runner.wait_until_ready(github_url + "_stats", github_process)
+
+        target = args.target
+        if target is None:
+            app_port = runner.free_port()
+            target = f"http://127.0.0.1:{app_port}"
+            database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(log_dir, 'loadtest.db')}"
+            if args.launcher == "app":
+                command = ["-m", "app", "--host", "127.0.0.1", "--port", str(app_port), "--workers", str(args.workers)]
+            else:
+                command = [
+                    "-m", "uvicorn", "app.main:app",
+                    "--host", "127.0.0.1", "--port", str(app_port),
+                    "--workers", str(args.workers),
+                    "--loop", "asyncio", "--http", "h11",
+                    "--log-level", "warning", "--no-access-log",
+                    "--proxy-headers", "--forwarded-allow-ips", "127.0.0.1",
+                ]
+            app_process = runner.start_process(command, {
+                "DATABASE_URL": database_url,
+                "GITHUB_API_BASE_URL": github_url,
+                "JWT_SECRET": os.environ.get("JWT_SECRET", "loadtest-secret"),
+                "CORS_ORIGINS": os.environ.get("CORS_ORIGINS", "http://localhost"),
+            }, os.path.join(log_dir, "app.log"))
+            await runner.wait_until_ready(target + "/openapi.json", app_process)
+        else:
+            print(f"using {target}; it must run with GITHUB_API_BASE_URL={github_url}")
+
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=target, timeout=30.0, limits=limits) as client:
+            scenario = Scenario(client, args.repo_count, rng=random.Random(args.seed))
+            print(f"registering {args.users} users and seeding {args.seed_bookmarks} bookmarks each...")
+            users = await runner.setup_users(scenario, args.users, args.seed_bookmarks, uuid.uuid4().hex[:8])
+
+            mode = f"open loop at {args.rate:g} req/s" if args.rate else f"closed loop with {args.concurrency} workers"
+            print(f"running {mode} for {args.duration:g}s...")
+            started = time.perf_counter()
+            if args.rate:
+                traffic = runner.run_open_loop(
+                    scenario, users, mix, args.rate, args.duration, max_in_flight=args.concurrency
+                )
+            else:
+                traffic = runner.run_closed_loop(scenario, users, mix, args.concurrency, args.duration)
+            if args.login_flood:
+                print(f"flooding /auth/login at {args.login_flood:g} req/s from {args.flood_ips} address(es)...")
+                async with httpx.AsyncClient(base_url=target, timeout=30.0) as flood_client:
+                    samples, flood = await asyncio.gather(traffic, runner.run_login_flood(
+                        scenario, flood_client, users, args.login_flood, args.duration, args.flood_ips
+                    ))
+                samples += flood
+            else:
+                samples = await traffic
+            elapsed = time.perf_counter() - started
+
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            github_stats = (await client.get(github_url + "_stats")).json()
+
+        rows = runner.summarize(samples, elapsed)
+        runner.print_report(rows, elapsed)
+        print("\nfake GitHub served: " + ", ".join(
+            f"{key}={count}" for key, count in sorted(github_stats["served"].items())
+        ))
+        print(f"logs: {log_dir}")
+        if args.json_path:
+            runner.save_report(args.json_path, vars(args), rows, github_stats)
+    finally:
+        runner.stop_process(app_process)
+        runner.stop_process(github_process)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,239 @@
+"""
+Local stand-in for the parts of the GitHub REST API the backend calls.
+
+Serves search/repositories, search/users, repositories/{id},
+repos/{owner}/{repo} and users/{user}/starred (with Link pagination) with GitHub-shaped payloads from benchmarks.payloads,
+plus configurable latency, error rate and primary rate limits (same headers
+and 403 body as GitHub). `/_stats` reports what was served.
+
+    python -m loadtest.fake_github --port 9100 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from benchmarks.payloads import repo_json, search_repositories_json, search_users_json
+
+# GitHub refuses to page past the first 1000 search results
+SEARCH_RESULT_CAP = 1000
+_REPO_NAME_ID_RE = re.compile(r"-(\d+)$")
+
+
+@dataclass
+class FakeGitHubConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 25.0
+    error_rate: float = 0.0
+    repo_count: int = 100_000
+    search_total_count: int = 5_000
+    starred_count: int = 1_500  # stars of every user
+    search_rate_limit: int = 10_000
+    core_rate_limit: int = 100_000
+    rate_limit_window: int = 60
+    seed: Optional[int] = None
+
+
+class _RateLimiter:
+    """Fixed-window counters per resource, like GitHub's primary rate limit."""
+
+    def __init__(self, limits: Dict[str, int], window: int):
+        self.limits = limits
+        self.window = window
+        self._window_start = time.time()
+        self._used: Counter = Counter()
+
+    def take(self, resource: str) -> Tuple[bool, Dict[str, str]]:
+        now = time.time()
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._used.clear()
+
+        limit = self.limits[resource]
+        allowed = self._used[resource] < limit
+        if allowed:
+            self._used[resource] += 1
+        used = self._used[resource]
+        headers = {
+            "x-ratelimit-limit": str(limit),
+            "x-ratelimit-remaining": str(max(limit - used, 0)),
+            "x-ratelimit-reset": str(int(self._window_start + self.window)),
+            "x-ratelimit-used": str(used),
+            "x-ratelimit-resource": resource,
+        }
+        return allowed, headers
+
+
+@lru_cache(maxsize=256)
+def _search_repositories_body(page: int, per_page: int, total_count: int) -> bytes:
+    return json.dumps(search_repositories_json(page, per_page, total_count)).encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _search_users_body(page: int, per_page: int, total_count: int) -> bytes:
+    return json.dumps(search_users_json(page, per_page, total_count)).encode("utf-8")
+
+
+@lru_cache(maxsize=4096)
+def _repo_body(repo_id: int) -> bytes:
+    return json.dumps(repo_json(repo_id)).encode("utf-8")
+
+
+def create_app(config: Optional[FakeGitHubConfig] = None) -> Starlette:
+    config = config or FakeGitHubConfig()
+    rng = random.Random(config.seed)
+    limiter = _RateLimiter(
+        {"search": config.search_rate_limit, "core": config.core_rate_limit},
+        config.rate_limit_window,
+    )
+    served: Counter = Counter()
+
+    async def upstream(resource: str, endpoint: str, build) -> Response:
+        """Shared latency / error / rate-limit handling around one endpoint."""
+        delay = config.latency_ms + rng.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        allowed, headers = limiter.take(resource)
+        if not allowed:
+            served[f"{endpoint} 403"] += 1
+            return JSONResponse(
+                {"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com/rest"},
+                status_code=403,
+                headers=headers,
+            )
+        if config.error_rate and rng.random() < config.error_rate:
+            served[f"{endpoint} 502"] += 1
+            return JSONResponse({"message": "Server Error"}, status_code=502, headers=headers)
+
+        status_code, body, *extra_headers = build()
+        for extra in extra_headers:
+            headers.update(extra)
+        served[f"{endpoint} {status_code}"] += 1
+        return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+    def _paging(request: Request) -> Tuple[int, int]:
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            per_page = min(max(int(request.query_params.get("per_page", 30)), 1), 100)
+        except ValueError:
+            page, per_page = 1, 30
+        return page, per_page
+
+    def _search(request: Request, body_for) -> Tuple[int, bytes]:
+        page, per_page = _paging(request)
+        if (page - 1) * per_page >= SEARCH_RESULT_CAP:
+            message = {"message": "Only the first 1000 search results are available"}
+            return 422, json.dumps(message).encode("utf-8")
+        return 200, body_for(page, per_page, config.search_total_count)
+
+    def _repo(repo_id: int) -> Tuple[int, bytes]:
+        if not 1 <= repo_id <= config.repo_count:
+            return 404, b'{"message": "Not Found"}'
+        return 200, _repo_body(repo_id)
+
+    async def search_repositories(request: Request) -> Response:
+        return await upstream("search", "search/repositories",
+                              lambda: _search(request, _search_repositories_body))
+
+    async def search_users(request: Request) -> Response:
+        return await upstream("search", "search/users", lambda: _search(request, _search_users_body))
+
+    async def repository_by_id(request: Request) -> Response:
+        return await upstream("core", "repositories", lambda: _repo(request.path_params["repo_id"]))
+
+    async def repository_by_name(request: Request) -> Response:
+        owner, name = request.path_params["owner"], request.path_params["repo"]
+
+        def build() -> Tuple[int, bytes]:
+            match = _REPO_NAME_ID_RE.search(name)
+            if not match:
+                return 404, b'{"message": "Not Found"}'
+            status_code, body = _repo(int(match.group(1)))
+            if status_code == 200 and repo_json(int(match.group(1)))["full_name"] != f"{owner}/{name}":
+                return 404, b'{"message": "Not Found"}'
+            return status_code, body
+
+        return await upstream("core", "repos", build)
+
+    def _starred(request: Request) -> Tuple[int, bytes, Dict[str, str]]:
+        page, per_page = _paging(request)
+        last_page = max((config.starred_count + per_page - 1) // per_page, 1)
+        # each user stars a different, stable run of repository ids
+        first_id = sum(request.path_params["user"].encode("utf-8")) % config.repo_count
+        start = (page - 1) * per_page
+        stop = min(start + per_page, config.starred_count)
+        items = [repo_json((first_id + index) % config.repo_count + 1) for index in range(start, stop)]
+
+        base = str(request.url.replace(query=""))
+        links = [f'<{base}?per_page={per_page}&page={page + 1}>; rel="next"'] if page < last_page else []
+        links.append(f'<{base}?per_page={per_page}&page={last_page}>; rel="last"')
+        return 200, json.dumps(items).encode("utf-8"), {"link": ", ".join(links)}
+
+    async def starred(request: Request) -> Response:
+        return await upstream("core", "users/starred", lambda: _starred(request))
+
+    async def stats(_request: Request) -> Response:
+        return JSONResponse({"config": asdict(config), "served": dict(served)})
+
+    return Starlette(routes=[
+        Route("/search/repositories", search_repositories),
+        Route("/search/users", search_users),
+        Route("/repositories/{repo_id:int}", repository_by_id),
+        Route("/repos/{owner}/{repo}", repository_by_name),
+        Route("/users/{user}/starred", starred),
+        Route("/_stats", stats),
+    ])
+
+
+def main() -> None:
+    defaults = FakeGitHubConfig()
+    parser = argparse.ArgumentParser(description="Run the fake GitHub API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="fraction of requests answered with 502")
+    parser.add_argument("--repo-count", type=int, default=defaults.repo_count)
+    parser.add_argument("--search-total-count", type=int, default=defaults.search_total_count)
+    parser.add_argument("--starred-count", type=int, default=defaults.starred_count)
+    parser.add_argument("--search-rate-limit", type=int, default=defaults.search_rate_limit,
+                        help="search requests allowed per window")
+    parser.add_argument("--core-rate-limit", type=int, default=defaults.core_rate_limit,
+                        help="repository lookups allowed per window")
+    parser.add_argument("--rate-limit-window", type=int, default=defaults.rate_limit_window,
+                        help="rate limit window in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeGitHubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        repo_count=args.repo_count,
+        search_total_count=args.search_total_count,
+        starred_count=args.starred_count,
+        search_rate_limit=args.search_rate_limit,
+        core_rate_limit=args.core_rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
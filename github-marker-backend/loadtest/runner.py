@@ -0,0 +1,229 @@
+"""
+Process management, traffic generation and reporting for the load test.
+"""
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.scenario import Scenario, VirtualUser
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Sample:
+    operation: str
+    latency: float
+    status: int  # 0 when the request never got a response
+
+
+# --- processes ---
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_process(args: List[str], env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    log = open(log_path, "ab")
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, **env},
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def stop_process(process: Optional[subprocess.Popen]) -> None:
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def wait_until_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"{url} exited with code {process.returncode} during startup")
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+# --- traffic ---
+
+async def setup_users(scenario: Scenario, count: int, seed_bookmarks: int, run_tag: str) -> List[VirtualUser]:
+    users = [
+        VirtualUser(email=f"load-{run_tag}-{index}@example.com", ip=f"10.0.{index // 256 % 256}.{index % 256}")
+        for index in range(count)
+    ]
+    for response in await asyncio.gather(*(scenario.register(user) for user in users)):
+        response.raise_for_status()
+    if seed_bookmarks:
+        await asyncio.gather(*(scenario.seed_bookmarks(user, seed_bookmarks) for user in users))
+    return users
+
+
+async def _timed(scenario: Scenario, operation: str, user: VirtualUser, started: float) -> Sample:
+    try:
+        response = await scenario.run(operation, user)
+        status = response.status_code
+    except httpx.TransportError:
+        status = 0
+    return Sample(operation, time.perf_counter() - started, status)
+
+
+async def run_closed_loop(scenario: Scenario, users: List[VirtualUser], mix: Dict[str, int],
+                          concurrency: int, duration: float) -> List[Sample]:
+    """`concurrency` workers issue back-to-back requests until `duration` runs out."""
+    operations, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        user = users[index % len(users)]
+        while time.perf_counter() < deadline:
+            operation = scenario.rng.choices(operations, weights)[0]
+            samples.append(await _timed(scenario, operation, user, time.perf_counter()))
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return samples
+
+
+async def run_open_loop(scenario: Scenario, users: List[VirtualUser], mix: Dict[str, int],
+                        rate: float, duration: float, max_in_flight: int) -> List[Sample]:
+    """
+    Starts requests on a fixed schedule whatever the response times are.
+    Latency is measured from the scheduled start, so queueing delay in the
+    generator counts against the server (no coordinated omission). Arrivals
+    that find `max_in_flight` requests outstanding are recorded as status 0.
+    """
+    operations, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    tasks = set()
+    started = time.perf_counter()
+
+    for index in range(int(rate * duration)):
+        scheduled = started + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        operation = scenario.rng.choices(operations, weights)[0]
+        if len(tasks) >= max_in_flight:
+            samples.append(Sample(operation, 0.0, 0))
+            continue
+
+        task = asyncio.create_task(_timed(scenario, operation, users[index % len(users)], scheduled))
+        tasks.add(task)
+        task.add_done_callback(lambda done: (tasks.discard(done), samples.append(done.result())))
+
+    if tasks:
+        await asyncio.wait(tasks)
+    return samples
+
+
+async def run_login_flood(scenario: Scenario, client: httpx.AsyncClient, users: List[VirtualUser],
+                          rate: float, duration: float, ips: int) -> List[Sample]:
+    """
+    Open-loop stream of wrong-password logins against the virtual users'
+    accounts from `ips` attacker addresses, on its own client so it doesn't
+    compete with the regular traffic for connections. Recorded as `login_flood`.
+    """
+    samples: List[Sample] = []
+    tasks = set()
+    started = time.perf_counter()
+
+    async def attempt(index: int, scheduled: float) -> Sample:
+        source = index % ips
+        ip = f"198.18.{source // 256 % 256}.{source % 256}"
+        try:
+            response = await scenario.failed_login(client, users[index % len(users)].email, ip)
+            status = response.status_code
+        except httpx.TransportError:
+            status = 0
+        return Sample("login_flood", time.perf_counter() - scheduled, status)
+
+    for index in range(int(rate * duration)):
+        scheduled = started + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(attempt(index, scheduled))
+        tasks.add(task)
+        task.add_done_callback(lambda done: (tasks.discard(done), samples.append(done.result())))
+
+    if tasks:
+        await asyncio.wait(tasks)
+    return samples
+
+
+# --- reporting ---
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> List[Dict[str, object]]:
+    grouped: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        grouped[sample.operation].append(sample)
+    grouped["all"] = samples
+
+    rows = []
+    for operation, group in grouped.items():
+        latencies = sorted(sample.latency for sample in group if sample.status)
+        rows.append({
+            "operation": operation,
+            "count": len(group),
+            "rps": round(len(group) / elapsed, 1) if elapsed else 0.0,
+            "ok": sum(1 for sample in group if 0 < sample.status < 400),
+            "client_errors": sum(1 for sample in group if 400 <= sample.status < 500),
+            "server_errors": sum(1 for sample in group if sample.status >= 500 or sample.status == 0),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        })
+    return rows
+
+
+def print_report(rows: List[Dict[str, object]], elapsed: float) -> None:
+    print(f"\n{len(rows) - 1} operations over {elapsed:.1f}s")
+    print(f"{'operation':<14}{'count':>8}{'req/s':>9}{'ok':>8}{'4xx':>7}{'5xx/err':>9}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for row in rows:
+        print(f"{row['operation']:<14}{row['count']:>8}{row['rps']:>9}{row['ok']:>8}{row['client_errors']:>7}"
+              f"{row['server_errors']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+              f"{row['max_ms']:>10}")
+
+
+def save_report(path: str, config: Dict[str, object], rows: List[Dict[str, object]],
+                github_stats: Optional[Dict[str, object]]) -> None:
+    with open(path, "w") as handle:
+        json.dump({"config": config, "operations": rows, "github": github_stats}, handle, indent=2)
+        handle.write("\n")
@@ -0,0 +1,176 @@
+"""
+Virtual users and the requests they make. Each operation is one API call made
+as a logged-in user, named after the endpoint it exercises.
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.payloads import repo_json
+
+PASSWORD = "LoadTest#2024"
+WRONG_PASSWORD = "not-the-password"
+SEARCH_TERMS = ["fast", "async", "web", "framework", "api", "toolkit", "data", "cli", "server", "client"]
+IMPORT_ROWS = 20
+SEED_BATCH_SIZE = 100
+
+DEFAULT_MIX: Dict[str, int] = {
+    "search": 30,
+    "search_users": 5,
+    "search_all": 5,
+    "suggest": 10,
+    "list": 25,
+    "stats": 10,
+    "popular": 5,
+    "add": 15,
+    "import": 5,
+    "login": 10,
+}
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    # Sent as X-Forwarded-For so per-IP rate limits see distinct clients (app runs with --proxy-headers)
+    ip: str = "127.0.0.1"
+    access_token: str = ""
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        # Auth cookies are Secure, so a cookie jar would drop them over plain http
+        return {"Cookie": f"access_token={self.access_token}", "X-Forwarded-For": self.ip}
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """`search=50,list=30,add=20` -> weights. Unknown operation names are rejected."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"unknown operation {name!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, repo_count: int, rng: random.Random):
+        self.client = client
+        self.repo_count = repo_count
+        self.rng = rng
+
+    def _remember_token(self, user: VirtualUser, response: httpx.Response) -> None:
+        token = response.cookies.get("access_token")
+        if token:
+            user.access_token = token
+
+    def _random_repo_id(self) -> int:
+        return self.rng.randint(1, self.repo_count)
+
+    # --- setup ---
+
+    async def register(self, user: VirtualUser) -> httpx.Response:
+        response = await self.client.post("/auth/register", headers={"X-Forwarded-For": user.ip}, json={
+            "name": "Load Test", "email": user.email, "password": PASSWORD,
+        })
+        self._remember_token(user, response)
+        return response
+
+    async def seed_bookmarks(self, user: VirtualUser, count: int) -> None:
+        repo_ids = self.rng.sample(range(1, self.repo_count + 1), count)
+        for start in range(0, count, SEED_BATCH_SIZE):
+            response = await self.client.post(
+                "/bookmark/batch",
+                json={"repo_ids": repo_ids[start:start + SEED_BATCH_SIZE]},
+                headers=user.headers,
+            )
+            response.raise_for_status()
+
+    # --- operations ---
+
+    async def login(self, user: VirtualUser) -> httpx.Response:
+        response = await self.client.post(
+            "/auth/login", headers={"X-Forwarded-For": user.ip}, json={"email": user.email, "password": PASSWORD}
+        )
+        self._remember_token(user, response)
+        return response
+
+    async def failed_login(self, client: httpx.AsyncClient, email: str, ip: str) -> httpx.Response:
+        """Credential-stuffing attempt: a real account's email with a wrong password."""
+        return await client.post(
+            "/auth/login", headers={"X-Forwarded-For": ip}, json={"email": email, "password": WRONG_PASSWORD}
+        )
+
+    async def search(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/github/search", headers=user.headers, params={
+            "search_type": "repo",
+            "text": self.rng.choice(SEARCH_TERMS),
+            "page": self.rng.randint(1, 5),
+            "per_page": self.rng.choice([10, 30]),
+        })
+
+    async def search_users(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/github/search", headers=user.headers, params={
+            "search_type": "user",
+            "text": self.rng.choice(SEARCH_TERMS),
+            "page": self.rng.randint(1, 3),
+            "per_page": 10,
+        })
+
+    async def search_all(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/github/search", headers=user.headers, params={
+            "search_type": "all",
+            "text": self.rng.choice(SEARCH_TERMS),
+            "per_page": 10,
+        })
+
+    async def suggest(self, user: VirtualUser) -> httpx.Response:
+        """One keystroke: the first few letters of a search term."""
+        term = self.rng.choice(SEARCH_TERMS)
+        return await self.client.get("/github/suggest", headers=user.headers, params={
+            "q": term[:self.rng.randint(1, len(term))],
+        })
+
+    async def list_bookmarks(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/bookmark/list", headers=user.headers, params={
+            "page": self.rng.randint(1, 5),
+            "per_page": 20,
+        })
+
+    async def stats(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/bookmark/stats", headers=user.headers)
+
+    async def popular(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.get("/bookmark/popular", headers=user.headers, params={
+            "window": self.rng.choice(["24h", "7d", "all"]),
+        })
+
+    async def add(self, user: VirtualUser) -> httpx.Response:
+        return await self.client.post(
+            "/bookmark/add", headers=user.headers, params={"repo_id": self._random_repo_id()}
+        )
+
+    async def import_csv(self, user: VirtualUser) -> httpx.Response:
+        rows: List[str] = ["url"]
+        rows.extend(repo_json(self._random_repo_id())["html_url"] for _ in range(IMPORT_ROWS))
+        body = ("\n".join(rows) + "\n").encode("utf-8")
+        return await self.client.post(
+            "/bookmark/import", headers=user.headers, files={"file": ("bookmarks.csv", body, "text/csv")}
+        )
+
+    async def run(self, operation: str, user: VirtualUser) -> httpx.Response:
+        handler = {
+            "login": self.login,
+            "search": self.search,
+            "search_users": self.search_users,
+            "search_all": self.search_all,
+            "suggest": self.suggest,
+            "list": self.list_bookmarks,
+            "stats": self.stats,
+            "popular": self.popular,
+            "add": self.add,
+            "import": self.import_csv,
+        }[operation]
+        return await handler(user)
@@ -10,6 +10,14 @@ import type {
 
 export const BOOKMARKS_API_BASE = "/bookmark";
 
+// Server-sent events for bookmark changes (auth cookies are sent with withCredentials)
+export function openBookmarkEvents(): EventSource {
+  return new EventSource(
+    `${import.meta.env.VITE_API_BASE_URL}${BOOKMARKS_API_BASE}/events`,
+    { withCredentials: true }
+  );
+}
+
 // Get all bookmarks with pagination
 export async function getBookmarks(
   params?: GetBookmarksParams
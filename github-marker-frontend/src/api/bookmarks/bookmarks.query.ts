@@ -1,3 +1,4 @@
+import { useEffect } from "react";
 import {
   useQuery,
   useMutation,
@@ -10,6 +11,7 @@ import {
   removeBookmark,
   getBookmarkStats,
   importBookmarksFromCSV,
+  openBookmarkEvents,
 } from "./bookmarks.api";
 import type {
   BackendBookmark,
@@ -84,6 +86,23 @@ export function useGetBookmarkStats(
   });
 }
 
+// Refetches bookmark queries when they change elsewhere (another tab or device)
+// instead of polling; unchanged pages come back as cheap 304s.
+export function useBookmarkEvents(enabled = true) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!enabled) return;
+    const source = openBookmarkEvents();
+    const refresh = () =>
+      queryClient.invalidateQueries({ queryKey: ["bookmarks"] });
+    for (const type of ["created", "updated", "deleted", "resync"]) {
+      source.addEventListener(type, refresh);
+    }
+    return () => source.close();
+  }, [enabled, queryClient]);
+}
+
 export function useAddBookmark() {
   const queryClient = useQueryClient();
 
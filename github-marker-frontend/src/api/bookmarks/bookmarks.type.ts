@@ -9,6 +9,7 @@ export type BackendBookmark = {
   description: string | null;
   full_name: string;
   github_repo_id?: number;
+  tags?: string[];
 }
 
 export type BookmarkListResponse = {
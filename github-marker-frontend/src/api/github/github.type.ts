@@ -44,6 +44,7 @@ export type BackendSearchResponse = {
   has_next: boolean;
   has_prev: boolean;
   items: (GitHubUser | GitHubRepository)[];
+  stale?: boolean;
 }
 
 export type BookmarkedRepository = GitHubRepository & {
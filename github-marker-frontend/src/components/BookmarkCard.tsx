@@ -8,6 +8,7 @@ import {
 } from '@/components/ui/tooltip';
 import type { BackendBookmark } from '@/api/bookmarks/bookmarks.type';
 import { Calendar, ExternalLink, Trash2 } from 'lucide-react';
+import { avatarUrl } from '@/utils/helper';
 
 type BookmarkCardProps = {
   bookmark: BackendBookmark;
@@ -30,7 +31,7 @@ export function BookmarkCard({ bookmark, onRemove, isRemoving }: BookmarkCardPro
           <div className="flex items-center gap-2 mb-1">
             {bookmark.owner_avatar_url && (
               <img 
-                src={bookmark.owner_avatar_url} 
+                src={avatarUrl(bookmark.owner_id, 24)} 
                 alt={bookmark.owner_name}
                 className="w-6 h-6 rounded-full"
               />
@@ -5,6 +5,7 @@ import type { GitHubRepository } from '@/api/github/github.type';
 import {  Bookmark, BookmarkCheck, ExternalLink } from 'lucide-react';
 import { useAddBookmark, useRemoveBookmark } from '@/api/bookmarks/bookmarks.query';
 import { toast } from 'sonner';
+import { avatarUrl } from '@/utils/helper';
 
 type RepositoryCardProps = {
   repository: GitHubRepository;
@@ -63,7 +64,7 @@ export function RepositoryCard({
         <div className="flex-1">
           <div className="flex items-center gap-2 mb-1">
             <img 
-              src={optimisticRepository.owner.avatar_url} 
+              src={avatarUrl(optimisticRepository.owner.id, 24)} 
               alt={optimisticRepository.owner.login}
               className="w-6 h-6 rounded-full"
             />
@@ -1,6 +1,7 @@
 import { Card } from "@/components/ui/card";
 import type { GitHubUser } from "@/api/github/github.type";
 import { ExternalLink } from "lucide-react";
+import { avatarUrl } from "@/utils/helper";
 
 type UserCardProps = {
   user: GitHubUser;
@@ -21,7 +22,7 @@ export function UserCard({ user, onUserClick }: UserCardProps) {
     >
       <div className="flex items-center gap-4">
         <img
-          src={user.avatar_url}
+          src={avatarUrl(user.id, 64)}
           alt={user.login}
           className="w-16 h-16 rounded-full"
         />
@@ -4,6 +4,7 @@ import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { BookmarkCheck } from "lucide-react";
 import {
+  useBookmarkEvents,
   useGetBookmarks,
   useRemoveBookmark,
 } from "@/api/bookmarks/bookmarks.query";
@@ -22,6 +23,7 @@ export default function Dashboard() {
   const [page, setPage] = useState(1);
   const [perPage] = useState(10);
   const { data: bookmarkList, isLoading } = useGetBookmarks(page, perPage);
+  useBookmarkEvents();
   const bookmarks = useMemo(() => bookmarkList?.items || [], [bookmarkList?.items]);
   const [optimisticBookmarks, setOptimisticBookmarks] = useOptimistic(
     bookmarks,
@@ -3,4 +3,11 @@ export function toLocalDateString(date: Date): string {
   const month = String(date.getMonth() + 1).padStart(2, '0');
   const day = String(date.getDate()).padStart(2, '0');
   return `${year}-${month}-${day}`;
-}
\ No newline at end of file
+}
+
+// Avatars are served through the backend's caching thumbnail proxy instead of
+// hot-linking full-size images from GitHub. `size` is the rendered size in CSS
+// pixels; twice that is requested for high-density screens.
+export function avatarUrl(ownerId: number, size: number): string {
+  return `${import.meta.env.VITE_API_BASE_URL}/avatars/${ownerId}?s=${size * 2}`;
+}